@@ -6,6 +6,12 @@ Description:
 Version: 6.3.0
 """
 
+import time
+
+# Taken before the heavy imports below so the startup report includes them.
+STARTED_AT = time.perf_counter()
+
+import asyncio
 import json
 import logging
 import os
@@ -19,7 +25,13 @@ from discord.ext import commands, tasks
 from discord.ext.commands import Context
 from dotenv import load_dotenv
 
-from database import DatabaseManager
+from database import DatabaseManager, apply_migrations
+from helpers.command_sync import sync_if_changed
+from helpers.config import BotConfig, ConfigError, ConfigWatcher
+from helpers.http import HTTPStats, create_http_session
+from helpers.manifest import resolve_extensions
+from helpers.permissions import PermissionEngine
+from helpers.timing import StartupTimer
 
 load_dotenv()
 
@@ -136,35 +148,84 @@ class DiscordBot(commands.Bot):
         """
         self.logger = logger
         self.database = None
+        self.config = BotConfig()
+        self.config_watcher = ConfigWatcher(
+            self, f"{os.path.realpath(os.path.dirname(__file__))}/config.json"
+        )
+        self.permission_engine = PermissionEngine(self)
+        self.http_session = None
+        self.http_stats = HTTPStats()
+        self.startup_timer = StartupTimer(STARTED_AT)
+        # (ip, port) of a Minecraft server -> name of the cog that owns its listener
+        self.mc_server_owners = {}
         self.bot_prefix = os.getenv("PREFIX")
         self.invite_link = os.getenv("INVITE_LINK")
+        self.auto_sync = os.getenv("AUTO_SYNC", "false").lower() == "true"
+
+    async def init_db(self) -> aiosqlite.Connection:
+        """
+        Opens the database connection and applies the schema and migrations on it.
 
-    async def init_db(self) -> None:
-        async with aiosqlite.connect(
+        :return: The connection, reused by the `DatabaseManager` for the whole lifetime of the bot.
+        """
+        connection = await aiosqlite.connect(
             f"{os.path.realpath(os.path.dirname(__file__))}/database/database.db"
-        ) as db:
-            with open(
-                f"{os.path.realpath(os.path.dirname(__file__))}/database/schema.sql",
-                encoding = "utf-8"
-            ) as file:
-                await db.executescript(file.read())
-            await db.commit()
+        )
+        with open(
+            f"{os.path.realpath(os.path.dirname(__file__))}/database/schema.sql",
+            encoding = "utf-8"
+        ) as file:
+            await connection.executescript(file.read())
+        await apply_migrations(connection)
+        return connection
+
+    async def load_extension_timed(self, extension: str) -> None:
+        start = time.perf_counter()
+        try:
+            await self.load_extension(f"cogs.{extension}")
+            self.logger.info(
+                f"Loaded extension '{extension}' in {(time.perf_counter() - start) * 1000:.1f}ms"
+            )
+        except Exception as e:
+            exception = f"{type(e).__name__}: {e}"
+            self.logger.error(
+                f"Failed to load extension {extension}\n{exception}"
+            )
 
     async def load_cogs(self) -> None:
         """
         The code in this function is executed whenever the bot will start.
+
+        Only the extensions listed in `helpers/manifest.py` are loaded. They don't depend on each
+        other, so they are loaded concurrently.
         """
-        for file in os.listdir(f"{os.path.realpath(os.path.dirname(__file__))}/cogs"):
-            if file.endswith(".py"):
-                extension = file[:-3]
-                try:
-                    await self.load_extension(f"cogs.{extension}")
-                    self.logger.info(f"Loaded extension '{extension}'")
-                except Exception as e:
-                    exception = f"{type(e).__name__}: {e}"
-                    self.logger.error(
-                        f"Failed to load extension {extension}\n{exception}"
-                    )
+        selected, skipped = resolve_extensions()
+        for spec, winner in skipped:
+            if winner is None:
+                self.logger.info(f"Skipped extension '{spec.identity}' (disabled)")
+            else:
+                self.logger.warning(
+                    f"Skipped extension '{spec.identity}', group '{spec.group}' is owned by '{winner.identity}'"
+                )
+        known = {spec.name for spec in selected} | {spec.name for spec, _ in skipped}
+        for file in sorted(os.listdir(f"{os.path.realpath(os.path.dirname(__file__))}/cogs")):
+            if file.endswith(".py") and file[:-3] not in known:
+                self.logger.warning(
+                    f"Extension '{file[:-3]}' is not listed in the manifest and was not loaded"
+                )
+        await asyncio.gather(
+            *(self.load_extension_timed(spec.name) for spec in selected)
+        )
+
+    def report_server_owners(self) -> None:
+        """
+        Logs which cog owns the listener of each Minecraft server.
+        """
+        if not self.mc_server_owners:
+            self.logger.info("No Minecraft server listener is running")
+            return
+        for (ip, port), owner in sorted(self.mc_server_owners.items()):
+            self.logger.info(f"Minecraft server '{ip}:{port}' is listened to by '{owner}'")
 
     @tasks.loop(minutes=1.0)
     async def status_task(self) -> None:
@@ -192,14 +253,58 @@ class DiscordBot(commands.Bot):
             f"Running on: {platform.system()} {platform.release()} ({os.name})"
         )
         self.logger.info("-------------------")
-        await self.init_db()
-        await self.load_cogs()
+        self.startup_timer.record("imports", IMPORTED_AT - STARTED_AT)
+        self.startup_timer.record("login", time.perf_counter() - IMPORTED_AT)
+        self.http_session = create_http_session(self.http_stats)
+        with self.startup_timer.phase("database"):
+            self.database = DatabaseManager(connection=await self.init_db())
+        with self.startup_timer.phase("config"):
+            try:
+                self.config_watcher.reload()
+            except (OSError, ConfigError) as e:
+                self.logger.error(f"Could not load config.json, using defaults: {e}")
+            self.config_watcher.start()
+        with self.startup_timer.phase("cog setup"):
+            await self.load_cogs()
+        with self.startup_timer.phase("command tree"):
+            app_commands = self.tree.get_commands()
+            if self.auto_sync:
+                synced, _ = await sync_if_changed(self)
+                self.logger.info(
+                    "Global slash commands synchronized"
+                    if synced
+                    else "Global slash commands unchanged, sync skipped"
+                )
         self.status_task.start()
-        self.database = DatabaseManager(
-            connection=await aiosqlite.connect(
-                f"{os.path.realpath(os.path.dirname(__file__))}/database/database.db"
-            )
+        self.logger.info(
+            f"Startup timings ({len(self.extensions)} extensions, {len(app_commands)} app commands):"
         )
+        for line in self.startup_timer.report():
+            self.logger.info(line)
+
+    async def close(self) -> None:
+        """
+        Closes the shared HTTP session and the database connection when the bot shuts down.
+        """
+        await super().close()
+        self.config_watcher.stop()
+        if self.http_session is not None:
+            await self.http_session.close()
+        if self.database is not None:
+            await self.database.connection.close()
+
+    async def on_member_update(self, before: discord.Member, after: discord.Member) -> None:
+        """
+        Drops the cached roles of a member when they changed.
+        """
+        if before.roles != after.roles:
+            self.permission_engine.invalidate(after)
+
+    async def on_member_remove(self, member: discord.Member) -> None:
+        self.permission_engine.invalidate(member)
+
+    async def on_guild_role_delete(self, role: discord.Role) -> None:
+        self.permission_engine.invalidate_guild(role.guild.id)
 
     async def on_message(self, message: discord.Message) -> None:
         """
@@ -287,5 +392,6 @@ class DiscordBot(commands.Bot):
             raise error
 
 
+IMPORTED_AT = time.perf_counter()
 bot = DiscordBot()
 bot.run(os.getenv("TOKEN"))
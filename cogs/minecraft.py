@@ -4,17 +4,21 @@ from discord.ext import commands
 from discord.ext.commands import Context
 from typing import Literal
 import json
-import websockets
 import asyncio
+import aiohttp
 #from assets.data import Data
-import requests
-from mojang import API as MOJANG_API
+
+from helpers.mojang_api import MojangClient
+
 
 class Minecraft(commands.Cog, name="minecraft"):
     def __init__(self, bot):
         self.bot = bot
         self.listeners = {}
+        self.mojang = None
 
+    async def cog_load(self):
+        self.mojang = MojangClient(self.bot.http_session, self.bot.database)
 
 
     async def mc_serv_name_autocomplete(self, ctx, current: str):
@@ -65,43 +69,32 @@ class Minecraft(commands.Cog, name="minecraft"):
     @app_commands.allowed_installs(guilds=True, users=True)
     @app_commands.allowed_contexts(guilds=True, dms=True, private_channels=True)
     async def mcinfo(self, ctx, username: str):
-        await ctx.defer()
-
-
-        mojang = MOJANG_API()
-
-        uuid2 = mojang.get_uuid(username=username)
-        if not uuid2:
-            await ctx.send(f'{username} is not taken')
-            return
-        profile2 = mojang.get_profile(uuid=uuid2)
-        await ctx.send(f"{username}'s skin : {profile2.skin_url}\ncape : {profile2.cape_url}\nis legacy profile : {profile2.is_legacy_profile}\ntimestamp : {profile2.timestamp}  ")
-
-
         """Get information about a Minecraft account."""
-        url = f"https://api.mojang.com/users/profiles/minecraft/{username}"
-        response = requests.get(url)
-        if response.status_code == 200:
-            player_data = response.json()
-            uuid = player_data['id']
-            name = player_data['name']
-            skin_url = f"https://crafatar.com/skins/{uuid}"
-            cape_url = f"https://crafatar.com/capes/{uuid}"
-            
-            embed = discord.Embed(title=name, url=f'https://fr.namemc.com/profile/{uuid}',color=0x00ff00)
-            #embed.add_field(name="Username", value=name, inline=False)
-            embed.add_field(name="UUID", value=uuid, inline=False)
-            #embed.add_field(name="Skin", value=skin_url, inline=False)
-            #embed.add_field(name="Cape", value=cape_url, inline=False)
-            embed.set_thumbnail(url=f'https://mc-heads.net/avatar/{uuid}')
-            embed.set_image(url=f'https://mc-heads.net/body/{uuid}/right')
-            
-            
+        await ctx.defer()
 
+        try:
+            profile = await self.mojang.get_profile_by_name(username)
+        # Timeout de la session partagée et réponse illisible compris
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            embed = discord.Embed(title='Mojang API unavailable',description='try again later',color=0xFF0000)
             await ctx.send(embed=embed)
-        else:
-            embed = discord.embed(title='Account no found!',description='try again with an existing minecraft account name',color=0xFF0000)
+            return
+        if profile is None:
+            embed = discord.Embed(title='Account no found!',description=f'{username} is not taken',color=0xFF0000)
             await ctx.send(embed=embed)
+            return
+
+        uuid = profile.uuid
+        embed = discord.Embed(title=profile.name, url=f'https://fr.namemc.com/profile/{uuid}',color=0x00ff00)
+        embed.add_field(name="UUID", value=uuid, inline=False)
+        embed.add_field(name="Skin", value=profile.skin_url or "None", inline=False)
+        embed.add_field(name="Cape", value=profile.cape_url or "None", inline=False)
+        embed.add_field(name="Legacy profile", value=str(profile.is_legacy_profile), inline=True)
+        embed.add_field(name="Timestamp", value=str(profile.timestamp), inline=True)
+        embed.set_thumbnail(url=f'https://mc-heads.net/avatar/{uuid}')
+        embed.set_image(url=f'https://mc-heads.net/body/{uuid}/right')
+
+        await ctx.send(embed=embed)
 
 
 
@@ -4,15 +4,19 @@ from discord.ext import commands
 from discord.ext.commands import Context
 import asyncio
 import json
-import websockets
 from discord.ext import commands, tasks
 from typing import Optional, Literal
 from datetime import datetime
 
+from helpers.lazy import lazy_import
+
+# Only imported the first time a Minecraft server is contacted
+websockets = lazy_import("websockets")
+
 
 def notif_enabled(bot: commands.Bot, key: str) -> bool:
     """Retourne si une notif est activée ou pas"""
-    return bot.config.get("notifications", {}).get(key, True)
+    return bot.config.notif_enabled(key)
 
 
 class MinecraftManager(commands.Cog, name="minecraft_v2"):
@@ -22,11 +26,9 @@ class MinecraftManager(commands.Cog, name="minecraft_v2"):
         self.bot = bot
         self.listeners = {}
         self.active_servers = set()  # Track servers we're already connected to
-        self.load_config()
+        self.owners_reported = False
+        self.claimed_servers = {}  # mc_server_name -> (ip, port) réservé dans bot.mc_server_owners
     
-    def load_config(self):
-        with open("config.json", "r", encoding="utf-8") as f:
-            self.bot.config = json.load(f)
 
 
 
@@ -48,6 +50,30 @@ class MinecraftManager(commands.Cog, name="minecraft_v2"):
             return {"error": str(e)}
 
 
+    def claim_server(self, name: str, ip: str, port: int) -> bool:
+        """
+        Réserve l'écoute d'un serveur pour ce cog, False si un autre cog MSMP l'écoute déjà.
+
+        La réservation porte sur (ip, port): deux Discord peuvent avoir chacun un serveur "survival".
+        """
+        owner = self.bot.mc_server_owners.setdefault((ip, int(port)), self.qualified_name)
+        if owner != self.qualified_name:
+            return False
+        self.claimed_servers[name] = (ip, int(port))
+        return True
+
+    def release_server(self, name: str) -> None:
+        """Libère le serveur, la réservation de (ip, port) n'est rendue qu'au départ du dernier nom qui l'utilise"""
+        endpoint = self.claimed_servers.pop(name, None)
+        if endpoint is None or endpoint in self.claimed_servers.values():
+            return
+        if self.bot.mc_server_owners.get(endpoint) == self.qualified_name:
+            del self.bot.mc_server_owners[endpoint]
+
+    def server_owner(self, ip: str, port: int) -> str:
+        """Nom du cog qui écoute ce serveur, ce cog s'il est libre"""
+        return self.bot.mc_server_owners.get((ip, int(port)), self.qualified_name)
+
     @tasks.loop(seconds=30)
     async def monitor_servers(self):
         await self.bot.wait_until_ready()
@@ -56,10 +82,12 @@ class MinecraftManager(commands.Cog, name="minecraft_v2"):
         for (name, ip, port, channel_id) in all_servers:
             if name in self.active_servers:
                 continue  # Already monitoring
+            if self.server_owner(ip, port) != self.qualified_name:
+                continue  # Listened to by another MSMP cog
             print(f'adresse of {name}: {ip}, {port}. Channel id: {channel_id}')
             try:
                 resp = await self.send_rpc_request(ip, port, "minecraft:server/status")
-                if resp.get("result", {}).get("started", False):
+                if resp.get("result", {}).get("started", False) and self.claim_server(name, ip, port):
                     self.active_servers.add(name)  # Mark as active
                     self.listeners[name] = asyncio.create_task(
                         self.listen_to_mc_server(ip, port, channel_id, name)
@@ -70,6 +98,10 @@ class MinecraftManager(commands.Cog, name="minecraft_v2"):
             except Exception:
                 pass
 
+        if not self.owners_reported:
+            self.owners_reported = True
+            self.bot.report_server_owners()
+
     async def cog_load(self):
         # Start task when cog is loaded
         self.monitor_servers.start()
@@ -88,6 +120,7 @@ class MinecraftManager(commands.Cog, name="minecraft_v2"):
                     pass
             print(f"❌ Closed listener for server {name}")
             self.active_servers.discard(name)
+            self.release_server(name)
 
         
         self.listeners.clear()
@@ -256,7 +289,7 @@ class MinecraftManager(commands.Cog, name="minecraft_v2"):
 
 
                         # Gamerules
-                        elif method == "notification:gamerules/updated" and notif_enabled(self.bot, "server_gamerules_updatedstatus"):
+                        elif method == "notification:gamerules/updated" and notif_enabled(self.bot, "gamerules_updated"):
                             rule = params.get("gamerule", {})
                             embed = discord.Embed(
                                 title="🎮 Gamerule Updated",
@@ -271,6 +304,7 @@ class MinecraftManager(commands.Cog, name="minecraft_v2"):
                     except websockets.ConnectionClosed:
                         await channel.send(f"⚠️ Connection to `{server_name}` lost.")
                         self.active_servers.remove(server_name)
+                        self.release_server(server_name)
                         break
         except Exception as e:
             await channel.send(f"❌ Could not connect to `{server_name}`: `{e}`")
@@ -364,8 +398,7 @@ class MinecraftManager(commands.Cog, name="minecraft_v2"):
     @mc_config.command(name="reload", description="Reload the Minecraft config.json file")
     async def reload_config(self, ctx: commands.Context):
         try:
-            with open("config.json", "r", encoding="utf-8") as f:
-                self.bot.config = json.load(f)
+            self.bot.config_watcher.reload()
 
             embed = discord.Embed(
                 title="✅ Config Reloaded",
@@ -431,6 +464,9 @@ class MinecraftManager(commands.Cog, name="minecraft_v2"):
         if not server:
             return
         ip, port, channel_id, name = server
+        if not self.claim_server(name, ip, port):
+            await ctx.send(f"⚠️ `{name}` is already listened to by `{self.server_owner(ip, port)}`.")
+            return
         self.listeners[name] = asyncio.create_task(self.listen_to_mc_server(ip, port, channel_id, name))
         self.active_servers.add(name)  # Mark as active
         await ctx.send(f"🎧 Listening for events from `{name}` ({ip}:{port})")
@@ -448,6 +484,7 @@ class MinecraftManager(commands.Cog, name="minecraft_v2"):
 
         # Remove from active servers set
         self.active_servers.discard(name)
+        self.release_server(name)
 
         await ctx.send(f"🛑 Disconnected from server `{name}`. No longer listening to events.")
 
@@ -2,17 +2,205 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 from discord.ext.commands import Context
+import aiohttp
 import asyncio
+import io
 import json
-import websockets
+import re
+import time
+from functools import partial
 from discord.ext import commands, tasks
-from typing import Optional, Literal
+from typing import Optional, Literal, Union
 from datetime import datetime
 
-
-def notif_enabled(bot: commands.Bot, key: str) -> bool:
-    """Retourne si une notif est activée ou pas"""
-    return bot.config.get("notifications", {}).get(key, True)
+from helpers.config import NOTIFICATIONS, NOTIFICATION_BITS
+from helpers.autocomplete import AutocompleteCache
+from helpers import codec
+from helpers.embeds import EmbedTemplate, TemplateCache
+from helpers.fleet import fan_out
+from helpers.lazy import lazy_import
+from helpers.listeners import Backoff, ListenerState, ListenerStatus, ListenerSupervisor
+from helpers.paginator import ListPages, Paginator
+from helpers.player_lists import CHUNK_SIZE, chunked, export_file, export_rows, iter_entries, normalize_entry
+from helpers.players import PlayerIndex
+from helpers.reconcile import SERVER_SETTINGS, StateError, parse_setting, plan, read_calls, setting_method, validate_state
+from helpers.scheduler import ProbeScheduler
+from helpers.singleflight import SingleFlight, is_read_method, request_key
+from helpers.snapshots import SettingsCache
+from helpers.wire import WireStats
+
+# Only imported the first time a Minecraft server is contacted
+websockets = lazy_import("websockets")
+deflate = lazy_import("helpers.deflate")
+
+
+# Délai max entre deux tentatives de reconnexion, et durée sans connexion avant d'abandonner
+LISTENER_BACKOFF_CAP = 120
+LISTENER_GIVE_UP = 600
+# monitor_servers se réveille toutes les PROBE_TICK secondes mais ne sonde que les serveurs dus,
+# la liste des serveurs est relue en base toutes les SERVER_LIST_REFRESH secondes
+PROBE_TICK = 1
+SERVER_LIST_REFRESH = 30
+# /mc fleet: délai global, âge max d'un statut reçu par un listener, lignes par page
+FLEET_DEADLINE = 2.0
+FLEET_CACHE_TTL = 60
+FLEET_PAGE_SIZE = 20
+# Resynchronisation complète de l'index des joueurs (minecraft:players) de chaque serveur écouté
+PLAYER_RESYNC = 300
+# Durée de vie d'un instantané des serversettings d'un serveur
+SETTINGS_TTL = 600
+# Envois groupés (announce...): requêtes simultanées max et délai par serveur
+FAN_OUT_LIMIT = 10
+FAN_OUT_TIMEOUT = 5
+BULK_RETRIES = 2
+# Import de listes: joueurs envoyés par appel allowlist/add ou bans/add, durée max du téléchargement
+# (les appels RPC sont faits pendant la lecture du fichier, le délai de 15s de la session est trop court)
+IMPORT_CHUNK = 500
+IMPORT_TIMEOUT = 600
+# Autocomplete: attente max d'une liste pas encore en cache (Discord abandonne vers 3s),
+# âge au-delà duquel elle est rafraîchie en arrière-plan
+AUTOCOMPLETE_BUDGET = 1.5
+AUTOCOMPLETE_TTL = 15
+# Listes (allowlist, banlist, ops, gamerules): au-delà de ce nombre d'entrées, envoi en CSV plutôt qu'en pages
+LIST_ATTACHMENT_THRESHOLD = 1000
+# /mc_config reconcile: caractères de l'embed (max 6000) occupés par les plans, le reste part en fichier joint
+RECONCILE_EMBED_BUDGET = 5500
+
+# /mc bulk: action -> (méthode MSMP, permission, params pour tous les joueurs en un seul appel)
+BULK_ACTIONS = {
+    "ban": ("minecraft:bans/add", "server_ops",
+            lambda players, reason: [[{"player": {"name": p}, "reason": reason} for p in players]]),
+    "unban": ("minecraft:bans/remove", "server_ops",
+              lambda players, reason: [[{"name": p} for p in players]]),
+    "kick": ("minecraft:players/kick", "server_ops",
+             lambda players, reason: [{"players": [{"name": p} for p in players], "message": {"literal": reason}}]),
+    "allowlist_add": ("minecraft:allowlist/add", "server_ops",
+                      lambda players, reason: [[{"name": p} for p in players]]),
+    "allowlist_remove": ("minecraft:allowlist/remove", "server_ops",
+                         lambda players, reason: [[{"name": p} for p in players]]),
+    "op": ("minecraft:operators/add", "system",
+           lambda players, reason: [[{"player": {"name": p}, "permissionLevel": 4, "bypassesPlayerLimit": True}
+                                     for p in players]]),
+    "deop": ("minecraft:operators/remove", "system",
+             lambda players, reason: [[{"name": p} for p in players]]),
+}
+
+NOTIFICATION_METHODS = {
+    "notification:players/joined": NOTIFICATION_BITS["players_joined"],
+    "notification:players/left": NOTIFICATION_BITS["players_left"],
+    "notification:bans/added": NOTIFICATION_BITS["bans_added"],
+    "notification:bans/removed": NOTIFICATION_BITS["bans_removed"],
+    "notification:allowlist/added": NOTIFICATION_BITS["allowlist_added"],
+    "notification:allowlist/removed": NOTIFICATION_BITS["allowlist_removed"],
+    "notification:operators/added": NOTIFICATION_BITS["operators_added"],
+    "notification:operators/removed": NOTIFICATION_BITS["operators_removed"],
+    "notification:server/started": NOTIFICATION_BITS["server_started"],
+    "notification:server/stopping": NOTIFICATION_BITS["server_stopping"],
+    "notification:server/saving": NOTIFICATION_BITS["server_saving"],
+    "notification:server/saved": NOTIFICATION_BITS["server_saved"],
+    "notification:server/status": NOTIFICATION_BITS["server_status"],
+    "notification:gamerules/updated": NOTIFICATION_BITS["gamerules_updated"],
+}
+
+# Notifications dont track_server_state a besoin, même quand elles ne sont pas affichées
+TRACKED_METHODS = frozenset({
+    "notification:players/joined",
+    "notification:players/left",
+    "notification:bans/added",
+    "notification:bans/removed",
+    "notification:server/status",
+    "notification:server/stopping",
+    "notification:server/started",
+})
+
+# Parties fixes des embeds de notification, {server} est rempli une fois par serveur
+NOTIFICATION_FOOTER = "Minecraft server: {server}"
+NOTIFICATION_TEMPLATES = {
+    "notification:players/joined": EmbedTemplate(
+        "✅ Player Joined", discord.Colour(0x57F287), "`{player}` joined **{server}**",
+        footer=NOTIFICATION_FOOTER, avatar=True
+    ),
+    "notification:players/left": EmbedTemplate(
+        "❌ Player Left", discord.Colour(0xED4245), "`{player}` left **{server}**",
+        footer=NOTIFICATION_FOOTER, avatar=True
+    ),
+    "notification:bans/added": EmbedTemplate(
+        "⛔ Player Banned", discord.Colour(0x992D22), "`{player}` was banned.", footer=NOTIFICATION_FOOTER
+    ),
+    "notification:bans/removed": EmbedTemplate(
+        "✔️ Player Unbanned", discord.Colour(0x2ECC71), "`{player}` was unbanned.", footer=NOTIFICATION_FOOTER
+    ),
+    "notification:allowlist/added": EmbedTemplate(
+        "📃 Allowlist Update", discord.Colour(0x5865F2), "`{player}` added to allowlist.", footer=NOTIFICATION_FOOTER
+    ),
+    "notification:allowlist/removed": EmbedTemplate(
+        "📃 Allowlist Update", discord.Colour(0x5865F2), "`{player}` removed from allowlist.", footer=NOTIFICATION_FOOTER
+    ),
+    "notification:operators/added": EmbedTemplate(
+        "⭐ Operator Granted", discord.Colour(0xF1C40F), "`{player}` is now OP.", footer=NOTIFICATION_FOOTER
+    ),
+    "notification:operators/removed": EmbedTemplate(
+        "⚠️ Operator Removed", discord.Colour(0xF1C40F), "`{player}` removed from OPs.", footer=NOTIFICATION_FOOTER
+    ),
+    "notification:server/started": EmbedTemplate(
+        "🟢 Server Started", discord.Colour(0x57F287), "Server **{server}** is now online!", footer=NOTIFICATION_FOOTER
+    ),
+    "notification:server/stopping": EmbedTemplate(
+        "🛑 Server Stopping", discord.Colour(0xED4245), "Server **{server}** is shutting down...",
+        footer=NOTIFICATION_FOOTER
+    ),
+    "notification:server/saving": EmbedTemplate(
+        "💾 Saving World", discord.Colour(0x3498DB), "Server **{server}** is saving...", footer=NOTIFICATION_FOOTER
+    ),
+    "notification:server/saved": EmbedTemplate(
+        "💾 World Saved", discord.Colour(0x2ECC71), "Server **{server}** finished saving.", footer=NOTIFICATION_FOOTER
+    ),
+    "notification:server/status": EmbedTemplate(
+        "❤️‍🔥 Server Heartbeat", discord.Colour(0xE67E22),
+        "Server **{server}** is alive!\nPlayers online: **{count}** ({players})", footer=NOTIFICATION_FOOTER
+    ),
+    "notification:gamerules/updated": EmbedTemplate(
+        "🎮 Gamerule Updated", discord.Colour(0x9B59B6), "`{rule}` → `{value}`", footer=NOTIFICATION_FOOTER
+    ),
+}
+
+
+def format_bytes(size: int) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024 or unit == "MiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def heartbeat_values(params: dict) -> dict:
+    players = params.get("status", {}).get("players", [])
+    return {"count": len(players), "players": ", ".join(p["name"] for p in players) if players else "No players"}
+
+
+# Parties variables de chaque notification
+NOTIFICATION_VALUES = {
+    "notification:players/joined": lambda params: {"player": params.get("name")},
+    "notification:players/left": lambda params: {"player": params.get("name")},
+    "notification:bans/added": lambda params: {"player": params["player"]["name"]},
+    "notification:bans/removed": lambda params: {"player": params["name"]},
+    "notification:allowlist/added": lambda params: {"player": params.get("name")},
+    "notification:allowlist/removed": lambda params: {"player": params.get("name")},
+    "notification:operators/added": lambda params: {"player": params["player"]["name"]},
+    "notification:operators/removed": lambda params: {"player": params["player"]["name"]},
+    "notification:server/started": lambda params: {},
+    "notification:server/stopping": lambda params: {},
+    "notification:server/saving": lambda params: {},
+    "notification:server/saved": lambda params: {},
+    "notification:server/status": heartbeat_values,
+    "notification:gamerules/updated": lambda params: {
+        "rule": params.get("gamerule", {}).get("key"), "value": params.get("gamerule", {}).get("value")
+    },
+}
+# /mc status et /mc status_full
+STATUS_TEMPLATES = {
+    "status": EmbedTemplate("🖥️ Server Status - {server}", discord.Colour(0x57F287)),
+    "status_full": EmbedTemplate("🖥️ Server Status: {server}", discord.Colour.blurple()),
+}
 
 
 class MinecraftManager(commands.Cog, name="minecraft_v4"):
@@ -20,90 +208,270 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
 
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
-        self.listeners = {}
-        self.active_servers = set()  # Track servers we're already connected to
-        self.load_config()
+        # Un seul listener par serveur, redémarré s'il plante
+        self.listeners = ListenerSupervisor(self.listener_exited, logger=getattr(bot, "logger", None))
+        self.probes = ProbeScheduler(interval=SERVER_LIST_REFRESH)
+        self.probe_targets = {}  # mc_server_name -> (ip, port, channel_id)
+        self.probe_runs = set()  # lots de sondes en cours, lancés par monitor_servers
+        self.targets_loaded_at = None
+        self.owners_reported = False
+        self.claimed_servers = {}  # mc_server_name -> (ip, port) réservé dans bot.mc_server_owners
+        self.channel_servers = {}  # channel_id -> mc_server_name, vidé à chaque modif de serveur
+        self.notif_masks = {}  # (guild_id, mc_server_name) -> bitfield, absent = config.json
+        self.status_cache = {}  # mc_server_name -> (time.monotonic(), dernier résultat de server/status)
+        self.settings_cache = SettingsCache(ttl=SETTINGS_TTL)  # (ip, port) -> serversettings
+        self.rpc_flights = SingleFlight()  # lectures identiques en cours, partagées
+        self.wire_stats = WireStats()  # octets JSON / octets réels par méthode
+        self.embed_templates = TemplateCache({**NOTIFICATION_TEMPLATES, **STATUS_TEMPLATES})  # par serveur
+        self.autocomplete = AutocompleteCache(
+            budget=AUTOCOMPLETE_BUDGET, ttl=AUTOCOMPLETE_TTL, logger=getattr(bot, "logger", None)
+        )  # (liste, mc_server_name) -> noms
+        self.player_index = {}  # guild_id -> PlayerIndex des joueurs en ligne
+        self.server_guilds = {}  # mc_server_name -> guild_id, rempli par les listeners
     
-    def load_config(self):
-        with open("config.json", "r", encoding="utf-8") as f:
-            self.bot.config = json.load(f)
-    def has_permission(self, command_name: str, user: discord.Member) -> bool:
-        """Vérifie si un utilisateur peut utiliser une commande donnée en fonction du config.json"""
-        allowed_roles = self.bot.config.get("permissions", {}).get(command_name, [])
-        if not allowed_roles:  # vide = tout le monde peut
-            return True
-        return any(role.id in allowed_roles for role in user.roles)
-    '''
-    def has_permission(self, command_name: str, member: discord.Member) -> bool:
+    async def has_permission(self, command_name: str, ctx: Context, name: Optional[str] = None) -> bool:
         """Vérifie si un utilisateur peut utiliser une commande donnée en fonction du config.json"""
-        allowed_roles = self.bot.config.get("permissions", {}).get(command_name, [])
-        if not allowed_roles:  # vide = tout le monde peut
-            return True
-        # member.roles peut ne pas exister si ce n'est pas un Member (mais un User)
-        member_role_ids = {r.id for r in getattr(member, "roles", [])}
-        return any(role_id in member_role_ids for role_id in allowed_roles)
-    '''
+        guild_id = ctx.guild.id if ctx.guild else None
+        if name is None and guild_id is not None:
+            name = await self.channel_server(ctx.channel.id)
+        return self.bot.permission_engine.check(command_name, ctx.author, guild_id, name)
+
+    async def channel_server(self, channel_id: int) -> Optional[str]:
+        """Nom du serveur Minecraft lié à un salon, mis en cache"""
+        if channel_id not in self.channel_servers:
+            self.channel_servers[channel_id] = await self.bot.database.get_mc_server_name(channel_id)
+        return self.channel_servers[channel_id]
 
     # Centralized JSON-RPC request handler
     async def send_rpc_request(self, ip: str, port: int, method: str, params=None):
         if params is None:
             params = []
-        ws_url = f"ws://{ip}:{port}"
+        # Les lectures identiques simultanées (autocomplete, sondes...) partagent une seule requête
+        if is_read_method(method):
+            return await self.rpc_flights.do(
+                request_key(ip, port, method, params),
+                lambda: self.send_rpc_request_direct(ip, port, method, params)
+            )
+        return await self.send_rpc_request_direct(ip, port, method, params)
+
+    def open_socket(self, ip: str, port: int):
+        """Connexion MSMP, permessage-deflate proposé selon la section `compression` du config.json"""
+        return websockets.connect(f"ws://{ip}:{port}", **deflate.connect_options(self.bot.config.compression))
+
+    async def send_frame(self, websocket, request: dict) -> None:
+        data = codec.dumps(request)
+        await websocket.send(data)
+        raw = len(data.encode())
+        meter = deflate.meter_of(websocket)
+        self.wire_stats.record_out(request["method"], raw, meter.sent.popleft() if meter and meter.sent else raw)
+
+    async def recv_frame(self, websocket) -> tuple[bytes, int]:
+        """Le message suivant, non décodé, et sa taille réelle sur le réseau"""
+        raw = await websocket.recv(decode=False)
+        meter = deflate.meter_of(websocket)
+        return raw, meter.received.popleft() if meter and meter.received else len(raw)
+
+    async def send_rpc_request_direct(self, ip: str, port: int, method: str, params: list):
         try:
-            async with websockets.connect(ws_url) as websocket:
-                request = {"id": 1, "jsonrpc": "2.0", "method": method, "params": params}
-                await websocket.send(json.dumps(request))
-                response_raw = await websocket.recv()
-                return json.loads(response_raw)
-                print('resquest response: ',response_raw)
+            async with self.open_socket(ip, port) as websocket:
+                await self.send_frame(websocket, {"id": 1, "jsonrpc": "2.0", "method": method, "params": params})
+                response_raw, wire = await self.recv_frame(websocket)
+                self.wire_stats.record_in(method, len(response_raw), wire)
+                return codec.loads(response_raw)
         except Exception as e:
             return {"error": str(e)}
+        finally:
+            if self.is_settings_write(method):
+                self.settings_cache.invalidate((ip, port))
+
+    @staticmethod
+    def is_settings_write(method: str) -> bool:
+        return method.startswith("minecraft:serversettings/") and method.endswith("/set")
+
+    async def settings_snapshot(self, ip: str, port: int, force: bool = False):
+        """Instantané des serversettings d'un serveur, relu seulement s'il a expiré ou si `force`"""
+        snapshot = None if force else self.settings_cache.get((ip, port))
+        if snapshot is not None:
+            return snapshot
+        responses = await self.send_rpc_batch(ip, port, [(setting_method(key), []) for key in SERVER_SETTINGS])
+        values = {key: resp["result"] for key, resp in zip(SERVER_SETTINGS, responses) if "result" in resp}
+        if not values:
+            return None
+        return self.settings_cache.put((ip, port), values)
+
 
+    async def send_rpc_batch(self, ip: str, port: int, calls: list) -> list:
+        """
+        Envoie plusieurs requêtes sur une seule connexion, sans attendre chaque réponse avant la suivante.
 
-    @tasks.loop(seconds=30)
+        :param calls: `[(method, params), ...]`
+        :return: Les réponses dans l'ordre des appels, `{"error": ...}` pour celles qui manquent.
+        """
+        if not calls:
+            return []
+        responses = {}
+        try:
+            async with self.open_socket(ip, port) as websocket:
+                for request_id, (method, params) in enumerate(calls, start=1):
+                    await self.send_frame(
+                        websocket, {"id": request_id, "jsonrpc": "2.0", "method": method, "params": params or []}
+                    )
+                while len(responses) < len(calls):
+                    raw, wire = await self.recv_frame(websocket)
+                    message = codec.loads(raw)
+                    if "id" in message:  # Les notifications n'ont pas d'id
+                        responses[message["id"]] = message
+                        if 1 <= message["id"] <= len(calls):
+                            self.wire_stats.record_in(calls[message["id"] - 1][0], len(raw), wire)
+        except Exception as e:
+            return [responses.get(request_id, {"error": str(e)}) for request_id in range(1, len(calls) + 1)]
+        finally:
+            if any(self.is_settings_write(method) for method, _ in calls):
+                self.settings_cache.invalidate((ip, port))
+        return [responses[request_id] for request_id in range(1, len(calls) + 1)]
+
+    async def read_live_state(self, ip: str, port: int, state: dict) -> dict:
+        """Lit ce qu'il faut de l'état d'un serveur pour le comparer à `state`"""
+        reads = read_calls(state)
+        live = {}
+        # Les réglages viennent de l'instantané s'il est encore valable
+        snapshot = self.settings_cache.get((ip, port))
+        if snapshot is not None:
+            for key in state.get("settings", {}):
+                if key in snapshot.values:
+                    live[f"settings.{key}"] = snapshot.values[key]
+            reads = [(key, method) for key, method in reads if key not in live]
+        for (key, _), resp in zip(reads, await self.send_rpc_batch(ip, port, [(method, []) for _, method in reads])):
+            if "result" not in resp:
+                raise RuntimeError(f"could not read `{key}`: {resp.get('error')}")
+            live[key] = resp["result"]
+        return live
+
+    async def apply_state(self, ip: str, port: int, state: dict, dry_run: bool = False):
+        """
+        Amène un serveur à l'état voulu avec le minimum d'appels.
+
+        :return: `(changes, responses)`, `responses` est vide en dry run ou sans changement.
+        """
+        changes = plan(state, await self.read_live_state(ip, port, state))
+        if dry_run or not changes:
+            return changes, []
+        return changes, await self.send_rpc_batch(ip, port, [(change.method, change.params) for change in changes])
+
+    def claim_server(self, name: str, ip: str, port: int) -> bool:
+        """
+        Réserve l'écoute d'un serveur pour ce cog, False si un autre cog MSMP l'écoute déjà.
+
+        La réservation porte sur (ip, port): deux Discord peuvent avoir chacun un serveur "survival".
+        """
+        owner = self.bot.mc_server_owners.setdefault((ip, int(port)), self.qualified_name)
+        if owner != self.qualified_name:
+            return False
+        self.claimed_servers[name] = (ip, int(port))
+        return True
+
+    def release_server(self, name: str) -> None:
+        """Libère le serveur, la réservation de (ip, port) n'est rendue qu'au départ du dernier nom qui l'utilise"""
+        endpoint = self.claimed_servers.pop(name, None)
+        if endpoint is None or endpoint in self.claimed_servers.values():
+            return
+        if self.bot.mc_server_owners.get(endpoint) == self.qualified_name:
+            del self.bot.mc_server_owners[endpoint]
+
+    def server_owner(self, ip: str, port: int) -> str:
+        """Nom du cog qui écoute ce serveur, ce cog s'il est libre"""
+        return self.bot.mc_server_owners.get((ip, int(port)), self.qualified_name)
+
+    def listener_exited(self, name: str) -> None:
+        """Appelé par le supervisor quand un listener s'arrête pour de bon"""
+        self.release_server(name)
+        if name in self.probe_targets:
+            # Le serveur vient de tomber: on le sonde souvent pour le retrouver vite
+            self.probes.add(name, self.probes.fast_interval, just_stopped=True)
+
+    def probe_candidate(self, name: str) -> bool:
+        if name in self.listeners:
+            return False  # Already monitoring
+        target = self.probe_targets.get(name)
+        # Listened to by another MSMP cog
+        return target is None or self.server_owner(*target[:2]) == self.qualified_name
+
+    async def probe_server(self, name: str) -> None:
+        """Sonde un serveur dû, il est toujours reprogrammé sauf s'il a été retiré ou pris en écoute"""
+        try:
+            target = self.probe_targets.get(name)
+            if target is None or not self.probe_candidate(name):
+                self.probes.remove(name)
+                return
+            ip, port, channel_id = target
+            resp = await self.send_rpc_request(ip, port, "minecraft:server/status")
+            if resp.get("result", {}).get("started", False) and self.claim_server(name, ip, port):
+                self.probes.remove(name)
+                self.listeners.start(name, partial(self.listen_to_mc_server, ip, port, channel_id, name))
+                self.bot.logger.info(f"Started listening for server {name}")
+        except Exception as e:
+            self.bot.logger.error(f"Probe of server {name} failed: {e!r}")
+        finally:
+            # due() a déjà retiré l'entrée du tas: sans reschedule le serveur ne serait plus jamais sondé.
+            # Sans effet après un remove.
+            self.probes.reschedule(name)
+
+    async def probe_due(self, names: list[str]) -> None:
+        await asyncio.gather(*(self.probe_server(name) for name in names), return_exceptions=True)
+        self.report_owners()
+
+    def report_owners(self) -> None:
+        """Logue une fois, après les premières sondes, quel cog écoute quel serveur"""
+        if not self.owners_reported:
+            self.owners_reported = True
+            self.bot.report_server_owners()
+
+    @tasks.loop(seconds=PROBE_TICK)
     async def monitor_servers(self):
         await self.bot.wait_until_ready()
-        all_servers = await self.bot.database.get_all_mc_servers_full()  # returns [(name, ip, port, channel_id), ...]
-
-        for (name, ip, port, channel_id) in all_servers:
-            if name in self.active_servers:
-                continue  # Already monitoring
-            print(f'adresse of {name}: {ip}, {port}. Channel id: {channel_id}')
+        now = time.monotonic()
+        if self.targets_loaded_at is None or now - self.targets_loaded_at >= SERVER_LIST_REFRESH:
             try:
-                resp = await self.send_rpc_request(ip, port, "minecraft:server/status")
-                if resp.get("result", {}).get("started", False):
-                    self.active_servers.add(name)  # Mark as active
-                    self.listeners[name] = asyncio.create_task(
-                        self.listen_to_mc_server(ip, port, channel_id, name)
-                    )
-                    print(f"Started listening for server {name}")
-                    chnl = self.bot.get_channel(channel_id)
-                    chnl.send(f"Started listening for server {name}")
-            except Exception:
-                pass
+                all_servers = await self.bot.database.get_all_mc_servers_full()  # returns [(name, ip, port, channel_id), ...]
+            except Exception as e:
+                # Une erreur ne doit pas arrêter la boucle: on garde l'ancienne liste jusqu'au prochain rafraîchissement
+                self.bot.logger.error(f"Could not load the Minecraft servers: {e!r}")
+                all_servers = None
+            if all_servers is not None:
+                self.probe_targets = {name: (ip, port, int(channel_id)) for (name, ip, port, channel_id) in all_servers}
+                self.probes.sync((name for name in self.probe_targets if self.probe_candidate(name)), now)
+            self.targets_loaded_at = now
+
+        # Seuls les serveurs dont la date de sonde est passée sont contactés, en arrière-plan:
+        # un serveur injoignable (jusqu'à ~10s de connexion) ne retarde pas le tick suivant
+        due = self.probes.due(now)
+        if due:
+            task = asyncio.create_task(self.probe_due(due))
+            self.probe_runs.add(task)
+            task.add_done_callback(self.probe_runs.discard)
+        else:
+            self.report_owners()
+
+    def notification_mask(self, guild_id: int, server_name: str) -> int:
+        return self.notif_masks.get((guild_id, server_name), self.bot.config.notification_mask)
 
     async def cog_load(self):
+        for server_id, mc_server_name, notifications in await self.bot.database.get_notification_masks():
+            self.notif_masks[(int(server_id), mc_server_name)] = notifications
         # Start task when cog is loaded
         self.monitor_servers.start()
+        self.resync_all_players.start()
 
     async def cog_unload(self):
         # Stop the monitor loop
         self.monitor_servers.cancel()
+        self.resync_all_players.cancel()
+        self.autocomplete.close()
+        for task in self.probe_runs:
+            task.cancel()
 
         # Cancel all listeners
-        for name, task in list(self.listeners.items()):
-            if not task.done():
-                task.cancel()
-                try:
-                    await task
-                except asyncio.CancelledError:
-                    pass
-            print(f"❌ Closed listener for server {name}")
-            self.active_servers.discard(name)
-
-        
-        self.listeners.clear()
-        self.active_servers.clear()
+        await self.listeners.stop_all()
 
 
     async def resolve_server(self, ctx, name: Optional[str] = None):
@@ -135,157 +503,200 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
             return f"❓ Unexpected response: {resp}"
 
 
+    async def resolve_targets(self, ctx, targets: Union[str, list[str]], command_name: str):
+        """
+        Résout une liste de serveurs du Discord: `all`, `tag:<tag>` ou des noms, séparés par des virgules ou des espaces.
+        Une liste est prise telle quelle, sans découpage, pour les noms qui contiennent des espaces.
+
+        :return: `([(name, ip, port), ...], [(cible ignorée, raison), ...])`, seuls les serveurs sur lesquels
+            l'utilisateur a la permission `command_name` sont gardés.
+        """
+        servers = {
+            name.lower(): (name, ip, port, set(filter(None, tags.split(","))))
+            for name, ip, port, tags in await self.bot.database.get_guild_mc_servers(ctx.guild.id)
+        }
+        selected, skipped = {}, []
+        tokens = re.split(r"[,\s]+", targets.strip()) if isinstance(targets, str) else targets
+        for token in filter(None, tokens):
+            key = token.lower()
+            if key in ("all", "*"):
+                matches = list(servers.values())
+            elif key.startswith("tag:"):
+                matches = [server for server in servers.values() if key[4:] in server[3]]
+                if not matches:
+                    skipped.append((token, "no server with this tag"))
+            elif key in servers:
+                matches = [servers[key]]
+            else:
+                skipped.append((token, "unknown server"))
+                continue
+            for name, ip, port, _ in matches:
+                selected.setdefault(name, (name, ip, port))
+
+        allowed = []
+        for name, ip, port in selected.values():
+            if self.bot.permission_engine.check(command_name, ctx.author, ctx.guild.id, name):
+                allowed.append((name, ip, port))
+            else:
+                skipped.append((name, "no permission"))
+        return allowed, skipped
+
+    def fan_out_line(self, name: str, result) -> tuple[bool, str]:
+        """Une ligne de rapport pour le résultat d'un envoi groupé, et s'il a réussi"""
+        if result.timed_out:
+            return False, f"⌛ `{name}` · timeout"
+        if not result.ok:
+            return False, f"❌ `{name}` · {str(result.error)[:80]}"
+        if "result" not in result.result:
+            return False, f"❌ `{name}` · {str(result.result.get('error', result.result))[:80]}"
+        return True, f"✅ `{name}` · {result.latency * 1000:.0f} ms"
+
+    def build_notification_embed(self, method: str, params: dict, server_name: str) -> Optional[discord.Embed]:
+        """Construit l'embed d'une notification MSMP, None si elle n'est pas affichée"""
+        template = self.embed_templates.get(server_name, method)
+        if template is None:
+            return None
+        return template.build(**NOTIFICATION_VALUES[method](params))
+
+    def track_server_state(self, guild_id: int, server_name: str, method: str, params: dict) -> None:
+        """Met à jour le cache de statut et l'index des joueurs, que la notification soit affichée ou non"""
+        if method == "notification:players/joined":
+            self.players_of(guild_id).join(server_name, params["name"])
+            self.autocomplete.expire(("players", server_name))
+        elif method == "notification:players/left":
+            self.players_of(guild_id).leave(server_name, params["name"])
+            self.autocomplete.expire(("players", server_name))
+        elif method in ("notification:bans/added", "notification:bans/removed"):
+            self.autocomplete.expire(("bans", server_name))
+        elif method == "notification:server/status":
+            status_data = params.get("status", {})
+            self.status_cache[server_name] = (time.monotonic(), status_data)
+            self.players_of(guild_id).replace(server_name, [p["name"] for p in status_data.get("players", [])])
+        elif method == "notification:server/stopping":
+            self.forget_server_state(server_name)
+        elif method == "notification:server/started" and server_name in self.probe_targets:
+            # Les réglages ont pu changer dans server.properties pendant l'arrêt
+            self.settings_cache.invalidate(tuple(self.probe_targets[server_name][:2]))
+
+    def forget_server_state(self, server_name: str) -> None:
+        self.status_cache.pop(server_name, None)
+        guild_id = self.server_guilds.get(server_name)
+        if guild_id in self.player_index:
+            self.player_index[guild_id].clear(server_name)
+
+    def players_of(self, guild_id: int) -> PlayerIndex:
+        if guild_id not in self.player_index:
+            self.player_index[guild_id] = PlayerIndex()
+        return self.player_index[guild_id]
+
+    async def resync_players(self, server_name: str, ip: str, port: int) -> None:
+        """Remplace les joueurs d'un serveur dans l'index par la liste complète de minecraft:players"""
+        resp = await self.send_rpc_request(ip, port, "minecraft:players")
+        guild_id = self.server_guilds.get(server_name)
+        if "result" in resp and guild_id is not None:
+            self.players_of(guild_id).replace(server_name, [p["name"] for p in resp["result"]])
+
+    @tasks.loop(seconds=PLAYER_RESYNC)
+    async def resync_all_players(self):
+        """Rattrape les notifications join/left manquées"""
+        await self.bot.wait_until_ready()
+        targets = [
+            (name, *self.probe_targets[name][:2])
+            for name, status in self.listeners.statuses.items()
+            if status.state is ListenerState.SUBSCRIBED and name in self.probe_targets
+        ]
+        async for _ in fan_out(targets, lambda target: self.resync_players(*target), limit=10, timeout=10):
+            pass
+
+    async def report_listener_state(self, channel, status: ListenerStatus, state: ListenerState, message: str = None):
+        """Change l'état d'un listener et l'annonce une seule fois par transition"""
+        if status.transition(state) and message:
+            await channel.send(message)
+
     # Real-time notification listener
     async def listen_to_mc_server(self, mc_ip, mc_port, channel_id, server_name):
-        ws_url = f"ws://{mc_ip}:{mc_port}"
+        """
+        Écoute un serveur en continu: connecting → subscribed → degraded → backoff → connecting...
+
+        Après une fermeture propre (redémarrage du serveur) on retente tout de suite, sinon on attend
+        un backoff exponentiel avec jitter. Le listener s'arrête après `LISTENER_GIVE_UP` secondes
+        sans connexion et laisse `monitor_servers` reprendre la main.
+        """
         channel = self.bot.get_channel(channel_id) or await self.bot.fetch_channel(channel_id)
+        guild_id = channel.guild.id
+        self.server_guilds[server_name] = guild_id
+        # Le statut survit aux redémarrages du supervisor
+        status = self.listeners.statuses.setdefault(server_name, ListenerStatus(server_name))
+        status.transition(ListenerState.CONNECTING)
+        backoff = Backoff(base=1, cap=LISTENER_BACKOFF_CAP)
+        was_subscribed = False
+        down_since = time.monotonic()
         try:
-            async with websockets.connect(ws_url) as websocket:
-                await websocket.send(json.dumps({"id": 1, "jsonrpc": "2.0", "method": "rpc.discover"}))
-                await websocket.recv()
-                while True:
-                    try:
-                        message = json.loads(await websocket.recv())
-                        method = message.get("method", "")
-                        params = message.get("params", [{}])[0]
-
-                        embed = None
-
-                        # Joueur rejoint
-                        if method == "notification:players/joined" and notif_enabled(self.bot, "players_joined"):
-                            player_name = params.get('name')
-                            embed = discord.Embed(
-                                title="✅ Player Joined",
-                                description=f"`{player_name}` joined **{server_name}**",
-                                color=0x57F287,  # vert
-                                timestamp=datetime.utcnow()
-                            )
-                            embed.set_thumbnail(url=f"https://mc-heads.net/avatar/{player_name}")
-
-                        # Joueur quitte
-                        elif method == "notification:players/left" and notif_enabled(self.bot, "players_left"):
-                            player_name = params.get('name')
-                            embed = discord.Embed(
-                                title="❌ Player Left",
-                                description=f"`{player_name}` left **{server_name}**",
-                                color=0xED4245,  # rouge
-                                timestamp=datetime.utcnow()
-                            )
-                            embed.set_thumbnail(url=f"https://mc-heads.net/avatar/{player_name}")
-
-                        # Ban ajouté
-                        elif method == "notification:bans/added" and notif_enabled(self.bot, "bans_added"):
-                            embed = discord.Embed(
-                                title="⛔ Player Banned",
-                                description=f"`{params['player']['name']}` was banned.",
-                                color=0x992D22,
-                                timestamp=datetime.utcnow()
-                            )
-
-                        # Ban retiré
-                        elif method == "notification:bans/removed" and notif_enabled(self.bot, "bans_removed"):
-                            embed = discord.Embed(
-                                title="✔️ Player Unbanned",
-                                description=f"`{params['name']}` was unbanned.",
-                                color=0x2ECC71,
-                                timestamp=datetime.utcnow()
-                            )
-
-                        # Allowlist
-                        elif method == "notification:allowlist/added" and notif_enabled(self.bot, "allowlist_added"):
-                            embed = discord.Embed(
-                                title="📃 Allowlist Update",
-                                description=f"`{params.get('name')}` added to allowlist.",
-                                color=0x5865F2,
-                                timestamp=datetime.utcnow()
-                            )
-                        elif method == "notification:allowlist/removed" and notif_enabled(self.bot, "allowlist_removed"):
-                            embed = discord.Embed(
-                                title="📃 Allowlist Update",
-                                description=f"`{params.get('name')}` removed from allowlist.",
-                                color=0x5865F2,
-                                timestamp=datetime.utcnow()
-                            )
-
-                        # OP
-                        elif method == "notification:operators/added" and notif_enabled(self.bot, "operators_added"):
-                            embed = discord.Embed(
-                                title="⭐ Operator Granted",
-                                description=f"`{params['player']['name']}` is now OP.",
-                                color=0xF1C40F,
-                                timestamp=datetime.utcnow()
-                            )
-                        elif method == "notification:operators/removed" and notif_enabled(self.bot, "operators_removed"):
-                            embed = discord.Embed(
-                                title="⚠️ Operator Removed",
-                                description=f"`{params['player']['name']}` removed from OPs.",
-                                color=0xF1C40F,
-                                timestamp=datetime.utcnow()
-                            )
-
-                        # Serveur status
-                        elif method == "notification:server/started" and notif_enabled(self.bot, "server_started"):
-                            embed = discord.Embed(
-                                title="🟢 Server Started",
-                                description=f"Server **{server_name}** is now online!",
-                                color=0x57F287,
-                                timestamp=datetime.utcnow()
-                            )
-                        elif method == "notification:server/stopping" and notif_enabled(self.bot, "server_stopping"):
-                            embed = discord.Embed(
-                                title="🛑 Server Stopping",
-                                description=f"Server **{server_name}** is shutting down...",
-                                color=0xED4245,
-                                timestamp=datetime.utcnow()
-                            )
-                        elif method == "notification:server/saving" and notif_enabled(self.bot, "server_saving"):
-                            embed = discord.Embed(
-                                title="💾 Saving World",
-                                description=f"Server **{server_name}** is saving...",
-                                color=0x3498DB,
-                                timestamp=datetime.utcnow()
-                            )
-                        elif method == "notification:server/saved" and notif_enabled(self.bot, "server_saved"):
-                            embed = discord.Embed(
-                                title="💾 World Saved",
-                                description=f"Server **{server_name}** finished saving.",
-                                color=0x2ECC71,
-                                timestamp=datetime.utcnow()
-                            )
-                        elif method == "notification:server/status" and notif_enabled(self.bot, "server_status"):
-                            status = params.get("status", {})
-                            players = status.get("players", [])
-                            player_names = ", ".join(p["name"] for p in players) if players else "No players"
-                            embed = discord.Embed(
-                                title="❤️‍🔥 Server Heartbeat",
-                                description=(
-                                    f"Server **{server_name}** is alive!\n"
-                                    f"Players online: **{len(players)}** ({player_names})"
-                                ),
-                                color=0xE67E22,
-                                timestamp=datetime.utcnow()
-                            )
-
-
-                        # Gamerules
-                        elif method == "notification:gamerules/updated" and notif_enabled(self.bot, "server_gamerules_updatedstatus"):
-                            rule = params.get("gamerule", {})
-                            embed = discord.Embed(
-                                title="🎮 Gamerule Updated",
-                                description=f"`{rule.get('name')}` → `{rule.get('value')}`",
-                                color=0x9B59B6,
-                                timestamp=datetime.utcnow()
-                            )
-                        if embed:
-                            embed.set_footer(text=f"Minecraft server: {server_name}")
-                            await channel.send(embed=embed)
-
-                    except websockets.ConnectionClosed:
-                        await channel.send(f"⚠️ Connection to `{server_name}` lost.")
-                        self.active_servers.remove(server_name)
-                        break
-        except Exception as e:
-            await channel.send(f"❌ Could not connect to `{server_name}`: `{e}`")
+            while True:
+                clean_close = False
+                try:
+                    async with self.open_socket(mc_ip, mc_port) as websocket:
+                        await self.send_frame(websocket, {"id": 1, "jsonrpc": "2.0", "method": "rpc.discover"})
+                        raw, wire = await self.recv_frame(websocket)
+                        self.wire_stats.record_in("rpc.discover", len(raw), wire)
+                        await self.report_listener_state(
+                            channel, status, ListenerState.SUBSCRIBED,
+                            f"✅ Reconnected to `{server_name}`." if was_subscribed else None
+                        )
+                        was_subscribed = True
+                        backoff.reset()
+                        await self.resync_players(server_name, mc_ip, mc_port)
+                        while True:
+                            # Une fermeture propre lève ConnectionClosedOK (codes 1000/1001)
+                            raw, wire = await self.recv_frame(websocket)
+                            # Seule la méthode est lue d'abord: une notification ni suivie ni affichée
+                            # n'est pas décodée du tout
+                            method = codec.peek(raw, "method").get("method", "")
+                            self.wire_stats.record_in(method or "unknown", len(raw), wire)
+                            bit = NOTIFICATION_METHODS.get(method)
+                            shown = bit is not None and self.notification_mask(guild_id, server_name) & bit
+                            if not shown and method not in TRACKED_METHODS:
+                                continue
+                            message = codec.loads(raw)
+                            params = message.get("params", [{}])[0]
+                            self.track_server_state(guild_id, server_name, method, params)
+                            if not shown:
+                                continue
+                            built_at = time.perf_counter()
+                            embed = self.build_notification_embed(method, params, server_name)
+                            status.notifications += 1
+                            status.embed_time += time.perf_counter() - built_at
+                            if embed:
+                                await channel.send(embed=embed)
+                except websockets.ConnectionClosed as e:
+                    clean_close = e.rcvd is not None and e.rcvd.code in (1000, 1001)
+                    if not clean_close:
+                        status.last_error = f"connection closed ({e.rcvd.code if e.rcvd else 'no close frame'})"
+                except Exception as e:
+                    status.last_error = f"{type(e).__name__}: {e}"
+
+                if status.state is ListenerState.SUBSCRIBED:
+                    down_since = time.monotonic()
+                    self.forget_server_state(server_name)
+                    await self.report_listener_state(
+                        channel, status, ListenerState.DEGRADED, f"⚠️ Connection to `{server_name}` lost, reconnecting..."
+                    )
+                    if clean_close:
+                        # Redémarrage propre: on retente tout de suite
+                        status.reconnects += 1
+                        continue
+                elif time.monotonic() - down_since > LISTENER_GIVE_UP:
+                    await self.report_listener_state(
+                        channel, status, ListenerState.STOPPED, f"🛑 `{server_name}` is unreachable, listener stopped."
+                    )
+                    return
+                await self.report_listener_state(channel, status, ListenerState.BACKOFF)
+                await asyncio.sleep(backoff.next())
+                status.reconnects += 1
+                status.transition(ListenerState.CONNECTING)
+        finally:
+            status.transition(ListenerState.STOPPED)
+            self.forget_server_state(server_name)
 
     # Autocomplete for server names
     async def mc_serv_name_autocomplete(self, _, current: str):
@@ -294,23 +705,38 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
         return [app_commands.Choice(name=s, value=s) for s in servers[:25]]
 
 
+    async def cached_names(self, interaction: discord.Interaction, handler: str, kind: str, method: str, nested: bool):
+        """
+        Noms d'une liste du serveur lié au salon, servis depuis le cache de l'autocomplete.
+
+        :param handler: Le nom de l'autocomplete, pour les statistiques de latence.
+        :param kind: La clé de cache (`bans`, `players`).
+        :param nested: Les entrées ont la forme `{"player": {"name": ...}}`.
+        """
+        server_name = await self.channel_server(interaction.channel_id)
+        if server_name is None:
+            return []
+
+        async def fetch():
+            info = await self.bot.database.get_mc_server_info(mc_server_name=server_name)
+            if not info:
+                return None
+            _, _, ip, port = info
+            resp = await self.send_rpc_request(ip, port, method)
+            if "result" not in resp:
+                return None
+            return [(entry.get("player", {}) if nested else entry).get("name", "") for entry in resp["result"]]
+
+        names = await self.autocomplete.get(handler, interaction.user.id, (kind, server_name), fetch)
+        return names or []
+
     async def mc_ban_list_autocomplete(
         self,
         interaction: discord.Interaction,
         current: str
     ) -> list[app_commands.Choice[str]]:
-        channel_id = interaction.channel_id
-        info = await self.bot.database.get_mc_server_info(channel_id=channel_id)
-        if not info:
-            return []
-        _, _, ip, port = info
-        resp = await self.send_rpc_request(ip, port, "minecraft:bans")
-
-        ban_names = [
-            b['player']['name']
-            for b in resp.get('result', [])
-            if current.lower() in b['player']['name'].lower()
-        ]
+        names = await self.cached_names(interaction, "ban_list", "bans", "minecraft:bans", nested=True)
+        ban_names = [name for name in names if current.lower() in name.lower()]
         return [app_commands.Choice(name=name, value=name) for name in ban_names[:25]]
 
     async def mc_online_players_autocomplete(
@@ -321,27 +747,26 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
         """
         Autocomplete for online players on the server linked to the current channel.
         """
-        channel_id = interaction.channel_id
-        info = await self.bot.database.get_mc_server_info(channel_id=channel_id)
-        if not info:
-            return []
-
-        _, _, ip, port = info
-
-        try:
-            # Request the list of online players via minecraft:players RPC method
-            resp = await self.send_rpc_request(ip, port, "minecraft:players")
-            players = resp.get("result", [])
-        except Exception:
-            return []
+        names = await self.cached_names(interaction, "online_players", "players", "minecraft:players", nested=False)
 
         # Filter players by current input string (case insensitive)
-        player_names = [p["name"] for p in players if current.lower() in p["name"].lower()]
+        player_names = [name for name in names if current.lower() in name.lower()]
 
         # Limit to max 25 choices for Discord autocomplete
         return [app_commands.Choice(name=name, value=name) for name in player_names[:25]]
 
 
+    async def mc_guild_players_autocomplete(
+        self,
+        interaction: discord.Interaction,
+        current: str
+    ) -> list[app_commands.Choice[str]]:
+        """Autocomplete over the players online on any server of this Discord server, from the index."""
+        if interaction.guild_id not in self.player_index:
+            return []
+        names = self.player_index[interaction.guild_id].search(current)
+        return [app_commands.Choice(name=name, value=name) for name in names]
+
     # Command group for Minecraft server
     @commands.hybrid_group(name="mc", description="Minecraft server management")
     async def mc(self, ctx: Context):
@@ -389,12 +814,11 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
 
     @mc_config.command(name="reload", description="Reload the Minecraft config.json file")
     async def reload_config(self, ctx: commands.Context):
-        if not self.has_permission("mc_config", ctx.author):
+        if not await self.has_permission("mc_config", ctx):
             await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
             return
         try:
-            with open("config.json", "r", encoding="utf-8") as f:
-                self.bot.config = json.load(f)
+            self.bot.config_watcher.reload()
 
             embed = discord.Embed(
                 title="✅ Config Reloaded",
@@ -414,10 +838,12 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
     # Add a Minecraft server
     @mc_config.command(name="add", description="Add a Minecraft server connection")
     async def add_server(self, ctx: Context, name: Optional[str] = None, ip: str = "localhost", port: int = 25585):
-        if not self.has_permission("mc_config", ctx.author):
+        if not await self.has_permission("mc_config", ctx, name):
             await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
             return
         success = await self.bot.database.add_minecraft_server(ctx.guild.id, ctx.channel.id, name, ip, port)
+        self.channel_servers.clear()
+        self.targets_loaded_at = None
         msg = "✅ Server added." if success else "❌ Name already taken."
         await ctx.send(msg)
 
@@ -425,10 +851,14 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
     @mc_config.command(name="remove", description="Remove a Minecraft server connection")
     @app_commands.autocomplete(name=mc_serv_name_autocomplete)
     async def remove_server(self, ctx: Context, name: Optional[str] = None):
-        if not self.has_permission("mc_config", ctx.author):
+        if not await self.has_permission("mc_config", ctx, name):
             await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
             return
         success = await self.bot.database.remove_minecraft_server(ctx.guild.id, name)
+        self.channel_servers.clear()
+        self.embed_templates.clear()
+        self.targets_loaded_at = None
+        self.notif_masks.pop((ctx.guild.id, name), None)
         msg = f"🗑️ Server `{name}` removed." if success else f"❌ Server `{name}` not found."
         await ctx.send(msg)
 
@@ -436,10 +866,12 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
     @mc_config.command(name="edit", description="Edit an existing Minecraft server connection")
     @app_commands.autocomplete(name=mc_serv_name_autocomplete)
     async def edit_server(self, ctx, name: Optional[str] = None, new_ip: str = None, new_port: int = None):
-        if not self.has_permission("mc_config", ctx.author):
+        if not await self.has_permission("mc_config", ctx, name):
             await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
             return
         success = await self.bot.database.edit_minecraft_server(ctx.guild.id, name, new_ip, new_port)
+        self.channel_servers.clear()
+        self.targets_loaded_at = None
         if success:
             await ctx.send(f"✏️ Server `{name}` updated.")
         else:
@@ -447,7 +879,7 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
 
     @mc_config.command(name="list", description="List all configured Minecraft servers")
     async def list_servers(self, ctx: Context):
-        if not self.has_permission("mc_config", ctx.author):
+        if not await self.has_permission("mc_config", ctx):
             await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
             return
         servers = await self.bot.database.get_all_mc_servers_full()
@@ -464,38 +896,464 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
         await ctx.send(embed=embed)
 
 
+    @mc_config.command(name="notifications", description="Show or edit the notifications of a Minecraft server")
+    @app_commands.autocomplete(name=mc_serv_name_autocomplete)
+    @app_commands.describe(
+        event="The notification to turn on or off",
+        enabled="Whether the notification is sent",
+        reset="Follow config.json again",
+        name="Server name (optional, defaults to this channel)"
+    )
+    async def notifications(
+        self,
+        ctx: Context,
+        event: Optional[Literal[
+            "players_joined",
+            "players_left",
+            "bans_added",
+            "bans_removed",
+            "allowlist_added",
+            "allowlist_removed",
+            "operators_added",
+            "operators_removed",
+            "server_started",
+            "server_stopping",
+            "server_saving",
+            "server_saved",
+            "server_status",
+            "gamerules_updated"
+        ]] = None,
+        enabled: Optional[bool] = None,
+        reset: bool = False,
+        name: Optional[str] = None
+    ):
+        if not await self.has_permission("mc_config", ctx, name):
+            await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
+            return
+        if ctx.guild is None:
+            await ctx.send("❌ This command can only be used in a server.", ephemeral=True)
+            return
+        name = name or await self.channel_server(ctx.channel.id)
+        if name is None:
+            await ctx.send("❌ Server configuration not found for this channel.", ephemeral=True)
+            return
+        key = (ctx.guild.id, name)
+
+        if reset or (event is not None and enabled is not None):
+            if reset:
+                mask = None
+            elif enabled:
+                mask = self.notification_mask(*key) | NOTIFICATION_BITS[event]
+            else:
+                mask = self.notification_mask(*key) & ~NOTIFICATION_BITS[event]
+            if not await self.bot.database.set_notification_mask(ctx.guild.id, name, mask):
+                await ctx.send(f"❌ Server `{name}` not found.")
+                return
+            if mask is None:
+                self.notif_masks.pop(key, None)
+            else:
+                self.notif_masks[key] = mask
+
+        current = self.notification_mask(*key)
+        embed = discord.Embed(
+            title=f"🔔 Notifications for `{name}`",
+            description="\n".join(
+                f"{'✅' if current & NOTIFICATION_BITS[notification] else '❌'} `{notification}`"
+                for notification in NOTIFICATIONS
+            ),
+            color=0x5865F2
+        )
+        embed.set_footer(text="Own settings" if key in self.notif_masks else "Following config.json")
+        await ctx.send(embed=embed)
+
+    @mc_config.command(name="tags", description="Show or replace the tags of a Minecraft server")
+    @app_commands.autocomplete(name=mc_serv_name_autocomplete)
+    @app_commands.describe(
+        tags="Tags separated by commas, `-` to remove them all",
+        name="Server name (optional, defaults to this channel)"
+    )
+    async def tags(self, ctx: Context, tags: Optional[str] = None, name: Optional[str] = None):
+        if not await self.has_permission("mc_config", ctx, name):
+            await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
+            return
+        if ctx.guild is None:
+            await ctx.send("❌ This command can only be used in a server.", ephemeral=True)
+            return
+        name = name or await self.channel_server(ctx.channel.id)
+        if tags is not None:
+            new_tags = sorted({tag.strip().lower() for tag in tags.split(",") if tag.strip() and tag.strip() != "-"})
+            if not name or not await self.bot.database.set_mc_server_tags(ctx.guild.id, name, new_tags):
+                await ctx.send(f"❌ Server `{name}` not found.")
+                return
+        current = {
+            server_name: server_tags
+            for server_name, _, _, server_tags in await self.bot.database.get_guild_mc_servers(ctx.guild.id)
+        }
+        if name not in current:
+            await ctx.send("❌ Server configuration not found for this channel.", ephemeral=True)
+            return
+        shown = ", ".join(f"`{tag}`" for tag in current[name].split(",") if tag) or "No tags"
+        await ctx.send(f"🏷️ Tags of `{name}`: {shown}")
+
+    @mc_config.command(name="reconcile", description="Bring servers to a desired state (allowlist, ops, bans, settings, gamerules)")
+    @app_commands.describe(
+        file="JSON desired state, or {\"servers\": {name: state}} for one state per server",
+        targets="`all`, `tag:<tag>` or server names (defaults to this channel), ignored with `servers`",
+        dry_run="Only show the changes without applying them"
+    )
+    async def reconcile(self, ctx: Context, file: discord.Attachment, targets: Optional[str] = None, dry_run: bool = True):
+        if ctx.guild is None:
+            await ctx.send("❌ This command can only be used in a server.", ephemeral=True)
+            return
+        if file.size > 1024 * 1024:
+            await ctx.send("❌ The desired state file is limited to 1 MiB.", ephemeral=True)
+            return
+        try:
+            document = json.loads(await file.read())
+            if isinstance(document, dict) and "servers" in document:
+                if not isinstance(document["servers"], dict) or len(document) > 1:
+                    raise StateError("`servers` must be an object and the only key")
+                states = {name.lower(): validate_state(state) for name, state in document["servers"].items()}
+                targets = list(document["servers"])
+            else:
+                states = {None: validate_state(document)}
+        except (ValueError, StateError) as e:
+            await ctx.send(f"❌ Invalid desired state: {e}", ephemeral=True)
+            return
+        if targets is None:
+            channel_server = await self.channel_server(ctx.channel.id)
+            targets = [channel_server] if channel_server else []
+        servers, skipped = await self.resolve_targets(ctx, targets, "mc_config")
+        if not servers:
+            await ctx.send("❌ No server to reconcile.", ephemeral=True)
+            return
+        await ctx.defer()
+
+        async def reconcile_server(target):
+            name, ip, port = target
+            return await self.apply_state(ip, port, states.get(name.lower(), states.get(None)), dry_run)
+
+        embed = discord.Embed(
+            title="🧪 Reconcile (dry run)" if dry_run else "🔁 Reconcile",
+            color=0x5865F2 if dry_run else 0x57F287,
+            timestamp=datetime.utcnow()
+        )
+        results = sorted(
+            [result async for result in fan_out(servers, reconcile_server, limit=FAN_OUT_LIMIT, timeout=30)],
+            key=lambda result: result.target[0].lower()
+        )
+        total = failed = 0
+        sections = []  # (titre, plan) de chaque serveur
+        for result in results:
+            name = result.target[0]
+            if not result.ok:
+                sections.append((f"❌ {name}", "timeout" if result.timed_out else str(result.error)))
+                continue
+            changes, responses = result.result
+            total += len(changes)
+            lines = []
+            for index, change in enumerate(changes):
+                mark = "•"
+                if responses:
+                    ok = "result" in responses[index]
+                    failed += not ok
+                    mark = "✅" if ok else "❌"
+                lines.append(f"{mark} {change.summary}")
+            sections.append((f"{name} ({len(changes)} changes)", "\n".join(lines) or "Already up to date"))
+        footer = f"{total} changes on {len(results)} servers"
+        if failed:
+            footer += f" · {failed} failed"
+        if skipped:
+            footer += " · skipped: " + ", ".join(target for target, _ in skipped)
+        embed.set_footer(text=footer[:2048])
+
+        # Un embed est limité à 25 champs de 1024 caractères et 6000 caractères au total:
+        # ce qui ne rentre pas est envoyé en entier dans un fichier texte joint
+        budget = RECONCILE_EMBED_BUDGET - len(embed.title) - len(embed.footer.text)
+        complete = True
+        for index, (title, text) in enumerate(sections):
+            value = text if len(text) <= 1024 else text[:1020] + "\n..."
+            if index >= 25 or len(title[:256]) + len(value) > budget:
+                complete = False
+                break
+            complete = complete and value == text
+            embed.add_field(name=title[:256], value=value, inline=False)
+            budget -= len(title[:256]) + len(value)
+        if complete:
+            await ctx.send(embed=embed)
+            return
+        embed.description = f"Too long to show in full, the complete plan of the {len(sections)} servers is attached."
+        plan_text = "\n\n".join(f"{title}\n{text}" for title, text in sections)
+        await ctx.send(embed=embed, file=discord.File(io.BytesIO(plan_text.encode()), filename="reconcile.txt"))
+
+    # Settings profiles
+    @mc_config.group(name="profile", description="Named server settings profiles")
+    async def profile(self, ctx: Context):
+        if ctx.invoked_subcommand is None:
+            await ctx.send("Use a subcommand: `set`, `unset`, `show`, `delete` or `apply`.")
+
+    async def profile_autocomplete(self, interaction: discord.Interaction, current: str):
+        if interaction.guild_id is None:
+            return []
+        profiles = await self.bot.database.get_settings_profiles(interaction.guild_id)
+        return [
+            app_commands.Choice(name=name, value=name)
+            for name, _ in profiles if current.lower() in name.lower()
+        ][:25]
+
+    async def setting_autocomplete(self, _, current: str):
+        return [app_commands.Choice(name=key, value=key) for key in SERVER_SETTINGS if current.lower() in key][:25]
+
+    async def load_profile(self, ctx: Context, profile: str) -> Optional[dict]:
+        settings = await self.bot.database.get_settings_profile(ctx.guild.id, profile)
+        if settings is None:
+            await ctx.send(f"❌ Profile `{profile}` not found.", ephemeral=True)
+            return None
+        return json.loads(settings)
+
+    @profile.command(name="set", description="Set a value in a settings profile, the profile is created if needed")
+    @app_commands.autocomplete(profile=profile_autocomplete, setting=setting_autocomplete)
+    async def profile_set(self, ctx: Context, profile: str, setting: str, value: str):
+        if not await self.has_permission("mc_config", ctx):
+            await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
+            return
+        if ctx.guild is None:
+            await ctx.send("❌ This command can only be used in a server.", ephemeral=True)
+            return
+        try:
+            parsed = parse_setting(setting, value)
+        except StateError as e:
+            await ctx.send(f"❌ {e}", ephemeral=True)
+            return
+        settings = json.loads(await self.bot.database.get_settings_profile(ctx.guild.id, profile) or "{}")
+        settings[setting] = parsed
+        await self.bot.database.save_settings_profile(ctx.guild.id, profile, json.dumps(settings))
+        await ctx.send(f"✏️ Profile `{profile}`: `{setting}` = `{parsed}`")
+
+    @profile.command(name="unset", description="Remove a value from a settings profile")
+    @app_commands.autocomplete(profile=profile_autocomplete, setting=setting_autocomplete)
+    async def profile_unset(self, ctx: Context, profile: str, setting: str):
+        if not await self.has_permission("mc_config", ctx):
+            await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
+            return
+        if ctx.guild is None:
+            await ctx.send("❌ This command can only be used in a server.", ephemeral=True)
+            return
+        settings = await self.load_profile(ctx, profile)
+        if settings is None:
+            return
+        settings.pop(setting, None)
+        await self.bot.database.save_settings_profile(ctx.guild.id, profile, json.dumps(settings))
+        await ctx.send(f"✏️ Profile `{profile}`: `{setting}` removed")
+
+    @profile.command(name="show", description="Show one settings profile, or list them all")
+    @app_commands.autocomplete(profile=profile_autocomplete)
+    async def profile_show(self, ctx: Context, profile: Optional[str] = None):
+        if not await self.has_permission("mc_config", ctx):
+            await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
+            return
+        if ctx.guild is None:
+            await ctx.send("❌ This command can only be used in a server.", ephemeral=True)
+            return
+        if profile is None:
+            profiles = await self.bot.database.get_settings_profiles(ctx.guild.id)
+            embed = discord.Embed(title="🎛️ Settings profiles", color=0x5865F2)
+            embed.description = "\n".join(
+                f"`{name}` · {len(json.loads(settings))} settings" for name, settings in profiles
+            ) or "No profile yet, create one with `/mc_config profile set`."
+            await ctx.send(embed=embed)
+            return
+        settings = await self.load_profile(ctx, profile)
+        if settings is None:
+            return
+        embed = discord.Embed(
+            title=f"🎛️ Profile `{profile}`",
+            description="\n".join(f"`{key}` = `{value}`" for key, value in sorted(settings.items())) or "Empty",
+            color=0x5865F2
+        )
+        await ctx.send(embed=embed)
+
+    @profile.command(name="delete", description="Delete a settings profile")
+    @app_commands.autocomplete(profile=profile_autocomplete)
+    async def profile_delete(self, ctx: Context, profile: str):
+        if not await self.has_permission("mc_config", ctx):
+            await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
+            return
+        if ctx.guild is None:
+            await ctx.send("❌ This command can only be used in a server.", ephemeral=True)
+            return
+        if await self.bot.database.delete_settings_profile(ctx.guild.id, profile):
+            await ctx.send(f"🗑️ Profile `{profile}` deleted.")
+        else:
+            await ctx.send(f"❌ Profile `{profile}` not found.")
+
+    @profile.command(name="apply", description="Apply a settings profile to several servers")
+    @app_commands.autocomplete(profile=profile_autocomplete)
+    @app_commands.describe(
+        profile="The profile to apply",
+        targets="`all`, `tag:<tag>` or server names separated by commas",
+        dry_run="Only show what would change"
+    )
+    async def profile_apply(self, ctx: Context, profile: str, targets: str, dry_run: bool = False):
+        if ctx.guild is None:
+            await ctx.send("❌ This command can only be used in a server.", ephemeral=True)
+            return
+        settings = await self.load_profile(ctx, profile)
+        if settings is None:
+            return
+        servers, skipped = await self.resolve_targets(ctx, targets, "mc_config")
+        if not servers:
+            await ctx.send("❌ No server to apply the profile to.", ephemeral=True)
+            return
+        await ctx.defer()
+
+        # Seuls les réglages qui diffèrent de la valeur actuelle sont envoyés
+        state = {"settings": settings}
+
+        async def apply(target):
+            _, ip, port = target
+            return await self.apply_state(ip, port, state, dry_run)
+
+        lines, changed, failed = [], 0, 0
+        async for result in fan_out(servers, apply, limit=FAN_OUT_LIMIT, timeout=FAN_OUT_TIMEOUT * 2):
+            name = result.target[0]
+            if not result.ok:
+                failed += 1
+                lines.append(f"❌ `{name}` · {'timeout' if result.timed_out else str(result.error)[:80]}")
+                continue
+            changes, responses = result.result
+            errors = sum(1 for resp in responses if "result" not in resp)
+            changed += len(changes) - errors
+            failed += bool(errors)
+            summary = ", ".join(change.summary for change in changes) or "already up to date"
+            lines.append(f"{'❌' if errors else '✅'} `{name}` · {summary}"[:300])
+        lines.sort(key=lambda line: line.split("`")[1].lower())
+        lines += [f"⏭️ `{target}` · {reason}" for target, reason in skipped]
+        description = "\n".join(lines)
+        if len(description) > 4000:
+            description = description[:4000].rsplit("\n", 1)[0] + "\n..."
+        embed = discord.Embed(
+            title=f"🎛️ Profile `{profile}` {'(dry run)' if dry_run else 'applied'}",
+            description=description,
+            color=0x57F287 if not failed else 0xE67E22,
+            timestamp=datetime.utcnow()
+        )
+        embed.set_footer(text=f"{changed} settings {'to change' if dry_run else 'changed'} on {len(servers)} servers")
+        await ctx.send(embed=embed)
+
+    @mc_config.command(name="listeners", description="Show the state of every server listener")
+    async def listeners_status(self, ctx: Context):
+        if not await self.has_permission("mc_config", ctx):
+            await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
+            return
+        embed = discord.Embed(
+            title="🎧 Listeners",
+            description=f"{len(self.listeners)} running" if len(self.listeners) else "No listener running.",
+            color=0x5865F2
+        )
+        now = time.monotonic()
+        # Les listeners terminés restent affichés avec leur dernière erreur jusqu'au prochain démarrage
+        for name in sorted(self.listeners.tasks.keys() | self.listeners.statuses.keys()):
+            status = self.listeners.statuses.get(name)
+            if status is None:
+                embed.add_field(name=name, value="Starting...", inline=False)
+                continue
+            uptime = int(now - status.subscribed_at) if status.state is ListenerState.SUBSCRIBED else 0
+            lines = [
+                f"State: **{status.state.value}** for {int(now - status.since)}s",
+                f"Uptime: {uptime // 3600}h {uptime % 3600 // 60}m {uptime % 60}s",
+                f"Reconnects: {status.reconnects} · Restarts: {status.restarts}",
+            ]
+            if status.notifications:
+                lines.append(
+                    f"Notifications: {status.notifications} · "
+                    f"{status.embed_time / status.notifications * 1e6:.1f}µs per embed"
+                )
+            if status.last_error:
+                lines.append(f"Last error: `{status.last_error[:200]}`")
+            embed.add_field(name=name, value="\n".join(lines), inline=False)
+        await ctx.send(embed=embed)
+
+    @mc_config.command(name="autocomplete", description="Show the latency of the autocomplete handlers")
+    async def autocomplete_stats(self, ctx: Context):
+        if not await self.has_permission("mc_config", ctx):
+            await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
+            return
+        stats = self.autocomplete.stats
+        if not stats:
+            await ctx.send("No autocomplete request has been answered yet.", ephemeral=True)
+            return
+        embed = discord.Embed(title="⌨️ Autocomplete", color=0x5865F2)
+        for handler, handler_stats in sorted(stats.items()):
+            embed.add_field(
+                name=handler,
+                value=f"Calls: {handler_stats.calls} · From cache: {handler_stats.hits} ({handler_stats.stale} stale)\n"
+                      f"Latency: p50 {handler_stats.p50 * 1000:.0f}ms · p99 {handler_stats.p99 * 1000:.0f}ms\n"
+                      f"Over budget: {handler_stats.timeouts}",
+                inline=False
+            )
+        embed.set_footer(text=f"Budget {AUTOCOMPLETE_BUDGET}s · refreshed after {AUTOCOMPLETE_TTL}s")
+        await ctx.send(embed=embed)
+
+    @mc_config.command(name="wire", description="Show JSON vs. network bytes per MSMP method")
+    async def wire_stats_command(self, ctx: Context):
+        if not await self.has_permission("mc_config", ctx):
+            await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
+            return
+        methods = self.wire_stats.methods
+        if not methods:
+            await ctx.send("No MSMP message has been exchanged yet.", ephemeral=True)
+            return
+        compression = self.bot.config.compression
+        lines = [f"{'Method':<32} {'Msgs':>6} {'JSON':>9} {'Wire':>9} {'Ratio':>6}"]
+        top = sorted(methods.items(), key=lambda item: -(item[1].raw_in + item[1].raw_out))[:20]
+        for method, stats in top:
+            raw = stats.raw_in + stats.raw_out
+            wire = stats.wire_in + stats.wire_out
+            lines.append(
+                f"{method.removeprefix('minecraft:')[:32]:<32} {stats.sent + stats.received:>6} "
+                f"{format_bytes(raw):>9} {format_bytes(wire):>9} {stats.ratio:>6.0%}"
+            )
+        embed = discord.Embed(title="📦 MSMP payloads", description="```\n" + "\n".join(lines) + "\n```", color=0x5865F2)
+        embed.set_footer(
+            text=f"permessage-deflate {'offered' if compression.enabled else 'disabled'}"
+                 + (f" · uncompressed below {compression.min_size} B" if compression.enabled else "")
+        )
+        await ctx.send(embed=embed)
+
     # Start listening for events on the server // Deprecated
     @mc_config.command(name="connect", description="Start listening to server events")
     @app_commands.autocomplete(name=mc_serv_name_autocomplete)
     async def connect(self, ctx, name: Optional[str] = None):
-        if not self.has_permission("mc_config", ctx.author):
+        if not await self.has_permission("mc_config", ctx, name):
             await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
             return
-        server = await self.resolve_server(ctx, name)
-        if not server:
+        name = name or await self.channel_server(ctx.channel.id)
+        info = await self.bot.database.get_mc_server_info(mc_server_name=name) if name else None
+        if not info:
+            await ctx.send("❌ Server configuration not found for this channel.", ephemeral=True)
             return
-        ip, port, channel_id, name = server
-        self.listeners[name] = asyncio.create_task(self.listen_to_mc_server(ip, port, channel_id, name))
-        self.active_servers.add(name)  # Mark as active
+        _, channel_id, ip, port = info
+        if name in self.listeners:
+            await ctx.send(f"⚠️ Bot is already listening to server `{name}`.")
+            return
+        if not self.claim_server(name, ip, port):
+            await ctx.send(f"⚠️ `{name}` is already listened to by `{self.server_owner(ip, port)}`.")
+            return
+        self.listeners.start(name, partial(self.listen_to_mc_server, ip, port, int(channel_id), name))
         await ctx.send(f"🎧 Listening for events from `{name}` ({ip}:{port})")
 
     @mc_config.command(name="disconnect", description="Stop listening to Minecraft server events")
     @app_commands.autocomplete(name=mc_serv_name_autocomplete)
     async def disconnect(self, ctx: commands.Context, name: Optional[str] = None):
-        if not self.has_permission("mc_config", ctx.author):
+        if not await self.has_permission("mc_config", ctx, name):
             await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
             return
-        if name not in self.listeners:
+        # Cancel the listening task, the supervisor releases the server
+        if not await self.listeners.stop(name):
             await ctx.send(f"⚠️ Bot is not currently listening to server `{name}`.")
             return
 
-        # Cancel the listening task
-        task = self.listeners.pop(name)
-        task.cancel()
-
-        # Remove from active servers set
-        self.active_servers.discard(name)
-
         await ctx.send(f"🛑 Disconnected from server `{name}`. No longer listening to events.")
 
 
@@ -503,7 +1361,7 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
     @mc.command(name="stop", description="Stop the Minecraft server")
     @app_commands.autocomplete(name=mc_serv_name_autocomplete)
     async def stop_server(self, ctx, name: Optional[str] = None):
-        if not self.has_permission("system", ctx.author):
+        if not await self.has_permission("system", ctx, name):
             await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
             return
         server = await self.resolve_server(ctx, name)
@@ -516,7 +1374,7 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
     @mc.command(name="broadcast", description="Send a system message to all players")
     @app_commands.autocomplete(name=mc_serv_name_autocomplete)
     async def broadcast(self, ctx, *, message: str, name: Optional[str] = None):
-        if not self.has_permission("system", ctx.author):
+        if not await self.has_permission("system", ctx, name):
             await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
             return
         server = await self.resolve_server(ctx, name)
@@ -532,12 +1390,138 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
         resp = await self.send_rpc_request(ip, port, "minecraft:server/system_message", [payload])
         await ctx.send(self.parse_rpc_response(resp, success_msg=f"Broadcast sent: {message}"))
 
+    @mc.command(name="announce", description="Send a system message to several servers at once")
+    @app_commands.describe(
+        targets="`all`, `tag:<tag>` or server names separated by commas",
+        message="The message shown to every player"
+    )
+    async def announce(self, ctx: Context, targets: str, *, message: str):
+        if ctx.guild is None:
+            await ctx.send("❌ This command can only be used in a server.", ephemeral=True)
+            return
+        servers, skipped = await self.resolve_targets(ctx, targets, "system")
+        if not servers:
+            reasons = "\n".join(f"- `{target}`: {reason}" for target, reason in skipped)
+            await ctx.send(f"❌ No server to send the message to.\n{reasons}", ephemeral=True)
+            return
+        await ctx.defer()
+
+        payload = {
+            "message": {"literal": message},
+            "overlay": False,
+            "receivingPlayers": []  # vide = tout le monde
+        }
+
+        async def send(target):
+            _, ip, port = target
+            return await self.send_rpc_request(ip, port, "minecraft:server/system_message", [payload])
+
+        lines, sent = [], 0
+        async for result in fan_out(servers, send, limit=FAN_OUT_LIMIT, timeout=FAN_OUT_TIMEOUT):
+            ok, line = self.fan_out_line(result.target[0], result)
+            sent += ok
+            lines.append(line)
+        lines.sort(key=lambda line: line.split("`")[1].lower())
+        lines += [f"⏭️ `{target}` · {reason}" for target, reason in skipped]
+
+        description = "\n".join(lines)
+        if len(description) > 4000:
+            description = description[:4000].rsplit("\n", 1)[0] + "\n..."
+        embed = discord.Embed(
+            title=f"📢 Broadcast sent to {sent}/{len(servers)} servers",
+            description=description,
+            color=0x57F287 if sent == len(servers) else 0xE67E22,
+            timestamp=datetime.utcnow()
+        )
+        embed.add_field(name="Message", value=message[:1024], inline=False)
+        await ctx.send(embed=embed)
+
+    @mc.command(name="bulk", description="Apply a moderation action to many players on many servers")
+    @app_commands.describe(
+        action="What to do with the players",
+        players="Player names separated by commas or spaces",
+        targets="`all`, `tag:<tag>` or server names separated by commas",
+        reason="Reason shown for bans and kicks"
+    )
+    async def bulk(
+        self,
+        ctx: Context,
+        action: Literal["ban", "unban", "kick", "allowlist_add", "allowlist_remove", "op", "deop"],
+        players: str,
+        targets: str,
+        *,
+        reason: str = "Moderated via Discord"
+    ):
+        if ctx.guild is None:
+            await ctx.send("❌ This command can only be used in a server.", ephemeral=True)
+            return
+        method, permission, build_params = BULK_ACTIONS[action]
+        names = list(dict.fromkeys(filter(None, re.split(r"[,\s]+", players.strip()))))
+        if not names:
+            await ctx.send("❌ No player given.", ephemeral=True)
+            return
+        servers, skipped = await self.resolve_targets(ctx, targets, permission)
+        if not servers:
+            reasons = "\n".join(f"- `{target}`: {reason}" for target, reason in skipped)
+            await ctx.send(f"❌ No server to apply `{action}` on.\n{reasons}", ephemeral=True)
+            return
+        await ctx.defer()
+
+        # Un seul appel par serveur pour tous les joueurs
+        params = build_params(names, reason)
+
+        async def apply(target):
+            _, ip, port = target
+            return await self.send_rpc_request(ip, port, method, params)
+
+        # Les serveurs en échec sont retentés, avec une petite pause qui s'allonge
+        results, attempts, pending = {}, {}, servers
+        for attempt in range(1 + BULK_RETRIES):
+            if attempt:
+                await asyncio.sleep(attempt)
+            failed = []
+            async for result in fan_out(pending, apply, limit=FAN_OUT_LIMIT, timeout=FAN_OUT_TIMEOUT):
+                name = result.target[0]
+                attempts[name] = attempt + 1
+                results[name] = self.fan_out_line(name, result)
+                if not results[name][0]:
+                    failed.append(result.target)
+            pending = failed
+            if not pending:
+                break
+
+        succeeded = sum(1 for ok, _ in results.values() if ok)
+        lines = []
+        for name in sorted(results, key=str.lower):
+            line = results[name][1]
+            if attempts[name] > 1:
+                line += f" (attempt {attempts[name]})"
+            lines.append(line)
+        lines += [f"⏭️ `{target}` · {reason}" for target, reason in skipped]
+        description = "\n".join(lines)
+        if len(description) > 4000:
+            description = description[:4000].rsplit("\n", 1)[0] + "\n..."
+
+        if succeeded == len(servers):
+            title = f"✅ `{action}` applied on all {len(servers)} servers"
+        else:
+            title = f"⚠️ `{action}` applied on {succeeded}/{len(servers)} servers"
+        embed = discord.Embed(
+            title=title,
+            description=description,
+            color=0x57F287 if succeeded == len(servers) else 0xE67E22,
+            timestamp=datetime.utcnow()
+        )
+        shown = ", ".join(f"`{name}`" for name in names)
+        embed.add_field(name=f"Players ({len(names)})", value=shown if len(shown) <= 1024 else shown[:1020] + "...", inline=False)
+        await ctx.send(embed=embed)
+
     ########################################
     # Get server status
     @mc.command(name="status", description="Get the current status of the server")
     @app_commands.autocomplete(name=mc_serv_name_autocomplete)
     async def status(self, ctx, name: Optional[str] = None):
-        if not self.has_permission("server_status", ctx.author):
+        if not await self.has_permission("server_status", ctx, name):
             await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
             return
         server = await self.resolve_server(ctx, name)
@@ -549,11 +1533,7 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
 
         if "result" in resp:
             status_data = resp["result"]
-            embed = discord.Embed(
-                title=f"🖥️ Server Status - {name}",
-                color=0x57F287,
-                timestamp=datetime.utcnow()
-            )
+            embed = self.embed_templates.get(name, "status").build()
 
             # Server started?
             embed.add_field(name="Status", value="🟢 Online" if status_data.get("started") else "🔴 Offline", inline=False)
@@ -575,6 +1555,111 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
             await ctx.send(f"⚠️ Error fetching server status: `{resp}`")
 
 
+    def cached_status(self, name: str) -> Optional[dict]:
+        """Dernier statut reçu d'un serveur écouté, None s'il est trop vieux"""
+        if name not in self.listeners or name not in self.status_cache:
+            return None
+        received_at, status_data = self.status_cache[name]
+        if time.monotonic() - received_at > FLEET_CACHE_TTL:
+            return None
+        return status_data
+
+    @mc.command(name="fleet", description="Status of every Minecraft server of this Discord server")
+    async def fleet(self, ctx: Context):
+        if not await self.has_permission("server_status", ctx):
+            await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
+            return
+        if ctx.guild is None:
+            await ctx.send("❌ This command can only be used in a server.", ephemeral=True)
+            return
+        servers = await self.bot.database.get_guild_mc_servers(ctx.guild.id)
+        if not servers:
+            await ctx.send("❌ No Minecraft server configured for this Discord server.")
+            return
+
+        rows = {name: None for name, *_ in servers}  # name -> (online, players, version, latency) ou un message
+        to_probe = []
+        for name, ip, port, _ in servers:
+            status_data = self.cached_status(name)
+            if status_data is None:
+                to_probe.append((name, ip, port))
+            else:
+                rows[name] = (status_data.get("started", False), len(status_data.get("players", [])),
+                              status_data.get("version", {}).get("name", "?"), "cached")
+
+        def render(page: int) -> discord.Embed:
+            names = list(rows)[page * FLEET_PAGE_SIZE:(page + 1) * FLEET_PAGE_SIZE]
+            lines = [f"{'Server':<16} {'':2} {'Players':>7}  {'Version':<10} {'RPC':>7}"]
+            for name in names:
+                row = rows[name]
+                if row is None:
+                    state, players, version, latency = "⏳", "", "", ""
+                elif isinstance(row, str):
+                    state, players, version, latency = "⚠️", "", row, ""
+                else:
+                    online, players, version, latency = row
+                    state = "🟢" if online else "🔴"
+                    latency = latency if isinstance(latency, str) else f"{latency * 1000:.0f} ms"
+                lines.append(f"{name[:16]:<16} {state} {players:>7}  {version[:10]:<10} {latency:>7}")
+            online = sum(1 for row in rows.values() if isinstance(row, tuple) and row[0])
+            pending = sum(1 for row in rows.values() if row is None)
+            embed = discord.Embed(
+                title=f"🛰️ Fleet - {ctx.guild.name}",
+                description="```\n" + "\n".join(lines) + "\n```",
+                color=0x5865F2,
+                timestamp=datetime.utcnow()
+            )
+            footer = f"{online}/{len(rows)} online"
+            if pending:
+                footer += f" · {pending} pending"
+            embed.set_footer(text=f"{footer} · Page {page + 1}/{paginator.page_count}")
+            return embed
+
+        paginator = Paginator(render, -(-len(rows) // FLEET_PAGE_SIZE), author_id=ctx.author.id)
+        await paginator.send(ctx)
+        if not to_probe:
+            return
+
+        async def probe(target):
+            _, ip, port = target
+            return await self.send_rpc_request(ip, port, "minecraft:server/status")
+
+        # Les résultats arrivent au fil de l'eau, le message est réédité au plus toutes les 0,5 s
+        last_edit = time.monotonic()
+        async for result in fan_out(to_probe, probe, deadline=FLEET_DEADLINE):
+            name = result.target[0]
+            if result.timed_out:
+                rows[name] = "timeout"
+            elif not result.ok or "result" not in result.result:
+                rows[name] = "down"
+            else:
+                status_data = result.result["result"]
+                if name in self.listeners:
+                    self.status_cache[name] = (time.monotonic(), status_data)
+                rows[name] = (status_data.get("started", False), len(status_data.get("players", [])),
+                              status_data.get("version", {}).get("name", "?"), result.latency)
+            if time.monotonic() - last_edit >= 0.5:
+                last_edit = time.monotonic()
+                await paginator.refresh()
+        await paginator.refresh()
+
+    @mc.command(name="find", description="Find which Minecraft servers a player is online on")
+    @app_commands.autocomplete(player=mc_guild_players_autocomplete)
+    async def find(self, ctx: Context, player: str):
+        if not await self.has_permission("server_status", ctx):
+            await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
+            return
+        if ctx.guild is None:
+            await ctx.send("❌ This command can only be used in a server.", ephemeral=True)
+            return
+        index = self.players_of(ctx.guild.id)
+        servers = index.find(player)
+        if not servers:
+            await ctx.send(f"🔎 `{player}` is not online on any listened server.")
+            return
+        name = index.names[player.lower()]
+        await ctx.send(f"🔎 `{name}` is online on " + ", ".join(f"`{server}`" for server in sorted(servers)))
+
     @mc.command(
         name="server_properties",
         description="Modifier les propriétés d'un serveur Minecraft (fichier server.properties)"
@@ -628,11 +1713,11 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
         use_allowlist: Optional[bool] = None,
         viewdistance: Optional[int] = None
     ):
-        if not self.has_permission("server_properties", ctx.author):
+        if not await self.has_permission("server_properties", ctx, name):
             await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
             return
         await ctx.defer()
-        if not self.has_permission("server_properties", ctx.author):
+        if not await self.has_permission("server_properties", ctx, name):
             await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
             return
         
@@ -946,7 +2031,7 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
     @app_commands.autocomplete(name=mc_serv_name_autocomplete)
     @app_commands.autocomplete(player=mc_online_players_autocomplete)
     async def kick(self, ctx, player: str, *, reason: str = "Kicked! 🦵 👢", name: Optional[str]):
-        if not self.has_permission("server_ops", ctx.author):
+        if not await self.has_permission("server_ops", ctx, name):
             await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
             return
         server = await self.resolve_server(ctx, name)
@@ -962,11 +2047,28 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
         resp = await self.send_rpc_request(ip, port, "minecraft:players/kick", [payload])
         await ctx.send(f"👢 Kicked `{player}`: {resp}")
 
+    async def send_list(self, ctx: Context, pages: ListPages, header: list, to_row, filename: str):
+        """
+        Envoie une liste lue une seule fois: en pages (boutons, sans relire le serveur) ou, si elle
+        est très longue, en pièce jointe CSV.
+
+        :param header: Les colonnes du CSV.
+        :param to_row: Construit la ligne CSV d'une entrée.
+        """
+        if len(pages.rows) > LIST_ATTACHMENT_THRESHOLD:
+            with export_rows(header, map(to_row, pages.rows)) as spool:
+                await ctx.send(
+                    f"{pages.title}: {len(pages.rows)} entries, attached as CSV",
+                    file=discord.File(spool, filename=filename)
+                )
+            return
+        await Paginator(pages.render, pages.page_count, author_id=ctx.author.id).send(ctx)
+
     # List allowlist
     @mc.command(name="allowlist", description="Show server allowlist")
     @app_commands.autocomplete(name=mc_serv_name_autocomplete)
     async def allowlist(self, ctx, name: Optional[str]=None):
-        if not self.has_permission("server_ops", ctx.author):
+        if not await self.has_permission("server_ops", ctx, name):
             await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
             return
         server = await self.resolve_server(ctx, name)
@@ -974,15 +2076,19 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
             return
         ip, port, name = server
         resp = await self.send_rpc_request(ip, port, "minecraft:allowlist")
-        names = [p['name'] for p in resp.get('result', [])]
-        await ctx.send(f"📃 Allowlist: {', '.join(names) if names else 'Nobody'}")
+        if "result" not in resp:
+            await ctx.send(f"⚠️ Could not read the allowlist of `{name}`.")
+            return
+        names = sorted((p.get('name', '?') for p in resp['result']), key=str.lower)
+        pages = ListPages(f"📃 Allowlist of {name}", names, discord.utils.escape_markdown, color=0x57F287, empty="Nobody")
+        await self.send_list(ctx, pages, ["name"], lambda player: [player], f"{name}-allowlist.csv")
 
     # Add player to allowlist
     @mc.command(name="allowlist_add", description="Add player to allowlist")
     @app_commands.autocomplete(name=mc_serv_name_autocomplete)
     @app_commands.autocomplete(player=mc_online_players_autocomplete)
     async def allowlist_add(self, ctx, player: str, name: Optional[str] = None):
-        if not self.has_permission("server_ops", ctx.author):
+        if not await self.has_permission("server_ops", ctx, name):
             await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
             return
         server = await self.resolve_server(ctx, name)
@@ -997,7 +2103,7 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
     @app_commands.autocomplete(name=mc_serv_name_autocomplete)
     @app_commands.autocomplete(player=mc_online_players_autocomplete)
     async def allowlist_remove(self, ctx, player: str, name: Optional[str] = None):
-        if not self.has_permission("server_ops", ctx.author):
+        if not await self.has_permission("server_ops", ctx, name):
             await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
             return
         server = await self.resolve_server(ctx, name)
@@ -1011,7 +2117,7 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
     @mc.command(name="allowlist_clear", description="Clear the allowlist")
     @app_commands.autocomplete(name=mc_serv_name_autocomplete)
     async def allowlist_clear(self, ctx, name: Optional[str]=None):
-        if not self.has_permission("server_ops", ctx.author):
+        if not await self.has_permission("server_ops", ctx, name):
             await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
             return
         server = await self.resolve_server(ctx, name)
@@ -1021,11 +2127,129 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
         resp = await self.send_rpc_request(ip, port, "minecraft:allowlist/clear")
         await ctx.send(f"🧹 Allowlist cleared: {resp}")
 
+    # Import / export of allowlist and banlist
+    async def fetch_player_list(self, ip: str, port: int, kind: str) -> Optional[list]:
+        """Liste actuelle normalisée (allowlist ou bans), None si le serveur ne répond pas"""
+        resp = await self.send_rpc_request(ip, port, "minecraft:allowlist" if kind == "allowlist" else "minecraft:bans")
+        if "result" not in resp:
+            return None
+        return [entry for entry in map(normalize_entry, resp["result"]) if entry is not None]
+
+    async def import_player_list(self, ctx: Context, file: discord.Attachment, name: Optional[str], kind: str):
+        if not await self.has_permission("server_ops", ctx, name):
+            await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
+            return
+        server = await self.resolve_server(ctx, name)
+        if not server:
+            return
+        ip, port, name = server
+        await ctx.defer()
+
+        current = await self.fetch_player_list(ip, port, kind)
+        if current is None:
+            await ctx.send(f"⚠️ Could not read the current {kind} of `{name}`.")
+            return
+        # Déjà présents (par UUID ou par nom) et doublons du fichier sont ignorés
+        known = {entry["name"].lower() for entry in current} | {entry["uuid"] for entry in current if entry["uuid"]}
+        skipped = 0
+
+        async def new_entries(chunks):
+            nonlocal skipped
+            async for entry in iter_entries(chunks, file.filename):
+                keys = {entry["name"].lower(), entry["uuid"]} - {"", None}
+                if keys & known:
+                    skipped += 1
+                    continue
+                known.update(keys)
+                yield entry
+
+        def to_rpc(entry):
+            player = {"name": entry["name"]} if entry["name"] else {}
+            if entry["uuid"]:
+                player["id"] = entry["uuid"]
+            if kind == "allowlist":
+                return player
+            ban = {"player": player, "reason": entry["reason"] or "Imported via Discord"}
+            if entry["expires"]:
+                ban["expires"] = entry["expires"]
+            return ban
+
+        method = "minecraft:allowlist/add" if kind == "allowlist" else "minecraft:bans/add"
+        added = failed = 0
+        try:
+            async with self.bot.http_session.get(file.url, timeout=aiohttp.ClientTimeout(total=IMPORT_TIMEOUT)) as response:
+                response.raise_for_status()
+                async for chunk in chunked(new_entries(response.content.iter_chunked(CHUNK_SIZE)), IMPORT_CHUNK):
+                    resp = await self.send_rpc_request(ip, port, method, [[to_rpc(entry) for entry in chunk]])
+                    if "result" in resp:
+                        added += len(chunk)
+                    else:
+                        failed += len(chunk)
+        except ValueError as e:
+            await ctx.send(f"❌ Could not read `{file.filename}`: {e} ({added} entries added before the error).")
+            return
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            await ctx.send(
+                f"❌ Could not download `{file.filename}`: {str(e) or type(e).__name__} ({added} entries added before the error)."
+            )
+            return
+
+        description = f"✅ Added: **{added}**\n⏭️ Already present or duplicated: **{skipped}**"
+        if failed:
+            description += f"\n❌ Refused by the server: **{failed}**"
+        embed = discord.Embed(
+            title=f"📥 {kind.capitalize()} import - {name}",
+            description=description,
+            color=0x57F287 if not failed else 0xE67E22
+        )
+        await ctx.send(embed=embed)
+
+    async def export_player_list(self, ctx: Context, file_format: str, name: Optional[str], kind: str):
+        if not await self.has_permission("server_ops", ctx, name):
+            await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
+            return
+        server = await self.resolve_server(ctx, name)
+        if not server:
+            return
+        ip, port, name = server
+        entries = await self.fetch_player_list(ip, port, kind)
+        if entries is None:
+            await ctx.send(f"⚠️ Could not read the {kind} of `{name}`.")
+            return
+        with export_file(entries, file_format) as spool:
+            await ctx.send(
+                f"📤 {kind.capitalize()} of `{name}`: {len(entries)} entries",
+                file=discord.File(spool, filename=f"{name}-{kind}.{file_format}")
+            )
+
+    # Sous-groupe: /mc n'accepte que 25 sous-commandes
+    @mc.group(name="lists", description="Import or export the allowlist and the banlist")
+    async def lists(self, ctx: Context):
+        if ctx.invoked_subcommand is None:
+            await ctx.send("Use a subcommand: `import` or `export`.")
+
+    @lists.command(name="import", description="Add every player of a CSV/JSON file to the allowlist or the banlist")
+    @app_commands.autocomplete(name=mc_serv_name_autocomplete)
+    @app_commands.describe(
+        kind="The list the players are added to",
+        file="CSV (name,reason,expires), text (one name per line), whitelist.json or banned-players.json",
+        name="Server name (optional, defaults to this channel)"
+    )
+    async def import_list(self, ctx, kind: Literal["allowlist", "bans"], file: discord.Attachment, name: Optional[str] = None):
+        await self.import_player_list(ctx, file, name, kind)
+
+    @lists.command(name="export", description="Download the allowlist or the banlist as a file")
+    @app_commands.autocomplete(name=mc_serv_name_autocomplete)
+    async def export_list(
+        self, ctx, kind: Literal["allowlist", "bans"], file_format: Literal["csv", "json"] = "json", name: Optional[str] = None
+    ):
+        await self.export_player_list(ctx, file_format, name, kind)
+
     # Banlist commands
     @mc.command(name="banlist", description="Show server banlist")
     @app_commands.autocomplete(name=mc_serv_name_autocomplete)
     async def banlist(self, ctx, name: Optional[str]=None):
-        if not self.has_permission("server_ops", ctx.author):
+        if not await self.has_permission("server_ops", ctx, name):
             await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
             return
         server = await self.resolve_server(ctx, name)
@@ -1033,14 +2257,25 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
             return
         ip, port, name = server
         resp = await self.send_rpc_request(ip, port, "minecraft:bans")
-        ban_names = [b['player']['name'] for b in resp.get('result', [])]
-        await ctx.send(f"⛔ Banlist: {', '.join(ban_names) if ban_names else 'Nobody banned.'}")
+        if "result" not in resp:
+            await ctx.send(f"⚠️ Could not read the banlist of `{name}`.")
+            return
+        bans = sorted(
+            ((b['player'].get('name', '?'), b.get('reason') or '') for b in resp['result']),
+            key=lambda ban: ban[0].lower()
+        )
+        pages = ListPages(
+            f"⛔ Banlist of {name}", bans,
+            lambda ban: discord.utils.escape_markdown(ban[0]) + (f" — {ban[1]}" if ban[1] else ""),
+            color=0xED4245, empty="Nobody banned."
+        )
+        await self.send_list(ctx, pages, ["name", "reason"], list, f"{name}-bans.csv")
 
     @mc.command(name="ban", description="Ban a player")
     @app_commands.autocomplete(name=mc_serv_name_autocomplete)
     @app_commands.autocomplete(player=mc_online_players_autocomplete)
     async def ban(self, ctx, player: str, *, reason: Optional[str] = "Banned via Discord", name: Optional[str] = None):
-        if not self.has_permission("server_ops", ctx.author):
+        if not await self.has_permission("server_ops", ctx, name):
             await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
             return
         server = await self.resolve_server(ctx, name)
@@ -1057,7 +2292,7 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
     @app_commands.autocomplete(name=mc_serv_name_autocomplete)
     @app_commands.autocomplete(player=mc_ban_list_autocomplete)
     async def unban(self, ctx, player: str,name: Optional[str] = None):
-        if not self.has_permission("server_ops", ctx.author):
+        if not await self.has_permission("server_ops", ctx, name):
             await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
             return
         server = await self.resolve_server(ctx, name)
@@ -1071,7 +2306,7 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
     @mc.command(name="banlist_clear", description="Clear the banlist")
     @app_commands.autocomplete(name=mc_serv_name_autocomplete)
     async def banlist_clear(self, ctx, name: Optional[str] = None):
-        if not self.has_permission("server_ops", ctx.author):
+        if not await self.has_permission("server_ops", ctx, name):
             await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
             return
         server = await self.resolve_server(ctx, name)
@@ -1085,7 +2320,7 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
     @mc.command(name="ops", description="Show server operators")
     @app_commands.autocomplete(name=mc_serv_name_autocomplete)
     async def ops(self, ctx, name: Optional[str]=None):
-        if not self.has_permission("server_ops", ctx.author):
+        if not await self.has_permission("server_ops", ctx, name):
             await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
             return
         server = await self.resolve_server(ctx, name)
@@ -1093,14 +2328,25 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
             return
         ip, port, name = server
         resp = await self.send_rpc_request(ip, port, "minecraft:operators")
-        op_names = [o['player']['name'] for o in resp.get('result',[])]
-        await ctx.send(f"👑 Operators: {', '.join(op_names) if op_names else 'None'}")
+        if "result" not in resp:
+            await ctx.send(f"⚠️ Could not read the operators of `{name}`.")
+            return
+        ops = sorted(
+            ((o['player'].get('name', '?'), o.get('permissionLevel', '?')) for o in resp['result']),
+            key=lambda op: op[0].lower()
+        )
+        pages = ListPages(
+            f"👑 Operators of {name}", ops,
+            lambda op: f"{discord.utils.escape_markdown(op[0])} (level {op[1]})",
+            color=0xF1C40F, empty="None"
+        )
+        await self.send_list(ctx, pages, ["name", "level"], list, f"{name}-ops.csv")
 
     @mc.command(name="op", description="Promote player to operator")
     @app_commands.autocomplete(name=mc_serv_name_autocomplete)
     @app_commands.autocomplete(player=mc_online_players_autocomplete)
     async def op(self, ctx, player: str, permission_level: Literal[1,2,3,4]=4, name: Optional[str]=None):
-        if not self.has_permission("system", ctx.author):
+        if not await self.has_permission("system", ctx, name):
             await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
             return
         server = await self.resolve_server(ctx, name)
@@ -1115,7 +2361,7 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
     @app_commands.autocomplete(name=mc_serv_name_autocomplete)
     @app_commands.autocomplete(player=mc_online_players_autocomplete)
     async def deop(self, ctx, player: str, name: Optional[str]=None):
-        if not self.has_permission("system", ctx.author):
+        if not await self.has_permission("system", ctx, name):
             await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
             return
         server = await self.resolve_server(ctx, name)
@@ -1131,7 +2377,7 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
     @app_commands.autocomplete(name=mc_serv_name_autocomplete)
     @app_commands.describe(name="Server name (optional, defaults to this channel)")
     async def gamerules(self, ctx: discord.Interaction, name: Optional[str] = None):
-        if not self.has_permission("server_status", ctx.author):
+        if not await self.has_permission("server_status", ctx, name):
             await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
             return
         # Récupérer la config du serveur
@@ -1140,17 +2386,19 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
             return
         ip, port, name = server
         resp = await self.send_rpc_request(ip, port, "minecraft:gamerules")
-        gamerules = resp.get("result", [])
+        if "result" not in resp:
+            await ctx.send(f"⚠️ Could not read the gamerules of `{name}`.")
+            return
+        gamerules = resp["result"]
 
         if not gamerules:
             return await ctx.send("⚠️ Aucune gamerule trouvée.", ephemeral=True)
 
-        # Embed
-        embed = discord.Embed(title=f"🎮 Gamerules for `{name or 'this server'}`", color=0x9B59B6)
-        embed.description = "\n".join(f"`{r['key']}` = `{r['value']}`" for r in gamerules)
-        embed.set_footer(text=f"{len(gamerules)} gamerules total")
-
-        await ctx.send(embed=embed)
+        rules = [(r['key'], r['value']) for r in gamerules]
+        pages = ListPages(
+            f"🎮 Gamerules for {name or 'this server'}", rules, lambda rule: f"`{rule[0]}` = `{rule[1]}`", color=0x9B59B6
+        )
+        await self.send_list(ctx, pages, ["key", "value"], list, f"{name}-gamerules.csv")
 
 
     #To keep
@@ -1248,7 +2496,7 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
         value: str = "",
         name: Optional[str] = None
     ):
-        if not self.has_permission("server_properties", ctx.author):
+        if not await self.has_permission("server_properties", ctx, name):
             await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
             return
         embed = discord.Embed(title="Set Gamerule", color=0x57F287)
@@ -1290,7 +2538,7 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
     @mc.command(name="status_full", description="Show complete server status and info")
     @app_commands.autocomplete(name=mc_serv_name_autocomplete)
     async def status_full(self, ctx: commands.Context, name: Optional[str] = None):
-        if not self.has_permission("server_status", ctx.author):
+        if not await self.has_permission("server_status", ctx, name):
             await ctx.send("❌ You don’t have permission to use this command.", ephemeral=True)
             return
         server = await self.resolve_server(ctx, name)
@@ -1298,51 +2546,35 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
             return
         ip, port, name = server
 
-        tasks = [
-            self.send_rpc_request(ip, port, "minecraft:server/status"),
-            self.send_rpc_request(ip, port, "minecraft:players"),
-            self.send_rpc_request(ip, port, "minecraft:bans"),
-            self.send_rpc_request(ip, port, "minecraft:ip_bans"),
-            self.send_rpc_request(ip, port, "minecraft:operators"),
-            self.send_rpc_request(ip, port, "minecraft:serversettings/motd"),
-            self.send_rpc_request(ip, port, "minecraft:serversettings/difficulty"),
-            self.send_rpc_request(ip, port, "minecraft:serversettings/game_mode"),
-            self.send_rpc_request(ip, port, "minecraft:serversettings/max_players"),
-            self.send_rpc_request(ip, port, "minecraft:serversettings/autosave"),
-            self.send_rpc_request(ip, port, "minecraft:serversettings/use_allowlist"),
-            self.send_rpc_request(ip, port, "minecraft:serversettings/enforce_allowlist"),
-            self.send_rpc_request(ip, port, "minecraft:allowlist"),
-            self.send_rpc_request(ip, port, "minecraft:serversettings/allow_flight"),
-            self.send_rpc_request(ip, port, "minecraft:serversettings/force_game_mode"),
-            self.send_rpc_request(ip, port, "minecraft:serversettings/view_distance"),
-            self.send_rpc_request(ip, port, "minecraft:serversettings/simulation_distance"),
-            self.send_rpc_request(ip, port, "minecraft:serversettings/spawn_protection_radius"),
-            self.send_rpc_request(ip, port, "minecraft:serversettings/player_idle_timeout"),
-            self.send_rpc_request(ip, port, "minecraft:serversettings/pause_when_empty_seconds"),
-            self.send_rpc_request(ip, port, "minecraft:serversettings/entity_broadcast_range"),
-            self.send_rpc_request(ip, port, "minecraft:serversettings/operator_user_permission_level"),
-            self.send_rpc_request(ip, port, "minecraft:serversettings/hide_online_players"),
-            self.send_rpc_request(ip, port, "minecraft:serversettings/accept_transfers"),
-            self.send_rpc_request(ip, port, "minecraft:serversettings/status_replies"),
-        ]
-
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        snapshot, embed = await self.render_status_full(ip, port, name)
+        view = StatusFullView(self, ip, port, name, ctx.author.id) if snapshot is not None else None
+        message = await ctx.send(embed=embed, view=view)
+        if view is not None:
+            view.message = message
+
+    async def render_status_full(self, ip: str, port: int, name: str, force: bool = False):
+        """Les listes sont lues en direct (un seul batch), les réglages viennent de l'instantané"""
+        snapshot, dynamic = await asyncio.gather(
+            self.settings_snapshot(ip, port, force=force),
+            self.send_rpc_batch(ip, port, [
+                ("minecraft:server/status", []),
+                ("minecraft:players", []),
+                ("minecraft:bans", []),
+                ("minecraft:ip_bans", []),
+                ("minecraft:operators", []),
+                ("minecraft:allowlist", []),
+            ])
+        )
+        return snapshot, self.build_status_full_embed(name, dynamic, snapshot)
 
-        (status_resp, players_resp, bans_resp, ip_bans_resp, ops_resp,
-         motd_resp, difficulty_resp, gamemode_resp, maxplayers_resp, autosave_resp,
-         use_allowlist_resp, enforce_allowlist_resp, allowlist_resp, allow_flight_resp,
-         force_gamemode_resp, view_distance_resp, sim_distance_resp, spawn_protection_resp,
-         idle_timeout_resp, pause_empty_resp, entity_broadcast_resp, op_perm_resp,
-         hide_players_resp, accept_transfers_resp, status_replies_resp) = results
+    def build_status_full_embed(self, name: str, dynamic: list, snapshot) -> discord.Embed:
+        status_resp, players_resp, bans_resp, ip_bans_resp, ops_resp, allowlist_resp = dynamic
+        settings = snapshot.values if snapshot is not None else {}
 
-        embed = discord.Embed(
-            title=f"🖥️ Server Status: {name or 'this server'}",
-            color=discord.Color.blurple(),
-            timestamp=datetime.utcnow()
-        )
+        embed = self.embed_templates.get(name or "this server", "status_full").build()
 
         # Server online / version
-        if isinstance(status_resp, dict) and "result" in status_resp:
+        if "result" in status_resp:
             online = status_resp["result"].get("started", False)
             version = status_resp["result"].get("version", {})
             embed.add_field(
@@ -1355,7 +2587,7 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
             embed.add_field(name="Status", value="❓ Unknown", inline=False)
 
         # --- Joueurs ---
-        if isinstance(players_resp, dict) and "result" in players_resp:
+        if "result" in players_resp:
             players = players_resp["result"]
             if players:
                 embed.add_field(name=f"👥 Players Online ({len(players)})",
@@ -1372,51 +2604,88 @@ class MinecraftManager(commands.Cog, name="minecraft_v4"):
         embed.add_field(name="🚫 Banlist",
                         value=f"{len(bans_resp.get('result', []))} players | {len(ip_bans_resp.get('result', []))} IPs",
                         inline=True)
-        if use_allowlist_resp and "result" in use_allowlist_resp:
-            allowlist_enabled = use_allowlist_resp["result"]
-            enforced = enforce_allowlist_resp.get("result", False)
+        if "use_allowlist" in settings:
             embed.add_field(name="📜 Whitelist",
-                            value=("✅ Enabled" if allowlist_enabled else "❌ Disabled") +
-                                  (", Enforced" if enforced else ""),
+                            value=("✅ Enabled" if settings["use_allowlist"] else "❌ Disabled") +
+                                  (", Enforced" if settings.get("enforce_allowlist", False) else ""),
                             inline=True)
-        if allowlist_resp and "result" in allowlist_resp:
+        if "result" in allowlist_resp:
             wl = [p.get("name", "?") for p in allowlist_resp["result"]]
             embed.add_field(name="Whitelisted Players",
-                            value=", ".join(wl[:15]) + (f"...+{len(wl)-15}" if len(wl) > 15 else "") or "None",
+                            value=", ".join(wl[:15]) + (f"...+{len(wl)-15} (`/mc allowlist`)" if len(wl) > 15 else "") or "None",
                             inline=False)
 
         # --- Paramètres serveur ---
-        embed.add_field(name="⚙️ Difficulty", value=difficulty_resp.get("result", "Unknown"), inline=True)
-        embed.add_field(name="🎮 Game Mode", value=gamemode_resp.get("result", "Unknown"), inline=True)
-        embed.add_field(name="👤 Max Players", value=str(maxplayers_resp.get("result", "?")), inline=True)
-        embed.add_field(name="💾 Autosave", value="✅" if autosave_resp.get("result", False) else "❌", inline=True)
-        embed.add_field(name="✈️ Flight Allowed", value="✅" if allow_flight_resp.get("result", False) else "❌", inline=True)
-        embed.add_field(name="🎯 Force GameMode", value="✅" if force_gamemode_resp.get("result", False) else "❌", inline=True)
+        embed.add_field(name="⚙️ Difficulty", value=settings.get("difficulty", "Unknown"), inline=True)
+        embed.add_field(name="🎮 Game Mode", value=settings.get("game_mode", "Unknown"), inline=True)
+        embed.add_field(name="👤 Max Players", value=str(settings.get("max_players", "?")), inline=True)
+        embed.add_field(name="💾 Autosave", value="✅" if settings.get("autosave", False) else "❌", inline=True)
+        embed.add_field(name="✈️ Flight Allowed", value="✅" if settings.get("allow_flight", False) else "❌", inline=True)
+        embed.add_field(name="🎯 Force GameMode", value="✅" if settings.get("force_game_mode", False) else "❌", inline=True)
 
         # --- Distances & protections ---
-        embed.add_field(name="🔭 View Distance", value=str(view_distance_resp.get("result", "?")), inline=True)
-        embed.add_field(name="🧮 Simulation Distance", value=str(sim_distance_resp.get("result", "?")), inline=True)
-        embed.add_field(name="🛡️ Spawn Protection", value=str(spawn_protection_resp.get("result", "?")) + " blocks", inline=True)
-        embed.add_field(name="📡 Entity Broadcast", value=str(entity_broadcast_resp.get("result", "?")) + "%", inline=True)
+        embed.add_field(name="🔭 View Distance", value=str(settings.get("view_distance", "?")), inline=True)
+        embed.add_field(name="🧮 Simulation Distance", value=str(settings.get("simulation_distance", "?")), inline=True)
+        embed.add_field(name="🛡️ Spawn Protection", value=str(settings.get("spawn_protection_radius", "?")) + " blocks", inline=True)
+        embed.add_field(name="📡 Entity Broadcast", value=str(settings.get("entity_broadcast_range", "?")) + "%", inline=True)
 
         # --- Timeouts ---
-        embed.add_field(name="⌛ Idle Timeout", value=f"{idle_timeout_resp.get('result','?')}s", inline=True)
-        embed.add_field(name="⏸️ Pause When Empty", value=f"{pause_empty_resp.get('result','?')}s", inline=True)
+        embed.add_field(name="⌛ Idle Timeout", value=f"{settings.get('player_idle_timeout','?')}s", inline=True)
+        embed.add_field(name="⏸️ Pause When Empty", value=f"{settings.get('pause_when_empty_seconds','?')}s", inline=True)
 
         # --- Réseau ---
-        embed.add_field(name="🌐 Hide Players", value="✅" if hide_players_resp.get("result", False) else "❌", inline=True)
-        embed.add_field(name="🔄 Accept Transfers", value="✅" if accept_transfers_resp.get("result", False) else "❌", inline=True)
-        embed.add_field(name="📶 Status Replies", value="✅" if status_replies_resp.get("result", False) else "❌", inline=True)
+        embed.add_field(name="🌐 Hide Players", value="✅" if settings.get("hide_online_players", False) else "❌", inline=True)
+        embed.add_field(name="🔄 Accept Transfers", value="✅" if settings.get("accept_transfers", False) else "❌", inline=True)
+        embed.add_field(name="📶 Status Replies", value="✅" if settings.get("status_replies", False) else "❌", inline=True)
 
         # --- Permissions ---
-        embed.add_field(name="🔑 Operator Permission Level", value=str(op_perm_resp.get("result", "?")), inline=True)
+        embed.add_field(name="🔑 Operator Permission Level", value=str(settings.get("operator_user_permission_level", "?")), inline=True)
 
         # MOTD
-        if motd_resp and "result" in motd_resp:
-            motd = motd_resp["result"]
-            embed.add_field(name="📝 MOTD", value=str(motd), inline=False)
+        if "motd" in settings:
+            embed.add_field(name="📝 MOTD", value=str(settings["motd"]), inline=False)
+
+        if snapshot is None:
+            embed.set_footer(text="Settings unavailable")
+        else:
+            embed.set_footer(text=f"Settings snapshot: {int(snapshot.age)}s old")
+        return embed
+
+
+class StatusFullView(discord.ui.View):
+    """Bouton pour relire l'instantané des réglages de /mc status_full"""
+
+    def __init__(self, cog: MinecraftManager, ip: str, port: int, name: str, author_id: int) -> None:
+        super().__init__(timeout=300)
+        self.cog = cog
+        self.ip = ip
+        self.port = port
+        self.name = name
+        self.author_id = author_id
+        self.message = None
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message("❌ These buttons are not for you.", ephemeral=True)
+            return False
+        return True
+
+    @discord.ui.button(label="Refresh", emoji="🔄", style=discord.ButtonStyle.secondary)
+    async def refresh(self, interaction: discord.Interaction, _button: discord.ui.Button) -> None:
+        await interaction.response.defer()
+        _, embed = await self.cog.render_status_full(self.ip, self.port, self.name, force=True)
+        await interaction.edit_original_response(embed=embed, view=self)
+
+    async def on_timeout(self) -> None:
+        if self.message is None:
+            return
+        for item in self.children:
+            item.disabled = True
+        try:
+            await self.message.edit(view=self)
+        except discord.HTTPException:
+            pass
 
-        await ctx.send(embed=embed)
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(MinecraftManager(bot))
@@ -12,6 +12,9 @@ from discord.ext import commands
 from discord.ext.commands import Context
 import os
 
+from helpers.command_sync import scope_key, sync_if_changed
+from helpers.manifest import find_conflict
+
 
 class Owner(commands.Cog, name="owner"):
     def __init__(self, bot) -> None:
@@ -33,36 +36,50 @@ class Owner(commands.Cog, name="owner"):
         name="sync",
         description="Synchonizes the slash commands.",
     )
-    @app_commands.describe(scope="The scope of the sync. Can be `global` or `guild`")
+    @app_commands.describe(
+        scope="The scope of the sync. Can be `global` or `guild`",
+        force="Sync even if the commands did not change since the last sync",
+    )
     @commands.is_owner()
-    async def sync(self, context: Context, scope: str) -> None:
+    async def sync(self, context: Context, scope: str, force: bool = False) -> None:
         """
-        Synchonizes the slash commands.
+        Synchonizes the slash commands, only when they changed since the last sync.
 
         :param context: The command context.
         :param scope: The scope of the sync. Can be `global` or `guild`.
+        :param force: Sync even if the commands did not change since the last sync.
         """
 
         if scope == "global":
-            await context.bot.tree.sync()
+            guild = None
+            scope_text = "globally"
+        elif scope == "guild":
+            context.bot.tree.copy_global_to(guild=context.guild)
+            guild = context.guild
+            scope_text = "in this guild"
+        else:
             embed = discord.Embed(
-                description="Slash commands have been globally synchronized.",
-                color=0xBEBEFE,
+                description="The scope must be `global` or `guild`.", color=0xE02B2B
             )
             await context.send(embed=embed)
             return
-        elif scope == "guild":
-            context.bot.tree.copy_global_to(guild=context.guild)
-            await context.bot.tree.sync(guild=context.guild)
+
+        synced, diff = await sync_if_changed(context.bot, guild=guild, force=force)
+        if not synced:
             embed = discord.Embed(
-                description="Slash commands have been synchronized in this guild.",
+                description=f"Slash commands are already synchronized {scope_text}, nothing changed since the last sync.",
                 color=0xBEBEFE,
             )
             await context.send(embed=embed)
             return
         embed = discord.Embed(
-            description="The scope must be `global` or `guild`.", color=0xE02B2B
+            description=f"Slash commands have been synchronized {scope_text}.",
+            color=0xBEBEFE,
         )
+        for kind, commands_list in diff.items():
+            if commands_list:
+                names = ", ".join(key.split(":", 1)[1] for key in commands_list)
+                embed.add_field(name=kind.capitalize(), value=names[:1024], inline=False)
         await context.send(embed=embed)
 
     @commands.command(
@@ -84,6 +101,7 @@ class Owner(commands.Cog, name="owner"):
         if scope == "global":
             context.bot.tree.clear_commands(guild=None)
             await context.bot.tree.sync()
+            await context.bot.database.clear_command_sync(scope_key(None))
             embed = discord.Embed(
                 description="Slash commands have been globally unsynchronized.",
                 color=0xBEBEFE,
@@ -93,6 +111,7 @@ class Owner(commands.Cog, name="owner"):
         elif scope == "guild":
             context.bot.tree.clear_commands(guild=context.guild)
             await context.bot.tree.sync(guild=context.guild)
+            await context.bot.database.clear_command_sync(scope_key(context.guild))
             embed = discord.Embed(
                 description="Slash commands have been unsynchronized in this guild.",
                 color=0xBEBEFE,
@@ -132,6 +151,14 @@ class Owner(commands.Cog, name="owner"):
             await context.send(f"Cog '{cog}' not found.")
         """
 
+        loaded = [extension.split(".", 1)[1] for extension in self.bot.extensions]
+        conflict = find_conflict(cog, loaded)
+        if conflict is not None:
+            embed = discord.Embed(
+                description=f"Could not load the `{cog}` cog, `{conflict.identity}` is already loaded in the `{conflict.group}` group. Unload it first.", color=0xE02B2B
+            )
+            await context.send(embed=embed,ephemeral=True)
+            return
         try:
             await self.bot.load_extension(f"cogs.{cog}")
         except Exception:
@@ -202,6 +229,35 @@ class Owner(commands.Cog, name="owner"):
         await context.send(embed=embed,ephemeral=True)
 
 
+    @commands.hybrid_command(
+        name="httpstats",
+        description="Show latency and connection reuse of the shared HTTP session.",
+    )
+    @commands.is_owner()
+    async def httpstats(self, context: Context) -> None:
+        """
+        Shows per-host latency and connection reuse statistics of the shared HTTP session.
+
+        :param context: The hybrid command context.
+        """
+        hosts = self.bot.http_stats.hosts
+        if not hosts:
+            embed = discord.Embed(
+                description="No HTTP request has been made yet.", color=0xBEBEFE
+            )
+            await context.send(embed=embed)
+            return
+        embed = discord.Embed(title="HTTP statistics", color=0xBEBEFE)
+        for host, stats in sorted(hosts.items(), key=lambda item: -item[1].requests)[:25]:
+            embed.add_field(
+                name=host,
+                value=f"Requests: {stats.requests} ({stats.errors} errors)\n"
+                f"Latency: {stats.average_latency * 1000:.0f}ms avg, {stats.max_latency * 1000:.0f}ms max\n"
+                f"Connections: {stats.connections_created} opened, {stats.connections_reused} reused ({stats.reuse_ratio:.0%})",
+                inline=False,
+            )
+        await context.send(embed=embed)
+
     @commands.hybrid_command(
         name="shutdown",
         description="Make the bot shutdown.",
@@ -1,5 +1,24 @@
+import time
+
 import aiosqlite
 
+# Columns added after a table was first created: CREATE TABLE IF NOT EXISTS in schema.sql
+# doesn't touch existing databases, so they are added here when missing.
+MIGRATIONS = [
+    ("minecraft_servers", "notifications", "INTEGER"),
+    ("minecraft_servers", "tags", "TEXT NOT NULL DEFAULT ''"),
+]
+
+
+async def apply_migrations(connection: aiosqlite.Connection) -> None:
+    for table, column, definition in MIGRATIONS:
+        async with connection.execute(f"PRAGMA table_info({table})") as cursor:
+            columns = {row[1] for row in await cursor.fetchall()}
+        if column not in columns:
+            await connection.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    await connection.commit()
+
+
 class DatabaseManager:
     def __init__(self, *, connection: aiosqlite.Connection) -> None:
         self.connection = connection
@@ -46,6 +65,14 @@ class DatabaseManager:
         ) as cursor:
             return await cursor.fetchall()
 
+    async def get_guild_mc_servers(self, server_id: int):
+        """Retourne [(mc_server_name, mc_IP, mc_port, tags), ...] pour un serveur Discord, tags séparés par des virgules"""
+        async with self.connection.execute(
+            "SELECT mc_server_name, mc_IP, mc_port, tags FROM minecraft_servers WHERE server_id = ? ORDER BY mc_server_name",
+            (server_id,)
+        ) as cursor:
+            return await cursor.fetchall()
+
     async def get_mc_server_info(self, mc_server_name: str = None, channel_id: int = None):
         if mc_server_name is not None:
             query = "SELECT server_id, channel_id, mc_IP, mc_port FROM minecraft_servers WHERE mc_server_name = ?"
@@ -59,6 +86,14 @@ class DatabaseManager:
         async with self.connection.execute(query, params) as cursor:
             return await cursor.fetchone()
 
+    async def get_mc_server_name(self, channel_id: int):
+        """Retourne le nom du serveur Minecraft lié à un salon, None sinon"""
+        async with self.connection.execute(
+            "SELECT mc_server_name FROM minecraft_servers WHERE channel_id = ?",
+            (channel_id,)
+        ) as cursor:
+            row = await cursor.fetchone()
+            return row[0] if row else None
 
     async def remove_minecraft_server(self, server_id: int, mc_server_name: str) -> bool:
         """Supprime un serveur Minecraft d’un serveur Discord"""
@@ -100,6 +135,113 @@ class DatabaseManager:
             await self.connection.commit()
             return cursor.rowcount > 0
 
+    async def get_cached_mojang_name(self, name: str):
+        """Retourne (uuid, fetched_at) pour un pseudo, uuid = None si le pseudo est libre"""
+        async with self.connection.execute(
+            "SELECT uuid, fetched_at FROM mojang_names WHERE name = ?",
+            (name.lower(),)
+        ) as cursor:
+            return await cursor.fetchone()
+
+    async def cache_mojang_name(self, name: str, uuid: str = None) -> None:
+        await self.connection.execute(
+            "INSERT OR REPLACE INTO mojang_names (name, uuid, fetched_at) VALUES (?, ?, ?)",
+            (name.lower(), uuid, time.time())
+        )
+        await self.connection.commit()
+
+    async def get_cached_mojang_profile(self, uuid: str):
+        """Retourne (profile_json, fetched_at) pour un UUID"""
+        async with self.connection.execute(
+            "SELECT profile, fetched_at FROM mojang_profiles WHERE uuid = ?",
+            (uuid,)
+        ) as cursor:
+            return await cursor.fetchone()
+
+    async def cache_mojang_profile(self, uuid: str, name: str, profile: str) -> None:
+        await self.connection.execute(
+            "INSERT OR REPLACE INTO mojang_profiles (uuid, name, profile, fetched_at) VALUES (?, ?, ?, ?)",
+            (uuid, name, profile, time.time())
+        )
+        await self.connection.commit()
+
+    async def get_command_sync(self, scope: str):
+        """Retourne (tree_hash, command_hashes) du dernier sync de ce scope"""
+        async with self.connection.execute(
+            "SELECT tree_hash, command_hashes FROM command_sync WHERE scope = ?",
+            (scope,)
+        ) as cursor:
+            return await cursor.fetchone()
+
+    async def set_command_sync(self, scope: str, tree_hash: str, command_hashes: str) -> None:
+        await self.connection.execute(
+            "INSERT OR REPLACE INTO command_sync (scope, tree_hash, command_hashes) VALUES (?, ?, ?)",
+            (scope, tree_hash, command_hashes)
+        )
+        await self.connection.commit()
+
+    async def clear_command_sync(self, scope: str) -> None:
+        await self.connection.execute("DELETE FROM command_sync WHERE scope = ?", (scope,))
+        await self.connection.commit()
+
+    async def set_mc_server_tags(self, server_id: int, mc_server_name: str, tags: list[str]) -> bool:
+        """Remplace les tags d'un serveur Minecraft"""
+        async with self.connection.execute(
+            "UPDATE minecraft_servers SET tags = ? WHERE server_id = ? AND mc_server_name = ?",
+            (",".join(tags), server_id, mc_server_name)
+        ) as cursor:
+            await self.connection.commit()
+            return cursor.rowcount > 0
+
+    async def get_settings_profile(self, server_id: int, name: str):
+        """Retourne le JSON des réglages d'un profil, None s'il n'existe pas"""
+        async with self.connection.execute(
+            "SELECT settings FROM settings_profiles WHERE server_id = ? AND name = ?",
+            (server_id, name)
+        ) as cursor:
+            row = await cursor.fetchone()
+            return row[0] if row else None
+
+    async def get_settings_profiles(self, server_id: int):
+        """Retourne [(name, settings_json), ...] pour un serveur Discord"""
+        async with self.connection.execute(
+            "SELECT name, settings FROM settings_profiles WHERE server_id = ? ORDER BY name",
+            (server_id,)
+        ) as cursor:
+            return await cursor.fetchall()
+
+    async def save_settings_profile(self, server_id: int, name: str, settings: str) -> None:
+        await self.connection.execute(
+            "INSERT INTO settings_profiles(server_id, name, settings) VALUES (?, ?, ?) "
+            "ON CONFLICT(server_id, name) DO UPDATE SET settings = excluded.settings, updated_at = CURRENT_TIMESTAMP",
+            (server_id, name, settings)
+        )
+        await self.connection.commit()
+
+    async def delete_settings_profile(self, server_id: int, name: str) -> bool:
+        async with self.connection.execute(
+            "DELETE FROM settings_profiles WHERE server_id = ? AND name = ?",
+            (server_id, name)
+        ) as cursor:
+            await self.connection.commit()
+            return cursor.rowcount > 0
+
+    async def get_notification_masks(self):
+        """Retourne [(server_id, mc_server_name, notifications), ...] pour les serveurs ayant leur propre masque"""
+        async with self.connection.execute(
+            "SELECT server_id, mc_server_name, notifications FROM minecraft_servers WHERE notifications IS NOT NULL"
+        ) as cursor:
+            return await cursor.fetchall()
+
+    async def set_notification_mask(self, server_id: int, mc_server_name: str, notifications: int = None) -> bool:
+        """Change le masque de notifications d'un serveur, None = suivre config.json"""
+        async with self.connection.execute(
+            "UPDATE minecraft_servers SET notifications = ? WHERE server_id = ? AND mc_server_name = ?",
+            (notifications, server_id, mc_server_name)
+        ) as cursor:
+            await self.connection.commit()
+            return cursor.rowcount > 0
+
 #####################################
 
     async def add_warn(
@@ -14,6 +14,37 @@ CREATE TABLE IF NOT EXISTS minecraft_servers (
     mc_server_name TEXT NOT NULL,
     mc_IP TEXT NOT NULL,
     mc_port INTEGER NOT NULL,
+    notifications INTEGER,
+    tags TEXT NOT NULL DEFAULT '',
     created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     UNIQUE(mc_server_name, channel_id)
 );
+
+CREATE TABLE IF NOT EXISTS mojang_names (
+    name TEXT PRIMARY KEY,
+    uuid TEXT,
+    fetched_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS mojang_profiles (
+    uuid TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    profile TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS command_sync (
+    scope TEXT PRIMARY KEY,
+    tree_hash TEXT NOT NULL,
+    command_hashes TEXT NOT NULL,
+    synced_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS settings_profiles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    server_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    settings TEXT NOT NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(server_id, name)
+);
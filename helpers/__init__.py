@@ -0,0 +1,5 @@
+"""
+Shared helpers used by the bot and its cogs.
+
+Modules that live here are not extensions, they are never loaded by `load_cogs`.
+"""
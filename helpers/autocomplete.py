@@ -0,0 +1,134 @@
+"""
+Autocomplete with a latency budget.
+
+Discord drops autocomplete answers that come too late, so handlers never wait on a slow Minecraft
+server for longer than `budget`. Their data is cached per key (stale-while-revalidate): a cached
+value is answered right away, even when it is stale, and a refresh runs in the background. A cold
+key is fetched once, keystrokes arriving meanwhile wait on the same fetch, and when the budget runs
+out an empty answer is sent while the fetch goes on to fill the cache for the next keystroke.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Hashable, Optional
+
+
+@dataclass
+class HandlerStats:
+    calls: int = 0
+    hits: int = 0
+    stale: int = 0
+    timeouts: int = 0
+    # Latest latencies (seconds), enough for stable percentiles
+    samples: deque = field(default_factory=lambda: deque(maxlen=512))
+
+    def record(self, seconds: float) -> None:
+        self.calls += 1
+        self.samples.append(seconds)
+
+    def percentile(self, fraction: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    @property
+    def p50(self) -> float:
+        return self.percentile(0.5)
+
+    @property
+    def p99(self) -> float:
+        return self.percentile(0.99)
+
+
+@dataclass
+class CacheEntry:
+    value: object
+    fetched_at: float
+
+
+class AutocompleteCache:
+    def __init__(self, budget: float = 1.5, ttl: float = 15, debounce: float = 1.0, logger=None) -> None:
+        """
+        :param budget: The longest time (seconds) a handler waits for a cold fetch.
+        :param ttl: After how long (seconds) a cached value is refreshed in the background.
+        :param debounce: A user typing faster than this (seconds) does not trigger background refreshes.
+        """
+        self.budget = budget
+        self.ttl = ttl
+        self.debounce = debounce
+        self.logger = logger or logging.getLogger("discord_bot")
+        self.entries: dict[Hashable, CacheEntry] = {}
+        self.refreshing: dict[Hashable, asyncio.Task] = {}
+        self.stats: dict[str, HandlerStats] = {}
+        self._last_seen: dict[tuple[str, int], float] = {}
+
+    def _refresh(self, key: Hashable, fetch: Callable[[], Awaitable]) -> asyncio.Task:
+        task = self.refreshing.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(key, fetch))
+            self.refreshing[key] = task
+        return task
+
+    async def _fetch(self, key: Hashable, fetch: Callable[[], Awaitable]):
+        try:
+            value = await fetch()
+            if value is not None:
+                self.entries[key] = CacheEntry(value, time.monotonic())
+            return value
+        except Exception as e:
+            # Keep serving the previous value
+            self.logger.debug(f"Autocomplete refresh of {key} failed: {e}")
+            return None
+        finally:
+            self.refreshing.pop(key, None)
+
+    async def get(
+        self, handler: str, user_id: int, key: Hashable, fetch: Callable[[], Awaitable]
+    ) -> Optional[object]:
+        """
+        Returns the value of `key`, `None` when it could not be fetched within the budget.
+
+        :param handler: The autocomplete handler name, for the latency statistics.
+        :param user_id: The Discord user typing, for the debounce.
+        :param key: What is fetched, e.g. `("bans", ip, port)`.
+        :param fetch: Fetches the value, a `None` result is not cached.
+        """
+        start = time.monotonic()
+        stats = self.stats.setdefault(handler, HandlerStats())
+        last_seen = self._last_seen.get((handler, user_id))
+        if len(self._last_seen) > 1000:
+            self._last_seen = {
+                seen_key: seen for seen_key, seen in self._last_seen.items() if start - seen < self.debounce
+            }
+        self._last_seen[(handler, user_id)] = start
+        bursting = last_seen is not None and start - last_seen < self.debounce
+        try:
+            entry = self.entries.get(key)
+            if entry is not None:
+                stats.hits += 1
+                if start - entry.fetched_at > self.ttl:
+                    stats.stale += 1
+                    if not bursting:
+                        self._refresh(key, fetch)
+                return entry.value
+            try:
+                return await asyncio.wait_for(asyncio.shield(self._refresh(key, fetch)), self.budget)
+            except asyncio.TimeoutError:
+                stats.timeouts += 1
+                return None
+        finally:
+            stats.record(time.monotonic() - start)
+
+    def expire(self, key: Hashable) -> None:
+        """Marks a value as stale: it is still answered once, and refreshed in the background."""
+        if key in self.entries:
+            self.entries[key].fetched_at = float("-inf")
+
+    def close(self) -> None:
+        for task in self.refreshing.values():
+            task.cancel()
+        self.refreshing.clear()
@@ -0,0 +1,139 @@
+"""
+JSON codec of the MSMP frames.
+
+`orjson` is used when it is installed, the standard `json` module otherwise. `peek` reads a few
+top-level keys of a frame without decoding the rest, so the listeners can drop notifications they
+don't need before paying for a full parse. Run `python -m helpers.codec [frames.jsonl]` to compare
+the backends on sample frames, or on recorded frames (one per line).
+"""
+
+import json
+import re
+import sys
+import timeit
+from dataclasses import dataclass
+from json.decoder import scanstring
+from typing import Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# MSMP writes `jsonrpc` then `method` first: anchored at the start, so it can only match top-level keys
+_LEADING_METHOD = re.compile(r'\s*\{\s*(?:"jsonrpc"\s*:\s*"2\.0"\s*,\s*)?"method"\s*:\s*"([^"\\]*)"')
+_decoder = json.JSONDecoder()
+
+
+@dataclass(frozen=True)
+class Codec:
+    name: str
+    # Always returns text: websockets sends `str` as a text frame, which MSMP expects
+    dumps: Callable[[object], str]
+    loads: Callable[[Union[str, bytes]], object]
+
+
+STDLIB = Codec("json", json.dumps, json.loads)
+ORJSON = Codec("orjson", lambda obj: orjson.dumps(obj).decode(), orjson.loads) if orjson is not None else None
+CODECS = {codec.name: codec for codec in (STDLIB, ORJSON) if codec is not None}
+
+
+def get_codec(name: Optional[str] = None) -> Codec:
+    """
+    :param name: `json` or `orjson`, the fastest installed one when `None`.
+    :raises KeyError: When the requested backend is not installed.
+    """
+    if name is None:
+        return ORJSON or STDLIB
+    return CODECS[name]
+
+
+codec = get_codec()
+dumps = codec.dumps
+loads = codec.loads
+
+
+def peek(raw: Union[str, bytes], *keys: str) -> dict:
+    """
+    Decodes only some top-level keys of a JSON object.
+
+    The object is read key by key and reading stops as soon as every requested key was found, so
+    `method` is peeked without decoding the `params` that follow it. A missing key means the whole
+    object is walked, which costs about a full parse.
+
+    :raises ValueError: When the frame is not a JSON object.
+    """
+    is_bytes = isinstance(raw, (bytes, bytearray))
+    if keys == ("method",):
+        # Only the beginning of a frame received as bytes is decoded for the fast path
+        match = _LEADING_METHOD.match(raw[:256].decode(errors="ignore") if is_bytes else raw)
+        if match is not None:
+            return {"method": match.group(1)}
+    text = raw.decode() if is_bytes else raw
+    found = {}
+    position = _WHITESPACE.match(text, 0).end()
+    if text[position:position + 1] != "{":
+        raise ValueError("expected a JSON object")
+    position += 1
+    while len(found) < len(keys):
+        position = _WHITESPACE.match(text, position).end()
+        if text[position:position + 1] != '"':
+            break  # `}`, or a broken frame left to the full parse
+        key, position = scanstring(text, position + 1)
+        position = _WHITESPACE.match(text, position).end()
+        if text[position:position + 1] != ":":
+            raise ValueError("expected `:` after an object key")
+        position = _WHITESPACE.match(text, position + 1).end()
+        value, position = _decoder.raw_decode(text, position)
+        if key in keys:
+            found[key] = value
+        position = _WHITESPACE.match(text, position).end()
+        if text[position:position + 1] == ",":
+            position += 1
+    return found
+
+
+def sample_frames() -> dict[str, str]:
+    """Frames shaped like MSMP's: a big ban list, the gamerules, a full heartbeat and a small notification."""
+    bans = [
+        {
+            "player": {"id": f"00000000-0000-0000-0000-{index:012d}", "name": f"player_{index}"},
+            "reason": "Griefing", "source": "Server", "created": "2025-01-01 00:00:00 +0000"
+        }
+        for index in range(5000)
+    ]
+    gamerules = [{"key": f"rule{index}", "value": str(index % 2 == 0).lower(), "type": "boolean"} for index in range(60)]
+    players = [{"id": f"00000000-0000-0000-0000-{index:012d}", "name": f"player_{index}"} for index in range(100)]
+    frames = {
+        "bans (5000)": {"jsonrpc": "2.0", "id": 1, "result": bans},
+        "gamerules": {"jsonrpc": "2.0", "id": 1, "result": gamerules},
+        "heartbeat (100 players)": {
+            "jsonrpc": "2.0", "method": "notification:server/status",
+            "params": [{"status": {"started": True, "players": players, "version": {"name": "1.21.9", "protocol": 773}}}]
+        },
+        "player joined": {"jsonrpc": "2.0", "method": "notification:players/joined", "params": [players[0]]},
+    }
+    return {name: json.dumps(frame) for name, frame in frames.items()}
+
+
+def benchmark(frames: dict[str, str], number: int = 200) -> list[tuple[str, str, float]]:
+    """Microseconds per frame for each installed backend, and for `peek(frame, "method")` on notifications."""
+    results = []
+    for name, frame in frames.items():
+        for backend in CODECS.values():
+            results.append((name, f"{backend.name} loads", timeit.timeit(lambda: backend.loads(frame), number=number)))
+        if _LEADING_METHOD.match(frame):  # Responses are never peeked
+            results.append((name, "peek method", timeit.timeit(lambda: peek(frame, "method"), number=number)))
+    return [(name, label, seconds / number * 1e6) for name, label, seconds in results]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], encoding="utf-8") as file:
+            frames = {f"frame {index}": line for index, line in enumerate(file, start=1) if line.strip()}
+    else:
+        frames = sample_frames()
+    print(f"Default codec: {codec.name}")
+    for name, label, micros in benchmark(frames):
+        print(f"{name:<24} {label:<14} {micros:10.1f}µs")
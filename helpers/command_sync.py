@@ -0,0 +1,69 @@
+"""
+Incremental application command sync.
+
+The serialized command tree is hashed per scope (`global` or `guild:<id>`) and compared with the
+hash stored after the last successful sync, so `tree.sync()` is only sent to Discord when a
+command actually changed.
+"""
+
+import hashlib
+import json
+from typing import Optional
+
+import discord
+
+
+def scope_key(guild: Optional[discord.abc.Snowflake]) -> str:
+    return "global" if guild is None else f"guild:{guild.id}"
+
+
+def command_hashes(tree: discord.app_commands.CommandTree, guild=None) -> dict[str, str]:
+    """
+    Hashes every command of a scope separately, keyed by `<type>:<name>`.
+
+    :param tree: The command tree of the bot.
+    :param guild: The guild of the scope, `None` for global commands.
+    """
+    hashes = {}
+    for command in tree.get_commands(guild=guild):
+        payload = command.to_dict(tree)
+        key = f"{payload.get('type', 1)}:{payload['name']}"
+        serialized = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        hashes[key] = hashlib.sha256(serialized.encode()).hexdigest()
+    return hashes
+
+
+def tree_hash(hashes: dict[str, str]) -> str:
+    serialized = json.dumps(hashes, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+def diff_hashes(old: dict[str, str], new: dict[str, str]) -> dict[str, list[str]]:
+    """Returns the command keys that were added, removed or changed between two syncs."""
+    return {
+        "added": sorted(new.keys() - old.keys()),
+        "removed": sorted(old.keys() - new.keys()),
+        "changed": sorted(key for key in new.keys() & old.keys() if new[key] != old[key]),
+    }
+
+
+async def sync_if_changed(bot, guild=None, force: bool = False):
+    """
+    Syncs a scope of the command tree only when it differs from the last synced one.
+
+    :param bot: The bot, its `database` stores the last synced hashes.
+    :param guild: The guild to sync, `None` for global commands.
+    :param force: Sync even when nothing changed.
+    :return: A tuple `(synced, diff)`.
+    """
+    scope = scope_key(guild)
+    hashes = command_hashes(bot.tree, guild=guild)
+    digest = tree_hash(hashes)
+    stored = await bot.database.get_command_sync(scope)
+    old_hashes = json.loads(stored[1]) if stored else {}
+    diff = diff_hashes(old_hashes, hashes)
+    if not force and stored is not None and stored[0] == digest:
+        return False, diff
+    await bot.tree.sync(guild=guild)
+    await bot.database.set_command_sync(scope, digest, json.dumps(hashes))
+    return True, diff
@@ -0,0 +1,264 @@
+"""
+Precompiled `config.json`.
+
+The file is validated and compiled once into an immutable `BotConfig` (frozen set of enabled
+notifications, frozen set of role IDs per command and scope), so the listeners and the permission
+checks only do set lookups. A `ConfigWatcher` polls the file modification time and swaps `bot.config`
+with a freshly compiled object when the file changes.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from dataclasses import dataclass, field, replace
+from functools import cached_property
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+# The position of a notification in this tuple is its bit in the per-server masks stored in
+# SQLite: only ever append to it.
+NOTIFICATIONS = (
+    "players_joined",
+    "players_left",
+    "bans_added",
+    "bans_removed",
+    "allowlist_added",
+    "allowlist_removed",
+    "operators_added",
+    "operators_removed",
+    "server_started",
+    "server_stopping",
+    "server_saving",
+    "server_saved",
+    "server_status",
+    "gamerules_updated",
+)
+NOTIFICATION_KEYS = frozenset(NOTIFICATIONS)
+NOTIFICATION_BITS = {key: 1 << index for index, key in enumerate(NOTIFICATIONS)}
+ALL_NOTIFICATIONS = (1 << len(NOTIFICATIONS)) - 1
+
+
+def notification_mask(keys) -> int:
+    mask = 0
+    for key in keys:
+        mask |= NOTIFICATION_BITS[key]
+    return mask
+
+
+class ConfigError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class CompressionConfig:
+    """permessage-deflate settings of the MSMP WebSockets, the `compression` section of config.json."""
+
+    enabled: bool = True
+    # Largest LZ77 windows (9-15 bits) offered to the server, `None` lets the server choose
+    server_max_window_bits: Optional[int] = None
+    client_max_window_bits: Optional[int] = None
+    # Messages sent smaller than this (bytes) are not compressed
+    min_size: int = 256
+    level: int = 6
+    mem_level: int = 5
+
+
+COMPRESSION_LIMITS = {
+    "server_max_window_bits": (9, 15),
+    "client_max_window_bits": (9, 15),
+    "min_size": (0, 16 * 1024 * 1024),
+    "level": (0, 9),
+    "mem_level": (1, 9),
+}
+
+
+@dataclass(frozen=True)
+class BotConfig:
+    notifications: frozenset = NOTIFICATION_KEYS
+    # (command, guild ID or None, Minecraft server name or None) -> allowed role IDs
+    permissions: Mapping[tuple, frozenset] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+    compression: CompressionConfig = CompressionConfig()
+    mtime: float = 0.0
+
+    @cached_property
+    def notification_mask(self) -> int:
+        """The global notifications as a bitfield, used for servers without their own mask."""
+        return notification_mask(self.notifications)
+
+    def notif_enabled(self, key: str) -> bool:
+        return key in self.notifications
+
+    def allowed_roles(
+        self, command_name: str, guild_id: int = None, server: str = None
+    ) -> frozenset:
+        """
+        Returns the role IDs allowed to use a command, an empty set means everyone.
+
+        The most specific scope wins: Minecraft server, then guild, then global.
+        """
+        permissions = self.permissions
+        if server is not None:
+            roles = permissions.get((command_name, guild_id, server))
+            if roles is None:
+                roles = permissions.get((command_name, None, server))
+            if roles is not None:
+                return roles
+        if guild_id is not None:
+            roles = permissions.get((command_name, guild_id, None))
+            if roles is not None:
+                return roles
+        return permissions.get((command_name, None, None), frozenset())
+
+
+def validate_config(data) -> None:
+    """
+    Checks the structure of `config.json`.
+
+    :param data: The decoded JSON document.
+    :raises ConfigError: When the document does not match the expected schema.
+    """
+    if not isinstance(data, dict):
+        raise ConfigError("the root of config.json must be an object")
+    unknown = data.keys() - {"notifications", "permissions", "guilds", "servers", "compression"}
+    if unknown:
+        raise ConfigError(f"unknown section(s): {', '.join(sorted(unknown))}")
+
+    notifications = data.get("notifications", {})
+    if not isinstance(notifications, dict):
+        raise ConfigError("`notifications` must be an object")
+    for key, value in notifications.items():
+        if key not in NOTIFICATION_KEYS:
+            raise ConfigError(f"unknown notification `{key}`")
+        if not isinstance(value, bool):
+            raise ConfigError(f"notification `{key}` must be true or false")
+
+    _validate_compression(data.get("compression", {}))
+    _validate_permissions(data.get("permissions", {}), "permissions")
+    for section in ("guilds", "servers"):
+        scopes = data.get(section, {})
+        if not isinstance(scopes, dict):
+            raise ConfigError(f"`{section}` must be an object")
+        for scope, scope_config in scopes.items():
+            if section == "guilds" and not scope.isdigit():
+                raise ConfigError(f"`guilds` keys must be guild IDs, got `{scope}`")
+            if not isinstance(scope_config, dict) or scope_config.keys() - {"permissions"}:
+                raise ConfigError(f"`{section}.{scope}` may only contain `permissions`")
+            _validate_permissions(
+                scope_config.get("permissions", {}), f"{section}.{scope}.permissions"
+            )
+
+
+def _validate_compression(compression) -> None:
+    if not isinstance(compression, dict):
+        raise ConfigError("`compression` must be an object")
+    for key, value in compression.items():
+        if key == "enabled":
+            if not isinstance(value, bool):
+                raise ConfigError("`compression.enabled` must be true or false")
+            continue
+        if key not in COMPRESSION_LIMITS:
+            raise ConfigError(f"unknown compression setting `{key}`")
+        low, high = COMPRESSION_LIMITS[key]
+        if not isinstance(value, int) or isinstance(value, bool) or not low <= value <= high:
+            raise ConfigError(f"`compression.{key}` must be a whole number between {low} and {high}")
+
+
+def _validate_permissions(permissions, path: str) -> None:
+    if not isinstance(permissions, dict):
+        raise ConfigError(f"`{path}` must be an object")
+    for command_name, roles in permissions.items():
+        if not isinstance(roles, list) or not all(
+            isinstance(role, int) and not isinstance(role, bool) for role in roles
+        ):
+            raise ConfigError(f"`{path}.{command_name}` must be a list of role IDs")
+
+
+def compile_config(data: dict, mtime: float = 0.0) -> BotConfig:
+    validate_config(data)
+    notifications = data.get("notifications", {})
+    # Notifications missing from the file stay enabled.
+    enabled = frozenset(key for key in NOTIFICATION_KEYS if notifications.get(key, True))
+    permissions = {
+        (command_name, None, None): frozenset(roles)
+        for command_name, roles in data.get("permissions", {}).items()
+    }
+    for guild_id, guild_config in data.get("guilds", {}).items():
+        for command_name, roles in guild_config.get("permissions", {}).items():
+            permissions[(command_name, int(guild_id), None)] = frozenset(roles)
+    for server, server_config in data.get("servers", {}).items():
+        for command_name, roles in server_config.get("permissions", {}).items():
+            permissions[(command_name, None, server)] = frozenset(roles)
+    return BotConfig(
+        notifications=enabled,
+        permissions=MappingProxyType(permissions),
+        compression=CompressionConfig(**data.get("compression", {})),
+        mtime=mtime,
+    )
+
+
+def load_config(path: str) -> BotConfig:
+    """
+    Reads, validates and compiles a config file.
+
+    :param path: The path of `config.json`.
+    """
+    mtime = os.stat(path).st_mtime
+    with open(path, "r", encoding="utf-8") as file:
+        try:
+            data = json.load(file)
+        except json.JSONDecodeError as e:
+            raise ConfigError(f"invalid JSON: {e}") from e
+    return compile_config(data, mtime)
+
+
+class ConfigWatcher:
+    def __init__(self, bot, path: str, interval: float = 2.0) -> None:
+        """
+        :param bot: The bot whose `config` attribute is swapped on change.
+        :param path: The path of `config.json`.
+        :param interval: How often (seconds) the modification time is checked.
+        """
+        self.bot = bot
+        self.path = path
+        self.interval = interval
+        self.logger = getattr(bot, "logger", logging.getLogger("discord_bot"))
+        self._task = None
+
+    def reload(self) -> BotConfig:
+        """
+        Reloads the file right away and swaps `bot.config`.
+
+        :raises ConfigError: When the file is invalid, the current config is then kept.
+        """
+        config = load_config(self.path)
+        self.bot.config = config
+        return config
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                mtime = os.stat(self.path).st_mtime
+            except OSError:
+                continue
+            if mtime == self.bot.config.mtime:
+                continue
+            try:
+                self.reload()
+                self.logger.info(f"Reloaded {os.path.basename(self.path)}")
+            except (OSError, ConfigError) as e:
+                self.logger.error(f"Ignored invalid {os.path.basename(self.path)}: {e}")
+                # Remember the broken version so the error is only logged once.
+                self.bot.config = replace(self.bot.config, mtime=mtime)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._watch())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
@@ -0,0 +1,89 @@
+"""
+permessage-deflate (RFC 7692) for the MSMP WebSockets, with byte metering.
+
+The client offers the extension with the settings of `CompressionConfig`, the server decides
+whether to accept it. When it does, the negotiated extension records the wire size of every
+message, compressed or not, in the order they are sent and received, so callers can pair them with
+the messages they send and `recv`.
+"""
+
+from collections import deque
+from typing import Optional
+
+from websockets.extensions.permessage_deflate import ClientPerMessageDeflateFactory, PerMessageDeflate
+from websockets.frames import CONT, CTRL_OPCODES, Frame
+
+from helpers.config import CompressionConfig
+
+
+class MeteredPerMessageDeflate(PerMessageDeflate):
+    def __init__(self, *args, min_size: int = 0, **kwargs) -> None:
+        """
+        :param min_size: Messages smaller than this (bytes) are sent uncompressed, which RFC 7692 allows per message.
+        """
+        super().__init__(*args, **kwargs)
+        self.min_size = min_size
+        # Wire size of each whole message, waiting to be paired with it
+        self.sent: deque[int] = deque(maxlen=4096)
+        self.received: deque[int] = deque(maxlen=4096)
+        self._sending = 0
+        self._receiving = 0
+
+    def encode(self, frame: Frame) -> Frame:
+        if frame.opcode in CTRL_OPCODES:
+            return frame
+        if frame.opcode is not CONT and frame.fin and len(frame.data) < self.min_size:
+            encoded = frame
+        else:
+            encoded = super().encode(frame)
+        self._sending += len(encoded.data)
+        if frame.fin:
+            self.sent.append(self._sending)
+            self._sending = 0
+        return encoded
+
+    def decode(self, frame: Frame, *, max_size: Optional[int] = None) -> Frame:
+        if frame.opcode not in CTRL_OPCODES:
+            self._receiving += len(frame.data)
+            if frame.fin:
+                self.received.append(self._receiving)
+                self._receiving = 0
+        return super().decode(frame, max_size=max_size)
+
+
+class MeteredDeflateFactory(ClientPerMessageDeflateFactory):
+    def __init__(self, *args, min_size: int = 0, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.min_size = min_size
+
+    def process_response_params(self, params, accepted_extensions) -> MeteredPerMessageDeflate:
+        extension = super().process_response_params(params, accepted_extensions)
+        return MeteredPerMessageDeflate(
+            extension.remote_no_context_takeover,
+            extension.local_no_context_takeover,
+            extension.remote_max_window_bits,
+            extension.local_max_window_bits,
+            extension.compress_settings,
+            min_size=self.min_size,
+        )
+
+
+def connect_options(config: CompressionConfig) -> dict:
+    """The compression arguments of `websockets.connect`."""
+    if not config.enabled:
+        return {"compression": None}
+    factory = MeteredDeflateFactory(
+        server_max_window_bits=config.server_max_window_bits,
+        client_max_window_bits=config.client_max_window_bits or True,
+        compress_settings={"level": config.level, "memLevel": config.mem_level},
+        min_size=config.min_size,
+    )
+    return {"compression": None, "extensions": [factory]}
+
+
+def meter_of(websocket) -> Optional[MeteredPerMessageDeflate]:
+    """The negotiated extension of a connection, `None` when the server declined compression."""
+    for extension in websocket.protocol.extensions:
+        if isinstance(extension, MeteredPerMessageDeflate):
+            return extension
+    return None
@@ -0,0 +1,79 @@
+"""
+Running the same call against many Minecraft servers at once.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Optional
+
+
+@dataclass
+class FanOutResult:
+    target: Any
+    result: Any = None
+    error: Optional[BaseException] = None
+    latency: Optional[float] = None
+    timed_out: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.timed_out
+
+
+async def fan_out(
+    targets: Iterable,
+    call: Callable[[Any], Awaitable],
+    *,
+    limit: int = None,
+    timeout: float = None,
+    deadline: float = None,
+) -> AsyncIterator[FanOutResult]:
+    """
+    Runs `call(target)` for every target concurrently and yields the results as they complete.
+
+    :param targets: What `call` is applied to, usually server names or `(name, ip, port)` rows.
+    :param call: The coroutine function run for each target.
+    :param limit: How many calls may run at the same time, unbounded when `None`.
+    :param timeout: How long (seconds) a single call may take.
+    :param deadline: How long (seconds) the whole fan-out may take. Calls still running then are
+        cancelled and yielded as timed out.
+    """
+    semaphore = asyncio.Semaphore(limit) if limit else None
+
+    async def run(target) -> FanOutResult:
+        if semaphore is not None:
+            async with semaphore:
+                return await measure(target)
+        return await measure(target)
+
+    async def measure(target) -> FanOutResult:
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(call(target), timeout)
+        except asyncio.TimeoutError:
+            return FanOutResult(target, latency=time.perf_counter() - start, timed_out=True)
+        except Exception as e:
+            return FanOutResult(target, error=e, latency=time.perf_counter() - start)
+        return FanOutResult(target, result=result, latency=time.perf_counter() - start)
+
+    loop = asyncio.get_running_loop()
+    pending = {asyncio.create_task(run(target)): target for target in targets}
+    end = None if deadline is None else loop.time() + deadline
+    try:
+        while pending:
+            remaining = None if end is None else end - loop.time()
+            if remaining is not None and remaining <= 0:
+                break
+            done, _ = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                del pending[task]
+                yield task.result()
+        for task, target in list(pending.items()):
+            task.cancel()
+            del pending[task]
+            yield FanOutResult(target, timed_out=True, latency=deadline)
+    finally:
+        # The caller stopped iterating early
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,107 @@
+"""
+Bot-wide HTTP session.
+
+A single `aiohttp.ClientSession` is created in `DiscordBot.setup_hook` and shared by every cog
+(`bot.http_session`), so keep-alive connections and resolved DNS entries are reused between
+commands instead of paying a new TLS handshake on every request.
+"""
+
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
+
+import aiohttp
+
+
+@dataclass
+class HostStats:
+    requests: int = 0
+    errors: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+    connections_created: int = 0
+    connections_reused: int = 0
+
+    @property
+    def average_latency(self) -> float:
+        return self.total_latency / self.requests if self.requests else 0.0
+
+    @property
+    def reuse_ratio(self) -> float:
+        total = self.connections_created + self.connections_reused
+        return self.connections_reused / total if total else 0.0
+
+
+class HTTPStats:
+    """Per-host latency and connection reuse statistics, fed by an aiohttp `TraceConfig`."""
+
+    def __init__(self) -> None:
+        self.hosts: dict[str, HostStats] = {}
+
+    def _host(self, params) -> HostStats:
+        return self.hosts.setdefault(params.url.host or "?", HostStats())
+
+    async def on_request_start(self, _session, context, params) -> None:
+        context.start = time.perf_counter()
+        context.host = self._host(params)
+
+    async def on_request_end(self, _session, context, _params) -> None:
+        elapsed = time.perf_counter() - context.start
+        context.host.requests += 1
+        context.host.total_latency += elapsed
+        context.host.max_latency = max(context.host.max_latency, elapsed)
+
+    async def on_request_exception(self, _session, context, _params) -> None:
+        context.host.errors += 1
+
+    async def on_connection_create_end(self, _session, context, _params) -> None:
+        context.host.connections_created += 1
+
+    async def on_connection_reuseconn(self, _session, context, _params) -> None:
+        context.host.connections_reused += 1
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig(
+            trace_config_ctx_factory=lambda trace_request_ctx: SimpleNamespace(
+                trace_request_ctx=trace_request_ctx
+            )
+        )
+        trace_config.on_request_start.append(self.on_request_start)
+        trace_config.on_request_end.append(self.on_request_end)
+        trace_config.on_request_exception.append(self.on_request_exception)
+        trace_config.on_connection_create_end.append(self.on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(self.on_connection_reuseconn)
+        return trace_config
+
+
+def create_http_session(
+    stats: HTTPStats,
+    *,
+    limit: int = 100,
+    limit_per_host: int = 10,
+    keepalive_timeout: float = 30,
+    dns_cache_ttl: int = 300,
+    timeout: float = 15,
+) -> aiohttp.ClientSession:
+    """
+    Creates the shared HTTP session.
+
+    :param stats: The statistics collector hooked on every request.
+    :param limit: Maximum number of simultaneous connections.
+    :param limit_per_host: Maximum number of simultaneous connections to the same host.
+    :param keepalive_timeout: How long (seconds) an idle connection is kept open for reuse.
+    :param dns_cache_ttl: How long (seconds) resolved host names are cached.
+    :param timeout: Total timeout (seconds) of a single request.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        keepalive_timeout=keepalive_timeout,
+        ttl_dns_cache=dns_cache_ttl,
+        use_dns_cache=True,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=timeout),
+        trace_configs=[stats.trace_config()],
+    )
@@ -0,0 +1,38 @@
+"""
+Lazy imports for heavy optional dependencies.
+
+`websockets = lazy_import("websockets")` binds a placeholder at import time and only runs the
+real import the first time an attribute is looked up, so loading a cog does not pay for a
+library until one of its commands actually needs it.
+"""
+
+import importlib
+import types
+
+
+class LazyModule(types.ModuleType):
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_module"]
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, item: str):
+        return getattr(self._load(), item)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    Returns a module placeholder that imports `name` on first use.
+
+    :param name: The absolute name of the module.
+    """
+    return LazyModule(name)
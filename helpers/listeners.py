@@ -0,0 +1,188 @@
+"""
+Building blocks for the per-server MSMP listeners: connection states, backoff, status and the
+supervisor that owns the listener tasks.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Awaitable, Callable, Optional
+
+
+class ListenerState(str, Enum):
+    CONNECTING = "connecting"
+    SUBSCRIBED = "subscribed"
+    DEGRADED = "degraded"
+    BACKOFF = "backoff"
+    STOPPED = "stopped"
+    GAVE_UP = "gave up"
+
+
+class Backoff:
+    """Exponential backoff with jitter, so servers that dropped together don't reconnect in lockstep."""
+
+    def __init__(
+        self, base: float = 1.0, factor: float = 2.0, cap: float = 300.0, jitter: bool = True
+    ) -> None:
+        """
+        :param base: The first delay (seconds).
+        :param factor: How much the delay grows after each failed attempt.
+        :param cap: The maximum delay (seconds).
+        :param jitter: Pick the delay at random between half and the full value.
+        """
+        self.base = base
+        self.factor = factor
+        self.cap = cap
+        self.jitter = jitter
+        self.attempts = 0
+
+    def next(self) -> float:
+        delay = min(self.cap, self.base * self.factor**self.attempts)
+        self.attempts += 1
+        if self.jitter:
+            delay = random.uniform(delay / 2, delay)
+        return delay
+
+    def reset(self) -> None:
+        self.attempts = 0
+
+
+@dataclass
+class ListenerStatus:
+    server: str
+    state: ListenerState = ListenerState.CONNECTING
+    started_at: float = field(default_factory=time.monotonic)
+    since: float = field(default_factory=time.monotonic)
+    subscribed_at: Optional[float] = None
+    reconnects: int = 0
+    restarts: int = 0
+    last_error: Optional[str] = None
+    # Notifications shown and total time (seconds) spent building their embeds
+    notifications: int = 0
+    embed_time: float = 0.0
+
+    def transition(self, state: ListenerState) -> bool:
+        """
+        Moves to a new state.
+
+        :return: `True` when the state actually changed, so it is only reported once.
+        """
+        if state is self.state:
+            return False
+        self.state = state
+        self.since = time.monotonic()
+        if state is ListenerState.SUBSCRIBED:
+            self.subscribed_at = self.since
+        return True
+
+
+class ListenerSupervisor:
+    """
+    Owns one listener task per Minecraft server.
+
+    Finished tasks are reaped as soon as they end. A task that crashes is restarted, unless it
+    already crashed `max_restarts` times within `period` seconds, then it is left stopped. The status
+    of a finished listener is kept, with its last error, until it is started again or stopped.
+    """
+
+    def __init__(
+        self,
+        on_exit: Callable[[str], None] = None,
+        *,
+        max_restarts: int = 3,
+        period: float = 600,
+        logger: logging.Logger = None,
+    ) -> None:
+        """
+        :param on_exit: Called with the server name once its listener is gone for good.
+        :param max_restarts: How many crashes are restarted within `period`.
+        :param period: The window (seconds) the crashes are counted in.
+        :param logger: Where crashes are logged.
+        """
+        self.on_exit = on_exit
+        self.max_restarts = max_restarts
+        self.period = period
+        self.logger = logger or logging.getLogger("discord_bot")
+        self.tasks: dict[str, asyncio.Task] = {}
+        self.statuses: dict[str, ListenerStatus] = {}
+        self._factories: dict[str, Callable[[], Awaitable]] = {}
+        self._crashes: dict[str, deque] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.tasks
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def start(self, name: str, factory: Callable[[], Awaitable]) -> bool:
+        """
+        Starts the listener of a server.
+
+        :param name: The Minecraft server name.
+        :param factory: Returns a new listener coroutine, called again on every restart.
+        :return: `False` when the server already has a listener.
+        """
+        if name in self.tasks:
+            return False
+        # The status of the previous run is replaced by a fresh one
+        self.statuses.pop(name, None)
+        self._factories[name] = factory
+        self._crashes[name] = deque(maxlen=self.max_restarts + 1)
+        self._spawn(name)
+        return True
+
+    def _spawn(self, name: str) -> None:
+        task = asyncio.create_task(self._factories[name](), name=f"mc-listener:{name}")
+        self.tasks[name] = task
+        task.add_done_callback(lambda done: self._reap(name, done))
+
+    def _reap(self, name: str, task: asyncio.Task) -> None:
+        if self.tasks.get(name) is not task:
+            return
+        del self.tasks[name]
+        error = None if task.cancelled() else task.exception()
+        status = self.statuses.get(name)
+        if error is not None:
+            self.logger.error(f"Listener for {name} crashed: {error!r}")
+            if status is not None:
+                status.last_error = f"{type(error).__name__}: {error}"
+            crashes = self._crashes[name]
+            now = time.monotonic()
+            crashes.append(now)
+            if len(crashes) <= self.max_restarts or now - crashes[0] > self.period:
+                if status is not None:
+                    status.restarts += 1
+                self._spawn(name)
+                return
+            self.logger.error(f"Listener for {name} crashed too often, giving up")
+        if status is not None:
+            status.transition(ListenerState.STOPPED if error is None else ListenerState.GAVE_UP)
+        self._factories.pop(name, None)
+        self._crashes.pop(name, None)
+        if self.on_exit is not None:
+            self.on_exit(name)
+
+    async def stop(self, name: str) -> bool:
+        """
+        Cancels the listener of a server, waits for it to end and drops its status.
+
+        :return: `False` when the server had neither a listener nor a status.
+        """
+        task = self.tasks.get(name)
+        if task is None:
+            return self.statuses.pop(name, None) is not None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        self.statuses.pop(name, None)
+        return True
+
+    async def stop_all(self) -> None:
+        await asyncio.gather(*(self.stop(name) for name in list(self.tasks)))
+        self.statuses.clear()
@@ -0,0 +1,83 @@
+"""
+Extension manifest.
+
+Lists every extension the bot loads at startup, with a version and an optional mutual-exclusion
+group. Only the highest version of a group is loaded, so two generations of the same cog (e.g. two
+MSMP managers) never run side by side against the same Minecraft servers.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class ExtensionSpec:
+    name: str
+    version: int = 1
+    group: Optional[str] = None
+    enabled: bool = True
+
+    @property
+    def identity(self) -> str:
+        return f"{self.name}@{self.version}"
+
+
+EXTENSIONS = [
+    ExtensionSpec("general"),
+    ExtensionSpec("owner"),
+    ExtensionSpec("minecraft"),
+    ExtensionSpec("minecraft_v3", version=3, group="msmp"),
+    ExtensionSpec("minecraft_v4", version=4, group="msmp"),
+]
+
+
+def get_spec(name: str) -> Optional[ExtensionSpec]:
+    for spec in EXTENSIONS:
+        if spec.name == name:
+            return spec
+    return None
+
+
+def resolve_extensions(
+    specs: list[ExtensionSpec] = EXTENSIONS,
+) -> tuple[list[ExtensionSpec], list[tuple[ExtensionSpec, Optional[ExtensionSpec]]]]:
+    """
+    Picks the extensions to load.
+
+    :param specs: The manifest entries.
+    :return: The extensions to load, and the skipped ones with the extension that won their group
+        (`None` when they are simply disabled).
+    """
+    winners: dict[str, ExtensionSpec] = {}
+    for spec in specs:
+        if spec.enabled and spec.group is not None:
+            current = winners.get(spec.group)
+            if current is None or spec.version > current.version:
+                winners[spec.group] = spec
+
+    selected, skipped = [], []
+    for spec in specs:
+        if not spec.enabled:
+            skipped.append((spec, None))
+        elif spec.group is not None and winners[spec.group] is not spec:
+            skipped.append((spec, winners[spec.group]))
+        else:
+            selected.append(spec)
+    return selected, skipped
+
+
+def find_conflict(name: str, loaded: list[str]) -> Optional[ExtensionSpec]:
+    """
+    Returns the already loaded extension that shares a mutual-exclusion group with `name`.
+
+    :param name: The extension about to be loaded.
+    :param loaded: The names of the extensions currently loaded.
+    """
+    spec = get_spec(name)
+    if spec is None or spec.group is None:
+        return None
+    for other in loaded:
+        other_spec = get_spec(other)
+        if other_spec is not None and other_spec is not spec and other_spec.group == spec.group:
+            return other_spec
+    return None
@@ -0,0 +1,244 @@
+"""
+Asynchronous client for the Mojang account APIs.
+
+Lookups go through a shared `aiohttp.ClientSession` and are cached in SQLite through the
+`DatabaseManager`, so repeated `/mcinfo` calls for the same account never leave the bot.
+"""
+
+import asyncio
+import base64
+import json
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import aiohttp
+
+# The bulk endpoint refuses more than 10 names per request.
+BULK_LOOKUP_LIMIT = 10
+
+
+@dataclass(frozen=True)
+class MojangProfile:
+    uuid: str
+    name: str
+    skin_url: Optional[str]
+    skin_model: str
+    cape_url: Optional[str]
+    is_legacy_profile: bool
+    timestamp: Optional[int]
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "MojangProfile":
+        """
+        Builds a profile from a session server response.
+
+        :param payload: The decoded JSON body of `/session/minecraft/profile/<uuid>`.
+        """
+        textures = {}
+        for prop in payload.get("properties", []):
+            if prop.get("name") == "textures":
+                textures = json.loads(base64.b64decode(prop["value"]))
+                break
+        skin = textures.get("textures", {}).get("SKIN", {})
+        cape = textures.get("textures", {}).get("CAPE", {})
+        return cls(
+            uuid=payload["id"],
+            name=payload["name"],
+            skin_url=skin.get("url"),
+            skin_model=skin.get("metadata", {}).get("model", "classic"),
+            cape_url=cape.get("url"),
+            is_legacy_profile=payload.get("legacy", False),
+            timestamp=textures.get("timestamp"),
+        )
+
+
+class MojangClient:
+    API_URL = "https://api.mojang.com"
+    SESSION_URL = "https://sessionserver.mojang.com"
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        database=None,
+        *,
+        api_url: str = API_URL,
+        session_url: str = SESSION_URL,
+        name_ttl: float = 6 * 3600,
+        profile_ttl: float = 600,
+        negative_ttl: float = 300,
+    ) -> None:
+        """
+        :param session: The HTTP session every request is sent through.
+        :param database: The `DatabaseManager` used as persistent cache, or `None` to skip it.
+        :param api_url: Base URL of the name -> UUID API, overridable to point at a local stand-in server.
+        :param session_url: Base URL of the session server that serves profiles and textures.
+        :param name_ttl: How long (seconds) a name -> UUID mapping is trusted.
+        :param profile_ttl: How long (seconds) a profile (skin, cape...) is trusted.
+        :param negative_ttl: How long (seconds) a "this name is not taken" answer is trusted.
+        """
+        self.session = session
+        self.database = database
+        self.api_url = api_url.rstrip("/")
+        self.session_url = session_url.rstrip("/")
+        self.name_ttl = name_ttl
+        self.profile_ttl = profile_ttl
+        self.negative_ttl = negative_ttl
+        self._pending_names: dict[str, asyncio.Future] = {}
+        self._pending_profiles: dict[str, asyncio.Future] = {}
+
+    def _is_fresh(self, fetched_at: float, negative: bool = False) -> bool:
+        ttl = self.negative_ttl if negative else self.name_ttl
+        return time.time() - fetched_at < ttl
+
+    async def _cached_uuid(self, name: str):
+        """Returns `(hit, uuid)` from the persistent cache."""
+        if self.database is None:
+            return False, None
+        row = await self.database.get_cached_mojang_name(name)
+        if row is None:
+            return False, None
+        uuid, fetched_at = row
+        if not self._is_fresh(fetched_at, negative=uuid is None):
+            return False, None
+        return True, uuid
+
+    async def get_uuid(self, name: str) -> Optional[str]:
+        """
+        Resolves a username to its UUID, or `None` when the name is not taken.
+
+        :param name: The Minecraft username.
+        """
+        return (await self.get_uuids([name]))[name.lower()]
+
+    async def get_uuids(self, names: list[str]) -> dict[str, Optional[str]]:
+        """
+        Resolves several usernames at once through the bulk endpoint.
+
+        Concurrent lookups of the same name share a single request.
+
+        :param names: The Minecraft usernames.
+        :return: A mapping of lowercased username to UUID (`None` when not taken).
+        """
+        keys = list(dict.fromkeys(name.lower() for name in names))
+        results: dict[str, Optional[str]] = {}
+        waiting: dict[str, asyncio.Future] = {}
+        claimed: dict[str, asyncio.Future] = {}
+        loop = asyncio.get_running_loop()
+        # Claim every name before the first await so concurrent callers find the pending lookup.
+        for key in keys:
+            if key in self._pending_names:
+                waiting[key] = self._pending_names[key]
+            else:
+                claimed[key] = self._pending_names[key] = loop.create_future()
+
+        error = None
+        try:
+            missing = []
+            for key in claimed:
+                hit, uuid = await self._cached_uuid(key)
+                if hit:
+                    results[key] = uuid
+                    self._resolve_name(key, claimed[key], uuid)
+                else:
+                    missing.append(key)
+
+            for start in range(0, len(missing), BULK_LOOKUP_LIMIT):
+                chunk = missing[start : start + BULK_LOOKUP_LIMIT]
+                found = await self._fetch_uuids(chunk)
+                for key in chunk:
+                    uuid = found.get(key)
+                    results[key] = uuid
+                    if self.database is not None:
+                        await self.database.cache_mojang_name(key, uuid)
+                    self._resolve_name(key, claimed[key], uuid)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            # Whatever went wrong (including a cancelled command), never leave a claimed name pending.
+            for key, future in claimed.items():
+                if future.done():
+                    continue
+                if self._pending_names.get(key) is future:
+                    del self._pending_names[key]
+                if isinstance(error, Exception):
+                    future.set_exception(error)
+                    # Mark the exception as retrieved when nobody else was waiting on it.
+                    future.exception()
+                else:
+                    future.cancel()
+
+        for key, future in waiting.items():
+            results[key] = await future
+        return results
+
+    def _resolve_name(self, key: str, future: asyncio.Future, uuid: Optional[str]) -> None:
+        if self._pending_names.get(key) is future:
+            del self._pending_names[key]
+        future.set_result(uuid)
+
+    async def _fetch_uuids(self, names: list[str]) -> dict[str, str]:
+        async with self.session.post(
+            f"{self.api_url}/profiles/minecraft", json=names
+        ) as response:
+            response.raise_for_status()
+            data = await response.json()
+        return {entry["name"].lower(): entry["id"] for entry in data}
+
+    async def get_profile(self, uuid: str) -> Optional[MojangProfile]:
+        """
+        Fetches the profile (skin, cape...) of an account.
+
+        :param uuid: The UUID of the account, with or without dashes.
+        """
+        uuid = uuid.replace("-", "")
+        if uuid in self._pending_profiles:
+            return await self._pending_profiles[uuid]
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending_profiles[uuid] = future
+        payload = None
+        try:
+            row = None
+            if self.database is not None:
+                row = await self.database.get_cached_mojang_profile(uuid)
+            if row is not None and time.time() - row[1] < self.profile_ttl:
+                profile = MojangProfile.from_payload(json.loads(row[0]))
+            else:
+                async with self.session.get(
+                    f"{self.session_url}/session/minecraft/profile/{uuid}"
+                ) as response:
+                    if response.status != 204 and response.status != 404:
+                        response.raise_for_status()
+                        payload = await response.json()
+                # A malformed textures property raises here, while the waiters can still be told.
+                profile = MojangProfile.from_payload(payload) if payload else None
+            future.set_result(profile)
+        except BaseException as e:
+            if isinstance(e, Exception):
+                future.set_exception(e)
+                future.exception()
+            else:
+                future.cancel()
+            raise
+        finally:
+            if self._pending_profiles.get(uuid) is future:
+                del self._pending_profiles[uuid]
+
+        if payload and profile is not None and self.database is not None:
+            await self.database.cache_mojang_profile(
+                uuid, profile.name, json.dumps(payload)
+            )
+        return profile
+
+    async def get_profile_by_name(self, name: str) -> Optional[MojangProfile]:
+        """
+        Shortcut for `get_uuid` followed by `get_profile`.
+
+        :param name: The Minecraft username.
+        """
+        uuid = await self.get_uuid(name)
+        if uuid is None:
+            return None
+        return await self.get_profile(uuid)
@@ -0,0 +1,130 @@
+"""
+Button navigation between the pages of a long result.
+"""
+
+from typing import Callable, Sequence
+
+import discord
+
+# Lines per page of a `ListPages`, each cut to LINE_LENGTH so a page always fits in an embed
+PAGE_LINES = 25
+LINE_LENGTH = 120
+
+
+class Paginator(discord.ui.View):
+    def __init__(
+        self,
+        render: Callable[[int], discord.Embed],
+        page_count: int,
+        *,
+        author_id: int = None,
+        timeout: float = 180,
+    ) -> None:
+        """
+        :param render: Builds the embed of a page from its index, only called for the pages actually shown.
+        :param page_count: The number of pages, can be changed later through the attribute.
+        :param author_id: Only this user may turn the pages, anyone when `None`.
+        :param timeout: How long (seconds) the buttons stay active after the last click.
+        """
+        super().__init__(timeout=timeout)
+        self.render = render
+        self.page_count = page_count
+        self.author_id = author_id
+        self.page = 0
+        self.message = None
+        self.update_buttons()
+
+    def update_buttons(self) -> None:
+        self.previous.disabled = self.page <= 0
+        self.next.disabled = self.page >= self.page_count - 1
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if self.author_id is not None and interaction.user.id != self.author_id:
+            await interaction.response.send_message("❌ These buttons are not for you.", ephemeral=True)
+            return False
+        return True
+
+    async def show(self, interaction: discord.Interaction) -> None:
+        self.page = max(0, min(self.page, self.page_count - 1))
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.render(self.page), view=self)
+
+    @discord.ui.button(label="◀", style=discord.ButtonStyle.secondary)
+    async def previous(self, interaction: discord.Interaction, _button: discord.ui.Button) -> None:
+        self.page -= 1
+        await self.show(interaction)
+
+    @discord.ui.button(label="▶", style=discord.ButtonStyle.secondary)
+    async def next(self, interaction: discord.Interaction, _button: discord.ui.Button) -> None:
+        self.page += 1
+        await self.show(interaction)
+
+    async def send(self, ctx) -> discord.Message:
+        """Sends the first page, the buttons are left out when there is a single page."""
+        view = self if self.page_count > 1 else None
+        self.message = await ctx.send(embed=self.render(self.page), view=view)
+        return self.message
+
+    async def refresh(self) -> None:
+        """Renders the current page again, e.g. after the underlying data changed."""
+        if self.message is None:
+            return
+        self.update_buttons()
+        view = self if self.page_count > 1 else None
+        await self.message.edit(embed=self.render(self.page), view=view)
+
+    async def on_timeout(self) -> None:
+        if self.message is None or self.page_count <= 1:
+            return
+        for item in self.children:
+            item.disabled = True
+        try:
+            await self.message.edit(view=self)
+        except discord.HTTPException:
+            pass
+
+
+class ListPages:
+    """
+    Pages over a list fetched once: turning a page slices the list and formats that slice only.
+    """
+
+    def __init__(
+        self,
+        title: str,
+        rows: Sequence,
+        format_row: Callable[[object], str],
+        *,
+        color: int,
+        empty: str = "Nothing.",
+        page_size: int = PAGE_LINES,
+    ) -> None:
+        """
+        :param rows: The whole result, kept as is.
+        :param format_row: Builds the line of one row.
+        :param empty: The description shown when there is no row.
+        """
+        self.title = title
+        self.rows = rows
+        self.format_row = format_row
+        self.color = color
+        self.empty = empty
+        self.page_size = page_size
+
+    @property
+    def page_count(self) -> int:
+        return max(1, -(-len(self.rows) // self.page_size))
+
+    def line(self, row) -> str:
+        line = self.format_row(row)
+        return line if len(line) <= LINE_LENGTH else line[:LINE_LENGTH - 1] + "…"
+
+    def render(self, page: int) -> discord.Embed:
+        start = page * self.page_size
+        lines = [self.line(row) for row in self.rows[start:start + self.page_size]]
+        embed = discord.Embed(title=self.title, description="\n".join(lines) or self.empty, color=self.color)
+        footer = f"{len(self.rows)} total"
+        if self.page_count > 1:
+            footer += f" · Page {page + 1}/{self.page_count}"
+        embed.set_footer(text=footer)
+        return embed
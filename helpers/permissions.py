@@ -0,0 +1,68 @@
+"""
+Permission engine for the Minecraft commands.
+
+The allowed roles are precompiled per command and scope by `helpers.config`; this module keeps
+the role IDs of each member cached so a permission check is a single set intersection. Entries
+are dropped on `on_member_update` / `on_member_remove`.
+"""
+
+from collections import OrderedDict
+from typing import Optional
+
+import discord
+
+EMPTY = frozenset()
+
+
+class PermissionEngine:
+    def __init__(self, bot, max_members: int = 10000) -> None:
+        """
+        :param bot: The bot, its `config` holds the compiled permissions.
+        :param max_members: How many members have their roles cached at most.
+        """
+        self.bot = bot
+        self.max_members = max_members
+        self._roles: OrderedDict[tuple, frozenset] = OrderedDict()
+
+    def member_roles(self, user: discord.abc.User) -> frozenset:
+        """Returns the role IDs of a member, an empty set for users outside of a guild (DMs)."""
+        guild = getattr(user, "guild", None)
+        if guild is None:
+            return EMPTY
+        key = (guild.id, user.id)
+        roles = self._roles.get(key)
+        if roles is None:
+            roles = frozenset(role.id for role in user.roles)
+            self._roles[key] = roles
+            if len(self._roles) > self.max_members:
+                self._roles.popitem(last=False)
+        else:
+            self._roles.move_to_end(key)
+        return roles
+
+    def invalidate(self, member: discord.Member) -> None:
+        self._roles.pop((member.guild.id, member.id), None)
+
+    def invalidate_guild(self, guild_id: int) -> None:
+        for key in [key for key in self._roles if key[0] == guild_id]:
+            del self._roles[key]
+
+    def check(
+        self,
+        command_name: str,
+        user: discord.abc.User,
+        guild_id: Optional[int] = None,
+        server: Optional[str] = None,
+    ) -> bool:
+        """
+        Checks if a user may use a command.
+
+        :param command_name: The permission name (`server_ops`, `system`...).
+        :param user: The member (or user in DMs) running the command.
+        :param guild_id: The guild the command runs in, for guild scoped rules.
+        :param server: The Minecraft server targeted, for server scoped rules.
+        """
+        allowed = self.bot.config.allowed_roles(command_name, guild_id, server)
+        if not allowed:  # vide = tout le monde peut
+            return True
+        return not allowed.isdisjoint(self.member_roles(user))
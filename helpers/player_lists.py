@@ -0,0 +1,227 @@
+"""
+Streaming import and export of allowlists and ban lists.
+
+Uploaded files are read chunk by chunk and parsed entry by entry, so a 10k lines file never sits
+in memory as a whole. Supported formats are CSV (with or without a header), plain text with one
+name per line, and JSON arrays such as the server's own `whitelist.json` and `banned-players.json`.
+"""
+
+import codecs
+import csv
+import io
+import json
+import tempfile
+from typing import AsyncIterator, Iterable, Optional, Sequence
+from uuid import UUID
+
+CHUNK_SIZE = 64 * 1024
+# Longest line or JSON item accepted in an uploaded file, so a malformed one is never buffered whole
+MAX_ITEM_SIZE = 1024 * 1024
+# Exports bigger than this are spooled to disk instead of memory
+SPOOL_SIZE = 1024 * 1024
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+        if len(buffer) > MAX_ITEM_SIZE:
+            raise ValueError("line too long")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+async def iter_json_array(chunks: AsyncIterator[bytes]) -> AsyncIterator:
+    """
+    Yields the items of a JSON array one by one.
+
+    Only an item cut by the end of the data read so far waits for the next chunk, a syntax error
+    anywhere else fails right away instead of buffering the rest of the file.
+
+    :raises ValueError: When the document is not a well-formed JSON array, or is truncated.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    json_decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+
+    async def more() -> bool:
+        nonlocal buffer, position
+        chunk = await anext(iterator, None)
+        if chunk is None:
+            return False
+        buffer = buffer[position:] + decoder.decode(chunk)
+        position = 0
+        return True
+
+    async def next_char() -> Optional[str]:
+        """The next non-blank character, `None` at the end of the file."""
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n":
+                position += 1
+            if position < len(buffer):
+                return buffer[position]
+            if not await more():
+                return None
+
+    iterator = aiter(chunks)
+    if await next_char() != "[":
+        raise ValueError("expected a JSON array")
+    position += 1
+    if await next_char() == "]":
+        return
+    while True:
+        if await next_char() is None:
+            raise ValueError("truncated JSON array")
+        while True:
+            error = None
+            try:
+                item, end = json_decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as e:
+                if not _cut_by_end(e, len(buffer)):
+                    raise ValueError(f"invalid JSON array: {e.msg}") from None
+                error, end = e, None
+            # An item that reaches the end of the buffer may go on in the next chunk (e.g. a number)
+            if end is not None and end < len(buffer):
+                break
+            if len(buffer) - position > MAX_ITEM_SIZE:
+                raise ValueError("JSON array item too large")
+            if not await more():
+                if error is not None and error.pos < len(buffer) and not error.msg.startswith("Unterminated"):
+                    raise ValueError(f"invalid JSON array: {error.msg}")
+                if end is None:
+                    raise ValueError("truncated JSON array")
+                break
+        position = end
+        yield item
+        separator = await next_char()
+        if separator == "]":
+            return
+        if separator is None:
+            raise ValueError("truncated JSON array")
+        if separator != ",":
+            raise ValueError(f"invalid JSON array: expected `,` or `]`, got `{separator}`")
+        position += 1
+
+
+def _cut_by_end(error: json.JSONDecodeError, length: int) -> bool:
+    """Whether a decoding error comes from the end of the buffer rather than from a syntax error."""
+    # A cut literal (`fal`) or escape (`\u00`) fails at its start, an unterminated string at its quote
+    return error.pos >= length - 16 or error.msg.startswith("Unterminated string")
+
+
+def normalize_uuid(value: str) -> str:
+    """Lowercase dashed form, so `069A79F4...` and `069a79f4-...` are the same player."""
+    value = value.strip().lower()
+    try:
+        return str(UUID(value))
+    except ValueError:
+        return value
+
+
+def normalize_entry(item) -> Optional[dict]:
+    """Turns a parsed item into `{"name", "uuid", "reason", "expires"}`, `None` when it has no player."""
+    if isinstance(item, str):
+        item = {"name": item}
+    if not isinstance(item, dict):
+        return None
+    player = item.get("player") if isinstance(item.get("player"), dict) else item
+    name = (player.get("name") or "").strip()
+    uuid = normalize_uuid(player.get("uuid") or player.get("id") or "")
+    if not name and not uuid:
+        return None
+    return {
+        "name": name,
+        "uuid": uuid or None,
+        "reason": item.get("reason") or None,
+        "expires": item.get("expires") if item.get("expires") not in (None, "", "forever") else None,
+    }
+
+
+async def iter_entries(chunks: AsyncIterator[bytes], filename: str) -> AsyncIterator[dict]:
+    """
+    Parses an uploaded list, JSON when the file name ends with `.json`, CSV or plain text otherwise.
+
+    :param chunks: The raw bytes of the file.
+    :param filename: The name of the uploaded file.
+    """
+    if filename.lower().endswith(".json"):
+        async for item in iter_json_array(chunks):
+            entry = normalize_entry(item)
+            if entry is not None:
+                yield entry
+        return
+
+    header = None
+    async for line in iter_lines(chunks):
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        row = [cell.strip() for cell in next(csv.reader([line]))]
+        if header is None:
+            lowered = [cell.lower() for cell in row]
+            if "name" in lowered or "uuid" in lowered:
+                header = lowered
+                continue
+            header = ["name", "reason", "expires"][: max(1, len(row))]
+        entry = normalize_entry(dict(zip(header, row)))
+        if entry is not None:
+            yield entry
+
+
+async def chunked(entries: AsyncIterator, size: int) -> AsyncIterator[list]:
+    chunk = []
+    async for entry in entries:
+        chunk.append(entry)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def export_rows(header: Sequence[str], rows: Iterable[Sequence]):
+    """Writes any rows as CSV to a spooled temporary file, rewound and ready to be uploaded."""
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+    text = io.TextIOWrapper(spool, encoding="utf-8", newline="")
+    writer = csv.writer(text)
+    writer.writerow(header)
+    writer.writerows(rows)
+    text.flush()
+    text.detach()
+    spool.seek(0)
+    return spool
+
+
+def export_file(entries: Iterable[dict], file_format: str):
+    """
+    Writes entries to a spooled temporary file, rewound and ready to be uploaded.
+
+    :param entries: Entries as returned by `normalize_entry`.
+    :param file_format: `csv` or `json` (same layout as the server's own files).
+    """
+    if file_format == "csv":
+        return export_rows(
+            ["name", "uuid", "reason", "expires"],
+            ([entry["name"], entry["uuid"] or "", entry["reason"] or "", entry["expires"] or ""] for entry in entries)
+        )
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+    text = io.TextIOWrapper(spool, encoding="utf-8", newline="")
+    text.write("[")
+    for index, entry in enumerate(entries):
+        item = {"uuid": entry["uuid"], "name": entry["name"]}
+        if entry["reason"] is not None:
+            item["reason"] = entry["reason"]
+        if entry["expires"] is not None:
+            item["expires"] = entry["expires"]
+        text.write(("," if index else "") + "\n  " + json.dumps(item))
+    text.write("\n]\n")
+    text.flush()
+    text.detach()
+    spool.seek(0)
+    return spool
@@ -0,0 +1,70 @@
+"""
+In-memory index of the players online on the Minecraft servers of a Discord server.
+"""
+
+
+class PlayerIndex:
+    """
+    Online players in both directions: player -> servers and server -> players.
+
+    Names are matched case-insensitively. The index is fed by the join/left notifications and
+    rebuilt server by server from heartbeats and `minecraft:players` answers, so a missed
+    notification is fixed by the next full list.
+    """
+
+    def __init__(self) -> None:
+        self.players: dict[str, set[str]] = {}  # lowercased player -> server names
+        self.servers: dict[str, set[str]] = {}  # server name -> lowercased players
+        self.names: dict[str, str] = {}  # lowercased player -> name as last seen
+
+    def __len__(self) -> int:
+        return len(self.players)
+
+    def join(self, server: str, name: str) -> None:
+        key = name.lower()
+        self.names[key] = name
+        self.players.setdefault(key, set()).add(server)
+        self.servers.setdefault(server, set()).add(key)
+
+    def leave(self, server: str, name: str) -> None:
+        key = name.lower()
+        servers = self.players.get(key)
+        if servers is not None:
+            servers.discard(server)
+            if not servers:
+                del self.players[key]
+                del self.names[key]
+        players = self.servers.get(server)
+        if players is not None:
+            players.discard(key)
+
+    def replace(self, server: str, names) -> None:
+        """
+        Sets the full list of players online on a server.
+
+        :param names: The player names, e.g. from a heartbeat or `minecraft:players`.
+        """
+        current = {name.lower(): name for name in names}
+        for key in self.servers.get(server, set()) - current.keys():
+            self.leave(server, self.names[key])
+        for name in current.values():
+            self.join(server, name)
+
+    def clear(self, server: str) -> None:
+        for key in list(self.servers.pop(server, ())):
+            self.leave(server, self.names[key])
+
+    def find(self, name: str) -> frozenset:
+        """The servers a player is online on, empty when offline."""
+        return frozenset(self.players.get(name.lower(), ()))
+
+    def search(self, current: str, limit: int = 25) -> list[str]:
+        """Online player names containing `current`, the ones starting with it first."""
+        current = current.lower()
+        starts, contains = [], []
+        for key, name in self.names.items():
+            if key.startswith(current):
+                starts.append(name)
+            elif current in key:
+                contains.append(name)
+        return (sorted(starts, key=str.lower) + sorted(contains, key=str.lower))[:limit]
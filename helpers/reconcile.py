@@ -0,0 +1,226 @@
+"""
+Desired-state reconciliation for Minecraft servers.
+
+A desired-state document lists what a server should look like (allowlist, operators, bans,
+settings, gamerules). It is compared with the live state and only the calls needed to close the
+gap are planned: one add and one remove per list at most, and one call per setting or gamerule
+that actually differs. Sections missing from the document are left alone.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+# The `minecraft:serversettings/<key>` values that can be read and written, with their type
+SERVER_SETTINGS = {
+    "accept_transfers": bool,
+    "allow_flight": bool,
+    "autosave": bool,
+    "difficulty": str,
+    "enforce_allowlist": bool,
+    "entity_broadcast_range": int,
+    "force_game_mode": bool,
+    "game_mode": str,
+    "hide_online_players": bool,
+    "max_players": int,
+    "motd": str,
+    "operator_user_permission_level": int,
+    "pause_when_empty_seconds": int,
+    "player_idle_timeout": int,
+    "simulation_distance": int,
+    "spawn_protection_radius": int,
+    "status_heartbeat_interval": int,
+    "status_replies": bool,
+    "use_allowlist": bool,
+    "view_distance": int,
+}
+STATE_KEYS = ("allowlist", "operators", "bans", "settings", "gamerules")
+LIST_METHODS = {
+    "allowlist": "minecraft:allowlist",
+    "operators": "minecraft:operators",
+    "bans": "minecraft:bans",
+    "gamerules": "minecraft:gamerules",
+}
+
+
+class StateError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Change:
+    method: str
+    params: list
+    summary: str
+
+
+def setting_method(key: str, write: bool = False) -> str:
+    return f"minecraft:serversettings/{key}" + ("/set" if write else "")
+
+
+def _player_name(entry, path: str) -> str:
+    if isinstance(entry, str) and entry.strip():
+        return entry.strip()
+    if isinstance(entry, dict) and isinstance(entry.get("name"), str) and entry["name"].strip():
+        return entry["name"].strip()
+    raise StateError(f"`{path}` entries must be player names or objects with a `name`")
+
+
+def validate_state(document) -> dict:
+    """
+    Checks a desired-state document and normalizes it.
+
+    :param document: The decoded JSON of one server's desired state.
+    :raises StateError: When the document does not match the expected format.
+    :return: `{"allowlist": [name], "operators": {name: level}, "bans": {name: reason},
+        "settings": {key: value}, "gamerules": {key: value as string}}`, only with the given sections.
+    """
+    if not isinstance(document, dict):
+        raise StateError("a desired state must be an object")
+    unknown = document.keys() - set(STATE_KEYS)
+    if unknown:
+        raise StateError(f"unknown section(s): {', '.join(sorted(unknown))}")
+    state = {}
+    for key in ("allowlist", "operators", "bans"):
+        if key in document and not isinstance(document[key], list):
+            raise StateError(f"`{key}` must be a list")
+    if "allowlist" in document:
+        state["allowlist"] = [_player_name(entry, "allowlist") for entry in document["allowlist"]]
+    if "operators" in document:
+        state["operators"] = {}
+        for entry in document["operators"]:
+            level = entry.get("level", 4) if isinstance(entry, dict) else 4
+            if level not in (1, 2, 3, 4):
+                raise StateError("operator levels must be between 1 and 4")
+            state["operators"][_player_name(entry, "operators")] = level
+    if "bans" in document:
+        state["bans"] = {
+            _player_name(entry, "bans"): (entry.get("reason") if isinstance(entry, dict) else None) or "Banned via Discord"
+            for entry in document["bans"]
+        }
+    for key in ("settings", "gamerules"):
+        if key in document and not isinstance(document[key], dict):
+            raise StateError(f"`{key}` must be an object")
+    if "settings" in document:
+        state["settings"] = validate_settings(document["settings"])
+    if "gamerules" in document:
+        state["gamerules"] = {
+            key: str(value).lower() if isinstance(value, bool) else str(value)
+            for key, value in document["gamerules"].items()
+        }
+    return state
+
+
+def validate_settings(settings: dict) -> dict:
+    """
+    Checks setting names and value types.
+
+    :raises StateError: On an unknown setting or a value of the wrong type.
+    """
+    for key, value in settings.items():
+        if key not in SERVER_SETTINGS:
+            raise StateError(f"unknown setting `{key}`")
+        expected = SERVER_SETTINGS[key]
+        # bool is a subclass of int, don't accept true for a distance
+        if not isinstance(value, expected) or (expected is int and isinstance(value, bool)):
+            raise StateError(f"`{key}` must be of type {expected.__name__}")
+    return dict(settings)
+
+
+def parse_setting(key: str, text: str):
+    """
+    Converts a setting typed in Discord to its JSON value.
+
+    :raises StateError: On an unknown setting or a value that can't be converted.
+    """
+    if key not in SERVER_SETTINGS:
+        raise StateError(f"unknown setting `{key}`")
+    expected = SERVER_SETTINGS[key]
+    if expected is bool:
+        if text.lower() not in ("true", "false", "on", "off", "yes", "no"):
+            raise StateError(f"`{key}` must be true or false")
+        return text.lower() in ("true", "on", "yes")
+    if expected is int:
+        try:
+            return int(text)
+        except ValueError:
+            raise StateError(f"`{key}` must be a whole number") from None
+    return text
+
+
+def read_calls(state: dict) -> list[tuple[str, str]]:
+    """The `(state key, method)` reads needed to diff `state`, settings keys are `settings.<key>`."""
+    calls = [(key, LIST_METHODS[key]) for key in LIST_METHODS if key in state]
+    calls += [(f"settings.{key}", setting_method(key)) for key in state.get("settings", {})]
+    return calls
+
+
+def _names(entries, nested: bool) -> dict[str, Any]:
+    """Maps lowercased player names of a live list to their entry."""
+    result = {}
+    for entry in entries:
+        player = entry.get("player", {}) if nested else entry
+        if player.get("name"):
+            result[player["name"].lower()] = entry
+    return result
+
+
+def plan(state: dict, live: dict) -> list[Change]:
+    """
+    Lists the calls that bring a server from `live` to `state`.
+
+    :param state: A document returned by `validate_state`.
+    :param live: The results of the `read_calls`, keyed like them.
+    """
+    changes = []
+
+    if "allowlist" in state:
+        current = _names(live["allowlist"], nested=False)
+        wanted = {name.lower(): name for name in state["allowlist"]}
+        add = [{"name": name} for key, name in wanted.items() if key not in current]
+        remove = [{"name": current[key]["name"]} for key in current.keys() - wanted.keys()]
+        if add:
+            changes.append(Change("minecraft:allowlist/add", [add], f"allowlist +{len(add)}"))
+        if remove:
+            changes.append(Change("minecraft:allowlist/remove", [remove], f"allowlist -{len(remove)}"))
+
+    if "operators" in state:
+        current = _names(live["operators"], nested=True)
+        wanted = {name.lower(): (name, level) for name, level in state["operators"].items()}
+        add = [
+            {"player": {"name": name}, "permissionLevel": level, "bypassesPlayerLimit": True}
+            for key, (name, level) in wanted.items()
+            if key not in current or current[key].get("permissionLevel") != level
+        ]
+        remove = [{"name": current[key]["player"]["name"]} for key in current.keys() - wanted.keys()]
+        if add:
+            changes.append(Change("minecraft:operators/add", [add], f"operators +{len(add)}"))
+        if remove:
+            changes.append(Change("minecraft:operators/remove", [remove], f"operators -{len(remove)}"))
+
+    if "bans" in state:
+        current = _names(live["bans"], nested=True)
+        wanted = {name.lower(): (name, reason) for name, reason in state["bans"].items()}
+        add = [
+            {"player": {"name": name}, "reason": reason}
+            for key, (name, reason) in wanted.items()
+            if key not in current
+        ]
+        remove = [{"name": current[key]["player"]["name"]} for key in current.keys() - wanted.keys()]
+        if add:
+            changes.append(Change("minecraft:bans/add", [add], f"bans +{len(add)}"))
+        if remove:
+            changes.append(Change("minecraft:bans/remove", [remove], f"bans -{len(remove)}"))
+
+    for key, value in state.get("settings", {}).items():
+        if live.get(f"settings.{key}") != value:
+            changes.append(Change(setting_method(key, write=True), [value], f"{key}: `{live.get(f'settings.{key}')}` → `{value}`"))
+
+    if "gamerules" in state:
+        current = {rule["key"]: str(rule.get("value")) for rule in live["gamerules"]}
+        for key, value in state["gamerules"].items():
+            if current.get(key) != value:
+                changes.append(Change(
+                    "minecraft:gamerules/update", [{"key": key, "value": value}],
+                    f"{key}: `{current.get(key)}` → `{value}`"
+                ))
+    return changes
@@ -0,0 +1,133 @@
+"""
+Probe scheduling for `monitor_servers`.
+
+Every server that is not listened to has a next-probe time kept in a heap, so each tick only
+pops the servers that are due instead of probing the whole table. A server that just went down is
+probed often, one that has been down for a long time less and less: the delay between two probes
+is a tenth of the downtime, bounded by `interval` and `max_interval`.
+"""
+
+import heapq
+import itertools
+import random
+import time
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+
+@dataclass
+class ProbeEntry:
+    next_at: float
+    down_since: float
+    failures: int = 0
+    version: int = 0
+
+
+class ProbeScheduler:
+    def __init__(
+        self,
+        interval: float = 30,
+        fast_interval: float = 5,
+        fast_window: float = 300,
+        max_interval: float = 600,
+        jitter: float = 0.1,
+    ) -> None:
+        """
+        :param interval: The shortest probe interval (seconds) once `fast_window` is over.
+        :param fast_interval: The probe interval (seconds) of a server that went down recently.
+        :param fast_window: How long (seconds) after going down a server is probed every `fast_interval`.
+        :param max_interval: The longest time (seconds) between two probes of the same server.
+        :param jitter: Random spread applied to every delay, as a fraction of it.
+        """
+        self.interval = interval
+        self.fast_interval = fast_interval
+        self.fast_window = fast_window
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.entries: dict[str, ProbeEntry] = {}
+        self._heap: list[tuple[float, int, str]] = []
+        self._versions = itertools.count(1)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _push(self, name: str, entry: ProbeEntry) -> None:
+        # Old heap items are left behind and skipped when popped, their version no longer matches.
+        entry.version = next(self._versions)
+        heapq.heappush(self._heap, (entry.next_at, entry.version, name))
+
+    def add(self, name: str, delay: float = 0, now: float = None, just_stopped: bool = False) -> None:
+        """
+        Starts probing a server, does nothing if it is already scheduled.
+
+        :param name: The Minecraft server name.
+        :param delay: Seconds before the first probe.
+        :param just_stopped: The server was online a moment ago and is probed every `fast_interval`
+            at first, otherwise it is treated as already down for `fast_window`.
+        """
+        if name in self.entries:
+            return
+        now = time.monotonic() if now is None else now
+        down_since = now if just_stopped else now - self.fast_window
+        entry = ProbeEntry(next_at=now + delay, down_since=down_since)
+        self.entries[name] = entry
+        self._push(name, entry)
+
+    def sync(self, names: Iterable[str], now: float = None) -> None:
+        """
+        Matches the scheduled servers with `names`.
+
+        New servers are spread evenly over one `interval` so they are not all probed on the same tick.
+        """
+        now = time.monotonic() if now is None else now
+        names = set(names)
+        for name in self.entries.keys() - names:
+            self.remove(name)
+        new = sorted(names - self.entries.keys())
+        for index, name in enumerate(new):
+            self.add(name, index * self.interval / len(new), now)
+
+    def remove(self, name: str) -> None:
+        self.entries.pop(name, None)
+
+    def due(self, now: float = None) -> list[str]:
+        """Pops the servers whose probe time has come, each has to be passed back to `reschedule` or `remove`."""
+        now = time.monotonic() if now is None else now
+        names = []
+        while self._heap and self._heap[0][0] <= now:
+            _, version, name = heapq.heappop(self._heap)
+            entry = self.entries.get(name)
+            if entry is not None and entry.version == version:
+                names.append(name)
+        return names
+
+    def next_delay(self, entry: ProbeEntry, now: float) -> float:
+        downtime = now - entry.down_since
+        if downtime < self.fast_window:
+            delay = self.fast_interval
+        else:
+            delay = min(self.max_interval, max(self.interval, downtime / 10))
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def reschedule(self, name: str, now: float = None) -> None:
+        """Schedules the next probe of a server that was found offline."""
+        entry = self.entries.get(name)
+        if entry is None:
+            return
+        now = time.monotonic() if now is None else now
+        entry.failures += 1
+        entry.next_at = now + self.next_delay(entry, now)
+        self._push(name, entry)
+
+    def next_due(self) -> Optional[float]:
+        """The time of the next probe, or `None` when nothing is scheduled."""
+        while self._heap:
+            next_at, version, name = self._heap[0]
+            entry = self.entries.get(name)
+            if entry is not None and entry.version == version:
+                return next_at
+            heapq.heappop(self._heap)
+        return None
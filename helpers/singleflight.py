@@ -0,0 +1,59 @@
+"""
+Request coalescing: concurrent identical reads share a single in-flight call.
+"""
+
+import asyncio
+import json
+import re
+from typing import Awaitable, Callable, Hashable
+
+# MSMP methods without side effects: lists, status, and settings getters (not their `/set`)
+READ_METHOD = re.compile(
+    r"^(rpc\.discover"
+    r"|minecraft:(allowlist|bans|ip_bans|operators|players|gamerules|server/status)"
+    r"|minecraft:serversettings/[a-z_]+)$"
+)
+
+
+def is_read_method(method: str) -> bool:
+    return READ_METHOD.match(method) is not None
+
+
+def request_key(ip: str, port: int, method: str, params) -> tuple:
+    return ip, port, method, json.dumps(params, sort_keys=True, separators=(",", ":"))
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time, callers arriving meanwhile wait for its result.
+
+    The call runs in its own task, so a caller that is cancelled (e.g. by a timeout) does not
+    cancel it for the others.
+    """
+
+    def __init__(self) -> None:
+        self.in_flight: dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable]):
+        """
+        :param key: Identifies identical calls.
+        :param factory: Starts the call, only used when no identical call is in flight.
+        """
+        task = self.in_flight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(factory())
+            self.in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self.in_flight.get(key) is task:
+            del self.in_flight[key]
+        if not task.cancelled():
+            # Nobody may be left to retrieve it
+            task.exception()
@@ -0,0 +1,43 @@
+"""
+Cached snapshots of the `minecraft:serversettings/*` values of each server.
+
+These values almost never change, so they are read once and kept until the bot writes a setting
+itself, the server restarts, or the snapshot gets older than its TTL.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Hashable, Optional
+
+
+@dataclass
+class SettingsSnapshot:
+    values: dict
+    fetched_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+
+class SettingsCache:
+    def __init__(self, ttl: float = 600) -> None:
+        """
+        :param ttl: How long (seconds) a snapshot is trusted.
+        """
+        self.ttl = ttl
+        self.snapshots: dict[Hashable, SettingsSnapshot] = {}
+
+    def get(self, key: Hashable) -> Optional[SettingsSnapshot]:
+        """The snapshot of a server, `None` when there is none or it expired."""
+        snapshot = self.snapshots.get(key)
+        if snapshot is None or snapshot.age > self.ttl:
+            return None
+        return snapshot
+
+    def put(self, key: Hashable, values: dict) -> SettingsSnapshot:
+        snapshot = self.snapshots[key] = SettingsSnapshot(values)
+        return snapshot
+
+    def invalidate(self, key: Hashable) -> None:
+        self.snapshots.pop(key, None)
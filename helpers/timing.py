@@ -0,0 +1,33 @@
+"""
+Startup timing helpers.
+"""
+
+import time
+from contextlib import contextmanager
+
+
+class StartupTimer:
+    """Collects how long each startup phase took so `setup_hook` can log a breakdown."""
+
+    def __init__(self, started_at: float = None) -> None:
+        self.started_at = time.perf_counter() if started_at is None else started_at
+        self.phases: dict[str, float] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def report(self) -> list[str]:
+        """Returns one line per phase, followed by the total since the timer was created."""
+        lines = [f"{name:<14} {seconds * 1000:8.1f}ms" for name, seconds in self.phases.items()]
+        lines.append(
+            f"{'total':<14} {(time.perf_counter() - self.started_at) * 1000:8.1f}ms"
+        )
+        return lines
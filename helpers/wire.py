@@ -0,0 +1,47 @@
+"""
+Payload size accounting of the MSMP WebSockets.
+
+Every request and response is counted per JSON-RPC method twice: its raw JSON size, and the size
+actually sent over the wire (after permessage-deflate, frame headers excluded). Comparing them
+shows whether compression pays off for a server.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass
+class MethodBytes:
+    sent: int = 0
+    received: int = 0
+    raw_out: int = 0
+    wire_out: int = 0
+    raw_in: int = 0
+    wire_in: int = 0
+
+    @property
+    def ratio(self) -> float:
+        """Wire bytes per raw byte, both directions, 1.0 without compression."""
+        raw = self.raw_out + self.raw_in
+        return (self.wire_out + self.wire_in) / raw if raw else 1.0
+
+
+class WireStats:
+    def __init__(self) -> None:
+        self.methods: dict[str, MethodBytes] = {}
+
+    def _method(self, method: str) -> MethodBytes:
+        if method not in self.methods:
+            self.methods[method] = MethodBytes()
+        return self.methods[method]
+
+    def record_out(self, method: str, raw: int, wire: int) -> None:
+        stats = self._method(method)
+        stats.sent += 1
+        stats.raw_out += raw
+        stats.wire_out += wire
+
+    def record_in(self, method: str, raw: int, wire: int) -> None:
+        stats = self._method(method)
+        stats.received += 1
+        stats.raw_in += raw
+        stats.wire_in += wire